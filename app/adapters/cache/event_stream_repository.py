@@ -0,0 +1,117 @@
+"""
+Redis репозиторий потока событий (Redis Stream с группой потребителей)
+"""
+import logging
+import os
+import redis.asyncio as redis
+
+from typing import List, Tuple
+
+from redis.exceptions import ResponseError
+
+from app.application.constants import EventStream, RedisConfig
+
+logger = logging.getLogger(__name__)
+
+# (ID записи потока, ID события)
+StreamEntry = Tuple[str, int]
+
+
+class RedisEventStreamRepository:
+    """Поток ID событий: публикация из outbox и чтение группой потребителей.
+
+    Запись остается в списке ожидающих (PEL) группы, пока потребитель не
+    подтвердит ее; подтвержденные записи сразу удаляются из потока, поэтому
+    поток не растет и не требует обрезки.
+    """
+
+    def __init__(self, client: redis.Redis | None = None):
+        if client is None:
+            redis_url = os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL)
+            client = redis.from_url(redis_url, decode_responses=True)
+        self.redis = client
+
+    @staticmethod
+    def _to_entries(messages) -> List[StreamEntry]:
+        return [
+            (entry_id, int(fields["event_id"]))
+            for entry_id, fields in messages
+            if fields
+        ]
+
+    async def ensure_group(self) -> None:
+        """Создать поток и группу потребителей, если их еще нет."""
+        try:
+            await self.redis.xgroup_create(
+                EventStream.STREAM_KEY,
+                EventStream.GROUP,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def publish(self, event_ids: List[int]) -> List[int]:
+        """Добавить события в поток одним конвейером.
+
+        Возвращает пустой список: отказ Redis поднимает исключение, и пакет
+        остается в outbox.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event_id in event_ids:
+                pipe.xadd(EventStream.STREAM_KEY, {"event_id": event_id})
+            await pipe.execute()
+        return []
+
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        block_ms: int = EventStream.READ_BLOCK_MS,
+    ) -> List[StreamEntry]:
+        """Новые записи для потребителя, не дольше block_ms ожидания."""
+        response = await self.redis.xreadgroup(
+            EventStream.GROUP,
+            consumer,
+            {EventStream.STREAM_KEY: ">"},
+            count=count,
+            block=block_ms,
+        )
+        if not response:
+            return []
+        _, messages = response[0]
+        return self._to_entries(messages)
+
+    async def claim_stale(
+        self,
+        consumer: str,
+        min_idle_ms: int,
+        count: int,
+        start_id: str = "0-0",
+    ) -> Tuple[str, List[StreamEntry]]:
+        """Забрать записи, простаивающие в PEL дольше min_idle_ms.
+
+        Возвращает ID, с которого продолжать, ("0-0" - PEL просмотрен) и
+        забранные записи.
+        """
+        response = await self.redis.xautoclaim(
+            EventStream.STREAM_KEY,
+            EventStream.GROUP,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id=start_id,
+            count=count,
+        )
+        next_id, messages = response[0], response[1]
+        return next_id, self._to_entries(messages)
+
+    async def ack(self, entry_ids: List[str]) -> None:
+        """Подтвердить обработку и удалить записи из потока."""
+        if not entry_ids:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(EventStream.STREAM_KEY, EventStream.GROUP, *entry_ids)
+            pipe.xdel(EventStream.STREAM_KEY, *entry_ids)
+            await pipe.execute()
+
@@ -0,0 +1,136 @@
+"""
+Redis репозиторий лидербордов (ZSET user_id -> счет)
+"""
+import logging
+import os
+import redis.asyncio as redis
+
+from typing import Dict, List, Tuple
+
+from app.application.constants import CacheSettings, RedisConfig
+
+logger = logging.getLogger(__name__)
+
+# Позиция игрока и окно соседей вокруг нее одним атомарным вызовом: между
+# отдельными ZREVRANK и ZREVRANGE счета могут измениться, и игрок выпадет из
+# окна. Возвращает {начало окна, [user_id, счет, ...]} или nil.
+# KEYS: лидерборд; ARGV: user_id, число соседей с каждой стороны
+GET_POSITION_SCRIPT = """
+local rank = redis.call('ZREVRANK', KEYS[1], ARGV[1])
+if not rank then
+    return nil
+end
+local start = math.max(rank - tonumber(ARGV[2]), 0)
+local items = redis.call(
+    'ZREVRANGE', KEYS[1], start, rank + tonumber(ARGV[2]), 'WITHSCORES'
+)
+return {start, items}
+"""
+
+
+class RedisLeaderboardRepository:
+    """Лидерборд в ZSET: позиция и страница за O(log N) независимо от числа игроков.
+
+    Счет в ZSET пишет воркер вместе с user:{id}:score (см.
+    RedisUserScoreRepository.update_user_progress), здесь только чтение и
+    перестроение из БД. Методы чтения принимают ключ лидерборда периода.
+    """
+
+    def __init__(self, client: redis.Redis | None = None):
+        if client is None:
+            redis_url = os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL)
+            client = redis.from_url(redis_url, decode_responses=True)
+        self.redis = client
+        self._get_position = self.redis.register_script(GET_POSITION_SCRIPT)
+
+    @staticmethod
+    def _to_entries(items: List[Tuple[str, float]]) -> List[Tuple[int, int]]:
+        return [(int(member), int(score)) for member, score in items]
+
+    async def get_top(
+        self,
+        offset: int,
+        limit: int,
+        key: str = CacheSettings.LEADERBOARD_KEY,
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """Страница лидерборда и общее число игроков: (total, [(user_id, score)])."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(key)
+            pipe.zrevrange(
+                key,
+                offset,
+                offset + limit - 1,
+                withscores=True,
+            )
+            total, items = await pipe.execute()
+        return total, self._to_entries(items)
+
+    async def get_position(
+        self,
+        user_id: int,
+        neighbours: int,
+        key: str = CacheSettings.LEADERBOARD_KEY,
+    ) -> Tuple[int, List[Tuple[int, int]]] | None:
+        """Позиция игрока (с нуля) и соседи вокруг нее, None если игрока нет."""
+        position = await self._get_position(keys=[key], args=[user_id, neighbours])
+        if position is None:
+            return None
+        start, flat = position
+        items = [(flat[i], float(flat[i + 1])) for i in range(0, len(flat), 2)]
+        return int(start), self._to_entries(items)
+
+    async def get_total(self, key: str = CacheSettings.LEADERBOARD_KEY) -> int:
+        return await self.redis.zcard(key)
+
+    async def start_rebuild(self) -> None:
+        """Начать перестроение: очистить временный ключ и поднять флаг.
+
+        Пока флаг поднят, воркер пишет счет и во временный ключ, поэтому
+        обновления, пришедшие во время перестроения, не теряются.
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(CacheSettings.LEADERBOARD_REBUILD_KEY)
+            pipe.set(
+                CacheSettings.LEADERBOARD_REBUILD_FLAG_KEY,
+                1,
+                ex=CacheSettings.LEADERBOARD_REBUILD_FLAG_TTL,
+            )
+            await pipe.execute()
+
+    async def add_rebuild_chunk(self, scores: Dict[int, int]) -> None:
+        """Записать порцию счетов во временный ключ.
+
+        GT: счет только растет, поэтому более свежее значение, уже записанное
+        воркером, не перезаписывается прочитанным ранее из БД.
+        """
+        if scores:
+            await self.redis.zadd(
+                CacheSettings.LEADERBOARD_REBUILD_KEY,
+                scores,
+                gt=True,
+            )
+
+    async def finish_rebuild(self) -> None:
+        """Атомарно заменить лидерборд перестроенным и снять флаг."""
+        exists = await self.redis.exists(CacheSettings.LEADERBOARD_REBUILD_KEY)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if exists:
+                pipe.rename(
+                    CacheSettings.LEADERBOARD_REBUILD_KEY,
+                    CacheSettings.LEADERBOARD_KEY,
+                )
+            else:
+                # В БД нет ни одного счета
+                pipe.delete(CacheSettings.LEADERBOARD_KEY)
+            pipe.delete(CacheSettings.LEADERBOARD_REBUILD_FLAG_KEY)
+            await pipe.execute()
+
+    async def abort_rebuild(self) -> None:
+        """Отменить перестроение, оставив текущий лидерборд как есть."""
+        try:
+            await self.redis.delete(
+                CacheSettings.LEADERBOARD_REBUILD_KEY,
+                CacheSettings.LEADERBOARD_REBUILD_FLAG_KEY,
+            )
+        except Exception as e:
+            logger.warning(f"Redis abort leaderboard rebuild error: {e}")
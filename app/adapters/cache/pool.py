@@ -0,0 +1,79 @@
+"""
+Общий пул соединений Redis на процесс
+"""
+import os
+import redis.asyncio as redis
+
+from typing import Any, Dict
+
+from app.application.constants import RedisConfig
+
+
+def create_redis_pool() -> redis.BlockingConnectionPool:
+    """Создать пул соединений Redis с настройками из окружения.
+
+    При исчерпании пула запрос ждет освобождения соединения не дольше
+    REDIS_POOL_TIMEOUT секунд, а не открывает новое.
+    """
+    return redis.BlockingConnectionPool.from_url(
+        os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL),
+        max_connections=int(
+            os.getenv("REDIS_MAX_CONNECTIONS", RedisConfig.MAX_CONNECTIONS)
+        ),
+        timeout=float(os.getenv("REDIS_POOL_TIMEOUT", RedisConfig.POOL_TIMEOUT)),
+        socket_timeout=float(
+            os.getenv("REDIS_SOCKET_TIMEOUT", RedisConfig.SOCKET_TIMEOUT)
+        ),
+        socket_connect_timeout=float(
+            os.getenv(
+                "REDIS_SOCKET_CONNECT_TIMEOUT",
+                RedisConfig.SOCKET_CONNECT_TIMEOUT,
+            )
+        ),
+        health_check_interval=int(
+            os.getenv(
+                "REDIS_HEALTH_CHECK_INTERVAL",
+                RedisConfig.HEALTH_CHECK_INTERVAL,
+            )
+        ),
+        decode_responses=True,
+    )
+
+
+def create_redis_client(pool: redis.ConnectionPool) -> redis.Redis:
+    """Создать клиент Redis поверх общего пула."""
+    return redis.Redis(connection_pool=pool)
+
+
+async def close_redis_client(client: redis.Redis) -> None:
+    """Закрыть клиент вместе с его пулом соединений."""
+    await client.aclose(close_connection_pool=True)
+
+
+def _count_connections(pool: redis.ConnectionPool, attribute: str) -> int | None:
+    # Публичного API для счетчиков у пула нет, а внутренние списки соединений
+    # в разных версиях redis-py устроены по-разному: без них счетчик неизвестен
+    connections = getattr(pool, attribute, None)
+    try:
+        return len(connections)
+    except TypeError:
+        return None
+
+
+def get_pool_stats(pool: redis.ConnectionPool) -> Dict[str, Any]:
+    """Текущее состояние пула: сколько соединений создано, занято и свободно.
+
+    Счетчик, который эта версия redis-py не дает прочитать, равен None.
+    """
+    in_use = _count_connections(pool, "_in_use_connections")
+    available = _count_connections(pool, "_available_connections")
+    return {
+        "max_connections": getattr(pool, "max_connections", None),
+        "created_connections": (
+            in_use + available
+            if in_use is not None and available is not None
+            else None
+        ),
+        "in_use_connections": in_use,
+        "available_connections": available,
+    }
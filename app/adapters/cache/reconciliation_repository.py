@@ -0,0 +1,113 @@
+"""
+Redis репозиторий прогресса сверки счетов (хеш запуска и множество готовых диапазонов)
+"""
+import logging
+import os
+import time
+import redis.asyncio as redis
+
+from typing import Any, Dict, Set
+
+from app.application.constants import RedisConfig, ScoreReconciliation
+
+logger = logging.getLogger(__name__)
+
+# Отметить диапазон завершенным и добавить его итоги к прогрессу запуска.
+# Повторно выполненный диапазон (повтор задачи) итоги не увеличивает; после
+# последнего диапазона записывается время окончания.
+# KEYS: прогресс, готовые диапазоны; ARGV: начало диапазона, проверено,
+# исправлено, достижений, время, TTL
+COMPLETE_CHUNK_SCRIPT = """
+if redis.call('SADD', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'checked', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'fixed', ARGV[3])
+redis.call('HINCRBY', KEYS[1], 'achievements', ARGV[4])
+local total = tonumber(redis.call('HGET', KEYS[1], 'total_chunks'))
+if total and redis.call('SCARD', KEYS[2]) >= total then
+    redis.call('HSET', KEYS[1], 'finished_at', ARGV[5])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+return 1
+"""
+
+
+class RedisReconciliationRepository:
+    """Прогресс запусков сверки: переживает перезапуск воркеров, поэтому
+    прерванный запуск продолжается с незавершенных диапазонов."""
+
+    def __init__(self, client: redis.Redis | None = None):
+        if client is None:
+            redis_url = os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL)
+            client = redis.from_url(redis_url, decode_responses=True)
+        self.redis = client
+        self._complete_chunk = self.redis.register_script(COMPLETE_CHUNK_SCRIPT)
+
+    async def create_run(
+        self,
+        run_id: str,
+        chunk_size: int,
+        max_user_id: int,
+        total_chunks: int,
+    ) -> None:
+        """Сохранить план запуска."""
+        key = ScoreReconciliation.get_progress_key(run_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "chunk_size": chunk_size,
+                "max_user_id": max_user_id,
+                "total_chunks": total_chunks,
+                "checked": 0,
+                "fixed": 0,
+                "achievements": 0,
+                "started_at": int(time.time()),
+            })
+            pipe.expire(key, ScoreReconciliation.PROGRESS_TTL)
+            await pipe.execute()
+
+    async def get_run(self, run_id: str) -> Dict[str, Any] | None:
+        """План и прогресс запуска, None если запуск не найден."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(ScoreReconciliation.get_progress_key(run_id))
+            pipe.scard(ScoreReconciliation.get_done_key(run_id))
+            progress, done = await pipe.execute()
+        if not progress:
+            return None
+        return {
+            "run_id": run_id,
+            **{name: int(value) for name, value in progress.items()},
+            "completed_chunks": done,
+        }
+
+    async def get_done_chunks(self, run_id: str) -> Set[int]:
+        """Начала завершенных диапазонов user_id."""
+        members = await self.redis.smembers(
+            ScoreReconciliation.get_done_key(run_id)
+        )
+        return {int(member) for member in members}
+
+    async def complete_chunk(
+        self,
+        run_id: str,
+        start_user_id: int,
+        checked: int,
+        fixed: int,
+        achievements: int,
+    ) -> bool:
+        """Отметить диапазон завершенным; False - он уже был отмечен."""
+        return bool(await self._complete_chunk(
+            keys=[
+                ScoreReconciliation.get_progress_key(run_id),
+                ScoreReconciliation.get_done_key(run_id),
+            ],
+            args=[
+                start_user_id,
+                checked,
+                fixed,
+                achievements,
+                int(time.time()),
+                ScoreReconciliation.PROGRESS_TTL,
+            ],
+        ))
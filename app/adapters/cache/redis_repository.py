@@ -6,7 +6,7 @@ import logging
 import redis.asyncio as redis
 import os
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timezone
 
 from app.application.entities import Event
@@ -15,13 +15,108 @@ from app.application.utils import EventTypeHelper
 
 logger = logging.getLogger(__name__)
 
+# Записать /stats, только если документ не обновлялся воркером с момента чтения.
+# KEYS: stats, поколение; ARGV: ожидаемое поколение ('' если нет), документ, TTL
+SET_STATS_IF_UNCHANGED_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# Записать счет, только если он больше текущего (иначе продлить TTL): значение
+# из БД, прочитанное раньше, не откатывает счет, уже увеличенный воркером.
+# KEYS: счет; ARGV: счет, TTL
+SET_SCORE_IF_GREATER_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if not current or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+else
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+"""
+
+# Опубликовать результат обработки событий пользователя одним вызовом:
+# счет (только если он больше текущего, чтобы запоздавший воркер не откатил
+# его назад) и закешированный /stats на месте - счет, новые достижения и
+# последние события (новые первыми, не больше лимита). Тот же счет пишется в
+# лидерборд, а во время его перестроения - и во временный ключ. Очки событий
+# добавляются в лидерборды периодов (их набор зависит от дат событий: ключи
+# периодов идут в KEYS после шести постоянных, а очки и EXPIREAT - в ARGV в
+# том же порядке). Поколение /stats увеличивается всегда.
+# KEYS: счет, stats, поколение, лидерборд, временный лидерборд, флаг
+# перестроения, ключи периодов...; ARGV: счет, TTL счета, достижения (JSON),
+# события (JSON), лимит событий, TTL поколения, user_id,
+# [[очки, EXPIREAT]] периодов (JSON)
+UPDATE_USER_PROGRESS_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if not current or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+else
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+local score = redis.call('GET', KEYS[1])
+redis.call('ZADD', KEYS[4], 'GT', score, ARGV[7])
+if redis.call('EXISTS', KEYS[6]) == 1 then
+    redis.call('ZADD', KEYS[5], 'GT', score, ARGV[7])
+end
+for i, bucket in ipairs(cjson.decode(ARGV[8])) do
+    redis.call('ZINCRBY', KEYS[6 + i], bucket[1], ARGV[7])
+    redis.call('EXPIREAT', KEYS[6 + i], bucket[2])
+end
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+local raw = redis.call('GET', KEYS[2])
+if not raw then
+    return 0
+end
+local stats = cjson.decode(raw)
+local achievements = stats['achievements']
+for _, name in ipairs(cjson.decode(ARGV[3])) do
+    table.insert(achievements, name)
+end
+local limit = tonumber(ARGV[5])
+local events = {}
+for _, event in ipairs(cjson.decode(ARGV[4])) do
+    if #events < limit then table.insert(events, event) end
+end
+for _, event in ipairs(stats['last_events']) do
+    if #events < limit then table.insert(events, event) end
+end
+-- cjson кодирует пустую таблицу как объект, поэтому массивы собираем явно
+local function encode_array(items)
+    if #items == 0 then return '[]' end
+    return cjson.encode(items)
+end
+local doc = '{"user_id":' .. cjson.encode(stats['user_id'])
+    .. ',"score":' .. score
+    .. ',"achievements":' .. encode_array(achievements)
+    .. ',"last_events":' .. encode_array(events) .. '}'
+redis.call('SET', KEYS[2], doc, 'KEEPTTL')
+return 1
+"""
+
 
 class RedisUserScoreRepository:
     """Репозиторий для работы с кешем Redis по счетам, событиям, достижениям и stats."""
 
-    def __init__(self):
-        redis_url = os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL)
-        self.redis = redis.from_url(redis_url, decode_responses=True)
+    def __init__(self, client: redis.Redis | None = None):
+        # Клиент общего пула передается извне; без него создается собственный
+        if client is None:
+            redis_url = os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL)
+            client = redis.from_url(redis_url, decode_responses=True)
+        self.redis = client
+        self._set_stats_if_unchanged = self.redis.register_script(
+            SET_STATS_IF_UNCHANGED_SCRIPT
+        )
+        self._update_user_progress = self.redis.register_script(
+            UPDATE_USER_PROGRESS_SCRIPT
+        )
+        self._set_score_if_greater = self.redis.register_script(
+            SET_SCORE_IF_GREATER_SCRIPT
+        )
 
     def _score_key(self, user_id: int) -> str:
         # "user:{user_id}:score"
@@ -39,6 +134,19 @@ class RedisUserScoreRepository:
         # "user:{user_id}:stats"
         return CacheSettings.get_stats_key(user_id)
 
+    def _stats_generation_key(self, user_id: int) -> str:
+        # "user:{user_id}:stats:gen"
+        return CacheSettings.get_stats_generation_key(user_id)
+
+    @staticmethod
+    def _event_to_dict(event: Event) -> Dict[str, Any]:
+        return {
+            "id": event.id,
+            "event_type": EventTypeHelper.to_string(event.event_type),
+            "details": event.details,
+            "created_at": (event.created_at or datetime.now(timezone.utc)).isoformat()
+        }
+
     async def get_score(self, user_id: int) -> int:
         """Получить общий счет пользователя из Redis."""
         try:
@@ -60,13 +168,30 @@ class RedisUserScoreRepository:
         except Exception as e:
             logger.warning(f"Redis set_score error for user {user_id}: {e}")
 
+    async def get_scores_many(self, user_ids: List[int]) -> Dict[int, int]:
+        """Получить счета нескольких пользователей одним MGET."""
+        if not user_ids:
+            return {}
+        try:
+            values = await self.redis.mget(
+                [self._score_key(user_id) for user_id in user_ids]
+            )
+            return {
+                user_id: int(val) if val is not None else 0
+                for user_id, val in zip(user_ids, values)
+            }
+        except Exception as e:
+            logger.warning(f"Redis get_scores_many error: {e}")
+            return dict.fromkeys(user_ids, 0)
+
     async def increment_score(self, user_id: int, points: int) -> int:
-        """Атомарно увеличить счет пользователя на points (INCRBY)."""
+        """Атомарно увеличить счет пользователя на points (MULTI: INCRBY+EXPIRE)."""
         try:
             key = self._score_key(user_id)
-            new_score = await self.redis.incrby(key, points)
-            # обновляем TTL
-            await self.redis.expire(key, CacheSettings.DEFAULT_TTL)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.incrby(key, points)
+                pipe.expire(key, CacheSettings.DEFAULT_TTL)
+                new_score, _ = await pipe.execute()
             logger.debug(
                 f"Incremented score by {points} for user={user_id}, new={new_score}"
             )
@@ -76,20 +201,80 @@ class RedisUserScoreRepository:
             # на ошибку – просто возвращаем начисленное
             return points
 
+    async def increment_scores_many(
+        self,
+        increments: Dict[int, int],
+    ) -> Dict[int, int]:
+        """Увеличить счета нескольких пользователей одной транзакцией MULTI."""
+        if not increments:
+            return {}
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for user_id, points in increments.items():
+                    key = self._score_key(user_id)
+                    pipe.incrby(key, points)
+                    pipe.expire(key, CacheSettings.DEFAULT_TTL)
+                results = await pipe.execute()
+            # Результаты INCRBY стоят на четных позициях
+            return dict(zip(increments, results[::2]))
+        except Exception as e:
+            logger.warning(f"Redis increment_scores_many error: {e}")
+            return dict(increments)
+
+    async def set_scores_many(
+        self,
+        scores: Dict[int, int],
+        gt: bool = True,
+    ) -> None:
+        """Записать счета пользователей из БД одним конвейером.
+
+        При gt счет (и в user:{id}:score, и в лидерборде) пишется, только если
+        он больше текущего, как у воркера; gt=False перезаписывает его - для
+        исправления завышенного счета. Закешированный /stats удаляется, а его
+        поколение увеличивается, чтобы читатель, собравший документ до записи,
+        не закешировал устаревший счет.
+        """
+        if not scores:
+            return
+        rebuilding = await self.redis.exists(
+            CacheSettings.LEADERBOARD_REBUILD_FLAG_KEY
+        )
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id, score in scores.items():
+                if gt:
+                    await self._set_score_if_greater(
+                        keys=[self._score_key(user_id)],
+                        args=[score, CacheSettings.DEFAULT_TTL],
+                        client=pipe,
+                    )
+                else:
+                    pipe.set(
+                        self._score_key(user_id),
+                        score,
+                        ex=CacheSettings.DEFAULT_TTL,
+                    )
+                pipe.delete(self._stats_key(user_id))
+                pipe.incr(self._stats_generation_key(user_id))
+                pipe.expire(
+                    self._stats_generation_key(user_id),
+                    CacheSettings.STATS_TTL * 2,
+                )
+            pipe.zadd(CacheSettings.LEADERBOARD_KEY, scores, gt=gt)
+            if rebuilding:
+                pipe.zadd(CacheSettings.LEADERBOARD_REBUILD_KEY, scores, gt=gt)
+            await pipe.execute()
+
     async def add_event(self, user_id: int, event: Event) -> None:
         """Добавить событие в начало списка последних событий в Redis."""
         try:
-            data = {
-                "id": event.id,
-                "event_type": EventTypeHelper.to_string(event.event_type),
-                "details": event.details,
-                "created_at": (event.created_at or datetime.now(timezone.utc)).isoformat()
-            }
+            data = self._event_to_dict(event)
             key = self._events_key(user_id)
-            await self.redis.lpush(key, json.dumps(data))
-            # оставляем только Limits.EVENTS_IN_CACHE последних
-            await self.redis.ltrim(key, 0, Limits.EVENTS_IN_CACHE - 1)
-            await self.redis.expire(key, CacheSettings.DEFAULT_TTL)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.lpush(key, json.dumps(data))
+                # оставляем только Limits.EVENTS_IN_CACHE последних
+                pipe.ltrim(key, 0, Limits.EVENTS_IN_CACHE - 1)
+                pipe.expire(key, CacheSettings.DEFAULT_TTL)
+                await pipe.execute()
             logger.debug(f"Added event {event.id} to cache for user {user_id}")
         except Exception as e:
             logger.warning(f"Redis add_event error for user {user_id}: {e}")
@@ -108,8 +293,10 @@ class RedisUserScoreRepository:
         """Добавить идентификатор достижения в множество Redis."""
         try:
             key = self._achievements_key(user_id)
-            await self.redis.sadd(key, achievement_id)
-            await self.redis.expire(key, CacheSettings.DEFAULT_TTL)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.sadd(key, achievement_id)
+                pipe.expire(key, CacheSettings.DEFAULT_TTL)
+                await pipe.execute()
             logger.debug(f"Added achievement {achievement_id} to cache for user {user_id}")
         except Exception as e:
             logger.warning(f"Redis add_achievement error for user {user_id}: {e}")
@@ -134,12 +321,160 @@ class RedisUserScoreRepository:
             logger.warning(f"Redis get_stats error for user {user_id}: {e}")
             return None
 
-    async def set_stats(self, user_id: int, stats: Dict[str, Any]) -> None:
-        """Закешировать весь ответ /stats/{user_id} на TTL."""
+    async def get_stats_and_score(
+        self,
+        user_id: int,
+    ) -> tuple[Dict[str, Any] | None, int, str | None]:
+        """Получить кешированный /stats, счет и поколение /stats за один round trip."""
         try:
-            key = self._stats_key(user_id)
-            await self.redis.set(key, json.dumps(stats), ex=CacheSettings.STATS_TTL)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._stats_key(user_id))
+                pipe.get(self._score_key(user_id))
+                pipe.get(self._stats_generation_key(user_id))
+                raw_stats, raw_score, generation = await pipe.execute()
+            return (
+                json.loads(raw_stats) if raw_stats else None,
+                int(raw_score) if raw_score is not None else 0,
+                generation,
+            )
+        except Exception as e:
+            logger.warning(f"Redis get_stats_and_score error for user {user_id}: {e}")
+            return None, 0, None
+
+    async def set_stats(
+        self,
+        user_id: int,
+        stats: Dict[str, Any],
+        generation: str | None = None,
+    ) -> None:
+        """Закешировать весь ответ /stats/{user_id} на TTL.
+
+        Документ не записывается, если воркер обновил /stats после того, как
+        было прочитано поколение generation: иначе устаревший снимок БД
+        затер бы более свежее обновление.
+        """
+        try:
+            await self._set_stats_if_unchanged(
+                keys=[self._stats_key(user_id), self._stats_generation_key(user_id)],
+                args=[generation or "", json.dumps(stats), CacheSettings.STATS_TTL],
+            )
             logger.debug(f"Cached stats for user={user_id}")
         except Exception as e:
             logger.warning(f"Redis set_stats error for user {user_id}: {e}")
 
+    async def update_user_progress(
+        self,
+        user_id: int,
+        score: int,
+        achievement_names: List[str],
+        events: List[Event],
+        period_increments: List[Tuple[str, int, int]] | None = None,
+    ) -> None:
+        """Записать счет (и в лидерборды) и обновить закешированный /stats одним
+        вызовом EVALSHA.
+
+        period_increments - [(ключ лидерборда периода, очки, EXPIREAT)].
+        """
+        events = sorted(
+            events,
+            key=lambda e: (e.created_at is not None, e.created_at, e.id or 0),
+            reverse=True,
+        )
+        period_increments = period_increments or []
+        try:
+            await self._update_user_progress(
+                keys=[
+                    self._score_key(user_id),
+                    self._stats_key(user_id),
+                    self._stats_generation_key(user_id),
+                    CacheSettings.LEADERBOARD_KEY,
+                    CacheSettings.LEADERBOARD_REBUILD_KEY,
+                    CacheSettings.LEADERBOARD_REBUILD_FLAG_KEY,
+                    *(key for key, _, _ in period_increments),
+                ],
+                args=[
+                    score,
+                    CacheSettings.DEFAULT_TTL,
+                    json.dumps(achievement_names),
+                    json.dumps([self._event_to_dict(e) for e in events]),
+                    Limits.RECENT_EVENTS_LIMIT,
+                    CacheSettings.STATS_TTL * 2,
+                    user_id,
+                    json.dumps([
+                        [points, expire_at]
+                        for _, points, expire_at in period_increments
+                    ]),
+                ],
+            )
+            logger.debug(f"Updated score={score} and cached stats for user={user_id}")
+        except Exception as e:
+            logger.warning(f"Redis update_user_progress error for user {user_id}: {e}")
+            # Не оставляем устаревший документ, если обновить его не удалось
+            await self.redis.delete(self._stats_key(user_id))
+
+    async def acquire_stats_lock(self, user_id: int) -> bool:
+        """Занять перестроение /stats пользователя (SET NX PX)."""
+        try:
+            return bool(await self.redis.set(
+                CacheSettings.get_stats_lock_key(user_id),
+                "1",
+                nx=True,
+                px=CacheSettings.STATS_LOCK_TTL_MS,
+            ))
+        except Exception as e:
+            logger.warning(f"Redis acquire_stats_lock error for user {user_id}: {e}")
+            return True
+
+    async def release_stats_lock(self, user_id: int) -> None:
+        """Освободить перестроение /stats пользователя."""
+        try:
+            await self.redis.delete(CacheSettings.get_stats_lock_key(user_id))
+        except Exception as e:
+            logger.warning(f"Redis release_stats_lock error for user {user_id}: {e}")
+
+    async def get_processed_events(self, event_ids: List[int]) -> set[int]:
+        """ID событий из event_ids, отмеченных примененными (MGET)."""
+        if not event_ids:
+            return set()
+        try:
+            values = await self.redis.mget(
+                [CacheSettings.get_processed_event_key(i) for i in event_ids]
+            )
+            return {
+                event_id
+                for event_id, value in zip(event_ids, values)
+                if value is not None
+            }
+        except Exception as e:
+            # Без метки событие просто проверит журнал в БД
+            logger.warning(f"Redis get_processed_events error: {e}")
+            return set()
+
+    async def mark_events_processed(self, event_ids: List[int]) -> None:
+        """Отметить события примененными (SET NX EX одним пайплайном)."""
+        if not event_ids:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for event_id in event_ids:
+                    pipe.set(
+                        CacheSettings.get_processed_event_key(event_id),
+                        1,
+                        nx=True,
+                        ex=CacheSettings.PROCESSED_EVENT_TTL,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis mark_events_processed error: {e}")
+
+    async def get_achievement_catalog_version(self) -> str | None:
+        """Получить версию каталога достижений."""
+        try:
+            return await self.redis.get(CacheSettings.ACHIEVEMENT_CATALOG_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Redis get_achievement_catalog_version error: {e}")
+            return None
+
+    async def bump_achievement_catalog_version(self) -> None:
+        """Увеличить версию каталога достижений, чтобы процессы его перечитали."""
+        await self.redis.incr(CacheSettings.ACHIEVEMENT_CATALOG_VERSION_KEY)
@@ -1,125 +1,286 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
-from celery.exceptions import Retry
-from app.adapters.celery.config import celery_app, run_async, CelerySession
+from celery import group
+
+from app.adapters.celery.config import (
+    celery_app,
+    run_async,
+    CelerySession,
+    CELERY_IGNORE_RESULT,
+    get_worker_redis_repository,
+)
+from app.adapters.pipeline.config import (
+    EVENT_PROCESSING_MODE,
+    EVENT_BATCH_SIZE,
+)
+from app.adapters.pipeline.event_pipeline import EventPipeline
+from app.adapters.notifications.sinks import create_notification_sink
 from app.adapters.database.repositories import (
     EventRepository,
-    AchievementRepository,
-    UserAchievementRepository,
     UserScoreRepository,
+    UserRepository,
+    EventPartitionRepository,
+    ProcessedEventRepository,
+    EventOutboxRepository,
+    AchievementNotificationRepository,
+    AchievementRepository,
+    ScoreReconciliationRepository,
+)
+from app.adapters.database.partitioning import (
+    EVENTS_PARTITIONS_AHEAD,
+    EVENTS_RETENTION_MONTHS,
+    EVENTS_ARCHIVE_ENABLED,
+    EVENTS_ARCHIVE_RETENTION_MONTHS,
+)
+from app.adapters.cache.leaderboard_repository import RedisLeaderboardRepository
+from app.adapters.cache.event_stream_repository import RedisEventStreamRepository
+from app.adapters.cache.reconciliation_repository import (
+    RedisReconciliationRepository,
+)
+from app.application.services.achievement_catalog import achievement_catalog_cache
+from app.application.services.leaderboard_service import LeaderboardService
+from app.application.services.event_partition_service import (
+    EventPartitionService,
 )
-from app.adapters.cache.redis_repository import RedisUserScoreRepository
-from app.application.utils import ScoreCalculator, AchievementChecker
-from app.application.entities import UserAchievement, UserScore, EventType
-from app.application.constants import CacheSettings
+from app.application.services.notification_service import (
+    NotificationDeliveryService,
+)
+from app.application.services.score_reconciliation_service import (
+    ScoreReconciliationService,
+)
+from app.application.constants import CeleryConfig, NotificationDelivery
 
 logger = logging.getLogger(__name__)
 
 
-class LockBusyError(Exception):
-    """Повтор ретрая, когда Redis‑блокировка занята."""
-    pass
+def _retry_countdown(retries: int) -> int:
+    # Повтор безопасен благодаря журналу processed_events, поэтому ретраим
+    # быстро с экспоненциальной задержкой
+    return CeleryConfig.EVENT_RETRY_COUNTDOWN * 2 ** retries
 
 
-@celery_app.task(bind=True, max_retries=5)
+@celery_app.task(
+    bind=True,
+    max_retries=CeleryConfig.EVENT_MAX_RETRIES,
+    ignore_result=CELERY_IGNORE_RESULT,
+)
 def process_event(self, event_id: int):
     try:
-        return run_async(_process_event_async, event_id)
-    except LockBusyError as e:
-        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        run_async(_process_event_batch_async, [event_id])
+    except Exception as e:
+        raise self.retry(
+            exc=e,
+            countdown=_retry_countdown(self.request.retries),
+        )
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=CeleryConfig.EVENT_MAX_RETRIES,
+    ignore_result=CELERY_IGNORE_RESULT,
+)
+def process_event_batch(self, event_ids: list[int]):
+    try:
+        run_async(_process_event_batch_async, event_ids)
     except Exception as e:
-        logger.error(f"Error in process_event task: {e}", exc_info=True)
-        raise self.retry(exc=e, countdown=60)
+        # Отложенные события не вернулись в outbox (например, БД недоступна):
+        # повторяем пакет целиком, уже примененные события не начислятся
+        raise self.retry(
+            exc=e,
+            countdown=_retry_countdown(self.request.retries),
+        )
+
+
+@celery_app.task(name="relay_event_outbox", ignore_result=CELERY_IGNORE_RESULT)
+def relay_event_outbox():
+    """Передает события из outbox на обработку (at-least-once)."""
+    return run_async(_relay_event_outbox_async)
+
+
+def _get_event_pipeline(CelerySession) -> EventPipeline:
+    return EventPipeline(CelerySession, get_worker_redis_repository())
+
 
+async def _enqueue_event_batch(event_ids: list[int]) -> list[int]:
+    process_event_batch.delay(event_ids)
+    return []
+
+
+async def _relay_event_outbox_async(CelerySession) -> int:
+    pipeline = _get_event_pipeline(CelerySession)
+    if EVENT_PROCESSING_MODE == CeleryConfig.PROCESSING_MODE_BATCH:
+        dispatch = pipeline.process
+    elif EVENT_PROCESSING_MODE == CeleryConfig.PROCESSING_MODE_STREAM:
+        # Обычно outbox в этом режиме ретранслирует сам stream-воркер
+        dispatch = RedisEventStreamRepository(
+            client=get_worker_redis_repository().redis
+        ).publish
+    else:
+        dispatch = _enqueue_event_batch
+    return await pipeline.relay(dispatch, EVENT_BATCH_SIZE)
+
+
+async def _process_event_batch_async(
+    CelerySession,
+    event_ids: list[int],
+) -> None:
+    """Обрабатывает пакет событий и откладывает упавшие через outbox."""
+    pipeline = _get_event_pipeline(CelerySession)
+    await pipeline.defer(await pipeline.process(event_ids))
+
+
+@celery_app.task(
+    name="deliver_achievement_notifications",
+    ignore_result=CELERY_IGNORE_RESULT,
+)
+def deliver_achievement_notifications():
+    """Доставляет сохраненные уведомления о достижениях пакетами."""
+    return run_async(_deliver_achievement_notifications_async)
 
-async def _process_event_async(CelerySession, event_id: int):
-    redis_repo = RedisUserScoreRepository()
-    lock_key = None
 
+async def _deliver_achievement_notifications_async(CelerySession) -> dict:
+    sink = create_notification_sink()
+    report = {"sent": 0, "failed": 0}
+
+    for _ in range(NotificationDelivery.MAX_BATCHES):
+        # Сессия на пакет: блокировки пакета снимаются отметкой результата
+        async with CelerySession() as session:
+            batch = await NotificationDeliveryService(
+                AchievementNotificationRepository(session),
+                sink,
+            ).deliver_pending(NotificationDelivery.BATCH_SIZE)
+        report["sent"] += batch["sent"]
+        report["failed"] += batch["failed"]
+        # Пакет не заполнен или получатель недоступен - ждем следующего запуска
+        if batch["failed"] or batch["sent"] < NotificationDelivery.BATCH_SIZE:
+            break
+
+    if report["sent"] or report["failed"]:
+        logger.info(f"Achievement notifications delivered: {report}")
+    return report
+
+
+@celery_app.task(
+    name="invalidate_achievement_catalog",
+    ignore_result=CELERY_IGNORE_RESULT,
+)
+def invalidate_achievement_catalog():
+    """Сбрасывает кеш каталога достижений во всех процессах."""
+    return run_async(_invalidate_achievement_catalog_async)
+
+
+async def _invalidate_achievement_catalog_async(CelerySession):
+    await achievement_catalog_cache.invalidate(get_worker_redis_repository())
+
+
+@celery_app.task(name="rebuild_leaderboard")
+def rebuild_leaderboard():
+    """Перестраивает глобальный лидерборд из user_scores."""
+    return run_async(_rebuild_leaderboard_async)
+
+
+async def _rebuild_leaderboard_async(CelerySession) -> int:
     async with CelerySession() as session:
-        event_repo = EventRepository(session)
-        score_repo = UserScoreRepository(session)
-        achievement_repo = AchievementRepository(session)
-        user_achievement_repo = UserAchievementRepository(session)
-
-        # Читаем событие
-        event = await event_repo.get_by_id(event_id)
-        if not event:
-            logger.warning(f"Event {event_id} not found")
-            return
-
-        user_id = event.user_id
-
-        # Ставим Redis‑блокировку
-        lock_key = f"lock:user_score:{user_id}"
-        locked = await redis_repo.redis.set(lock_key, "1", nx=True, ex=30)
-        if not locked:
-            logger.info(f"Lock for user {user_id} is busy, retrying later")
-            raise LockBusyError()
-
-        # Получаем или создаём запись user_score
-        user_score = await score_repo.get_by_user_id(user_id)
-        if not user_score:
-            user_score = UserScore(
-                user_id=user_id,
-                login_count=0,
-                levels_completed=0,
-                secrets_found=0,
-            )
-            await score_repo.create(user_score)
-
-        # Обновляем счётчики
-        if event.event_type == EventType.LOGIN.value:
-            user_score.login_count += 1
-        elif event.event_type == EventType.COMPLETE_LEVEL.value:
-            user_score.levels_completed += 1
-            lvl = event.details.get("level_id", 0) if event.details else 0
-            # points рассчитывается внутри ScoreCalculator
-        else:  # find_secret
-            user_score.secrets_found += 1
-
-        await score_repo.update(user_score)
-
-        # Сохраняем в Redis и очищаем кэш /stats
-        total_score = ScoreCalculator.calculate_total_score(user_score)
-        await redis_repo.redis.set(
-            f"user:{user_id}:score",
-            total_score,
-            ex=CacheSettings.DEFAULT_TTL,
+        service = LeaderboardService(
+            RedisLeaderboardRepository(client=get_worker_redis_repository().redis),
+            UserRepository(session),
+            UserScoreRepository(session),
         )
-        await redis_repo.redis.delete(CacheSettings.get_stats_key(user_id))
-
-        # Проверяем достижения
-        all_achievements = await achievement_repo.get_all()
-        existing = await user_achievement_repo.get_by_user_id(user_id)
-        earned_ids = AchievementChecker.get_earned_achievement_ids(existing)
-
-        new_achievements = []
-        for ach in all_achievements:
-            if (
-                ach.id not in earned_ids
-                and AchievementChecker.check_achievement_condition(ach, user_score)
-            ):
-                session.add(
-                    UserAchievement(
-                        user_id=user_id,
-                        achievement_id=ach.id,
-                    )
-                )
-                new_achievements.append(ach.name)
-
-        # Фиксируем все изменения в БД
+        total = await service.rebuild()
+    logger.info(f"Leaderboard rebuilt: {total} users")
+    return total
+
+
+@celery_app.task(name="maintain_event_partitions", ignore_result=CELERY_IGNORE_RESULT)
+def maintain_event_partitions():
+    """Создает партиции events вперед и выводит старые по политике хранения."""
+    return run_async(_maintain_event_partitions_async)
+
+
+async def _maintain_event_partitions_async(CelerySession) -> dict:
+    async with CelerySession() as session:
+        service = EventPartitionService(
+            EventPartitionRepository(session),
+            partitions_ahead=EVENTS_PARTITIONS_AHEAD,
+            retention_months=EVENTS_RETENTION_MONTHS,
+            archive_enabled=EVENTS_ARCHIVE_ENABLED,
+            archive_retention_months=EVENTS_ARCHIVE_RETENTION_MONTHS,
+        )
+        return await service.maintain()
+
+
+@celery_app.task(name="purge_idempotency_records", ignore_result=CELERY_IGNORE_RESULT)
+def purge_idempotency_records():
+    """Удаляет устаревшие ключи идемпотентности, записи журнала событий и
+    счетчики попыток."""
+    return run_async(_purge_idempotency_records_async)
+
+
+async def _purge_idempotency_records_async(CelerySession) -> dict:
+    before = datetime.now(timezone.utc) - timedelta(
+        days=CeleryConfig.IDEMPOTENCY_RETENTION_DAYS
+    )
+    async with CelerySession() as session:
+        keys = await EventRepository(session).purge_idempotency_keys(before)
+        processed = await ProcessedEventRepository(session).purge(before)
+        failures = await EventOutboxRepository(session).purge_failures(before)
         await session.commit()
+    logger.info(
+        f"Purged {keys} idempotency keys, {processed} processed events "
+        f"and {failures} delivery failure counters"
+    )
+    return {
+        "idempotency_keys": keys,
+        "processed_events": processed,
+        "delivery_failures": failures,
+    }
 
-        # Отправляем уведомления
-        for name in new_achievements:
-            send_achievement_notification.delay(user_id, name)
 
-    # Снимаем блокировку
-    if lock_key:
-        await redis_repo.redis.delete(lock_key)
+@celery_app.task(
+    bind=True,
+    name="reconcile_score_chunk",
+    max_retries=CeleryConfig.EVENT_MAX_RETRIES,
+    ignore_result=True,
+)
+def reconcile_score_chunk(self, run_id: str, start_user_id: int, end_user_id: int):
+    """Сверяет счета диапазона пользователей с таблицей событий."""
+    try:
+        return run_async(
+            _reconcile_score_chunk_async, run_id, start_user_id, end_user_id)
+    except Exception as e:
+        # Прогресс в Redis не отмечен, поэтому диапазон можно и повторить,
+        # и продолжить позже командой reconcile-scores --resume
+        raise self.retry(exc=e, countdown=_retry_countdown(self.request.retries))
+
 
+def dispatch_score_reconciliation(run_id: str, chunks: list[tuple[int, int]]):
+    """Ставит диапазоны запуска сверки в очередь одной группой задач."""
+    group(
+        reconcile_score_chunk.s(run_id, start_user_id, end_user_id)
+        for start_user_id, end_user_id in chunks
+    ).apply_async()
 
-@celery_app.task(name="send_achievement_notification")
-def send_achievement_notification(user_id: int, achievement_name: str):
-    logger.info(f"[Achievement] User #{user_id} unlocked '{achievement_name}'")
+
+async def _reconcile_score_chunk_async(
+    CelerySession,
+    run_id: str,
+    start_user_id: int,
+    end_user_id: int,
+) -> dict:
+    redis_repo = get_worker_redis_repository()
+    async with CelerySession() as session:
+        service = ScoreReconciliationService(
+            ScoreReconciliationRepository(session),
+            RedisReconciliationRepository(client=redis_repo.redis),
+            AchievementRepository(session),
+            redis_repo,
+            retention_months=EVENTS_RETENTION_MONTHS,
+        )
+        report = await service.reconcile_chunk(
+            run_id, start_user_id, end_user_id)
+    logger.info(
+        f"Score reconciliation {run_id}: users {start_user_id}.."
+        f"{end_user_id - 1} checked: {report}"
+    )
+    return report
@@ -0,0 +1,55 @@
+"""
+Начисление достижений в SQL сразу для множества пользователей
+"""
+from typing import Mapping
+
+from sqlalchemy import and_, or_, select, literal, func, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.achievement_rules import ALL, AchievementRule
+from app.adapters.database.tables import (
+	user_scores_table,
+	user_achievements_table,
+)
+
+
+def rule_condition(rule: AchievementRule):
+	"""Условие WHERE по строке user_scores для правила достижения"""
+	if rule.operator is None:
+		return func.coalesce(user_scores_table.c[rule.field], 0) >= rule.value
+	combine = and_ if rule.operator == ALL else or_
+	return combine(*(rule_condition(child) for child in rule.children))
+
+
+async def award_matching(
+	session: AsyncSession,
+	rules: Mapping[int, AchievementRule],
+	users_condition,
+) -> int:
+	"""Начисляет достижения пользователям user_scores, попавшим под
+	users_condition, правила которых выполняются. Возвращает число
+	начисленных достижений.
+
+	По одному INSERT ... SELECT на достижение: правило проверяется в SQL
+	сразу для всех пользователей, уже полученные достижения отсекает
+	уникальный индекс. Коммит остается за вызывающим кодом.
+	"""
+	awarded = 0
+	for achievement_id, rule in rules.items():
+		result = await session.execute(
+			pg_insert(user_achievements_table)
+			.from_select(
+				["user_id", "achievement_id"],
+				select(
+					user_scores_table.c.user_id,
+					literal(achievement_id, Integer),
+				)
+				.where(users_condition, rule_condition(rule)),
+			)
+			.on_conflict_do_nothing(
+				index_elements=["user_id", "achievement_id"]
+			)
+		)
+		awarded += result.rowcount
+	return awarded
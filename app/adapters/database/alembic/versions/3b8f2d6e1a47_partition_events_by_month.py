@@ -0,0 +1,124 @@
+"""partition_events_by_month
+
+Revision ID: 3b8f2d6e1a47
+Revises: 7c1e4a9b2f60
+Create Date: 2026-10-18 21:48:12.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '3b8f2d6e1a47'
+down_revision: Union[str, None] = '7c1e4a9b2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько месяцев вперед создать партиций сразу; дальше их ведет
+# периодическая задача maintain_event_partitions
+PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+	# Старая таблица переименовывается, данные переносятся в секционированную
+	op.execute("ALTER TABLE events RENAME TO events_legacy")
+	op.execute(
+		"ALTER TABLE events_legacy "
+		"RENAME CONSTRAINT events_pkey TO events_legacy_pkey"
+	)
+	op.execute(
+		"ALTER INDEX IF EXISTS ix_events_user_id_created_at "
+		"RENAME TO ix_events_legacy_user_id_created_at"
+	)
+
+	# Ключ секционирования обязан входить в первичный ключ
+	op.execute(
+		"""
+		CREATE TABLE events (
+			id integer NOT NULL DEFAULT nextval('events_id_seq'),
+			user_id integer NOT NULL REFERENCES users (id),
+			event_type varchar(50) NOT NULL,
+			details json,
+			created_at timestamptz NOT NULL DEFAULT now(),
+			PRIMARY KEY (id, created_at)
+		) PARTITION BY RANGE (created_at)
+		"""
+	)
+	op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+	op.execute(
+		"CREATE INDEX ix_events_user_id_created_at "
+		"ON events (user_id, created_at DESC)"
+	)
+
+	# Помесячные партиции от самого старого события до PARTITIONS_AHEAD
+	# месяцев вперед. Границы месяцев считаются в UTC
+	op.execute("SET LOCAL TIME ZONE 'UTC'")
+	op.execute(
+		f"""
+		DO $$
+		DECLARE
+			month_start timestamptz;
+			last_month timestamptz :=
+				date_trunc('month', now()) + interval '{PARTITIONS_AHEAD} months';
+		BEGIN
+			SELECT date_trunc('month', coalesce(min(created_at), now()))
+			INTO month_start
+			FROM events_legacy;
+
+			WHILE month_start <= last_month LOOP
+				EXECUTE format(
+					'CREATE TABLE %I PARTITION OF events '
+					'FOR VALUES FROM (%L) TO (%L)',
+					'events_p' || to_char(month_start, 'YYYYMM'),
+					month_start,
+					month_start + interval '1 month'
+				);
+				month_start := month_start + interval '1 month';
+			END LOOP;
+		END
+		$$
+		"""
+	)
+
+	op.execute(
+		"""
+		INSERT INTO events (id, user_id, event_type, details, created_at)
+		SELECT id, user_id, event_type, details, coalesce(created_at, now())
+		FROM events_legacy
+		"""
+	)
+	op.execute("DROP TABLE events_legacy")
+
+
+def downgrade() -> None:
+	op.execute("ALTER TABLE events RENAME TO events_partitioned")
+	op.execute(
+		"ALTER INDEX ix_events_user_id_created_at "
+		"RENAME TO ix_events_partitioned_user_id_created_at"
+	)
+	op.execute(
+		"""
+		CREATE TABLE events (
+			id integer NOT NULL DEFAULT nextval('events_id_seq'),
+			user_id integer NOT NULL REFERENCES users (id),
+			event_type varchar(50) NOT NULL,
+			details json,
+			created_at timestamptz DEFAULT now(),
+			PRIMARY KEY (id)
+		)
+		"""
+	)
+	op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+	op.execute(
+		"CREATE INDEX ix_events_user_id_created_at "
+		"ON events (user_id, created_at DESC)"
+	)
+	op.execute(
+		"""
+		INSERT INTO events (id, user_id, event_type, details, created_at)
+		SELECT id, user_id, event_type, details, created_at
+		FROM events_partitioned
+		"""
+	)
+	# Архивные партиции (отсоединенные) не возвращаются
+	op.execute("DROP TABLE events_partitioned")
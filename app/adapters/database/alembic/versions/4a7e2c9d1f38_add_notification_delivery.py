@@ -0,0 +1,71 @@
+"""add_notification_delivery
+
+Revision ID: 4a7e2c9d1f38
+Revises: c52a8e0f7d93
+Create Date: 2026-10-18 23:52:17.204519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '4a7e2c9d1f38'
+down_revision: Union[str, None] = 'c52a8e0f7d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	op.execute(
+		"UPDATE achievement_notifications SET is_sent = false "
+		"WHERE is_sent IS NULL"
+	)
+	op.alter_column(
+		'achievement_notifications',
+		'is_sent',
+		nullable=False,
+		server_default=sa.text('false'),
+	)
+
+	# Повторы доставки с экспоненциальной задержкой
+	op.add_column(
+		'achievement_notifications',
+		sa.Column('attempts', sa.Integer(), nullable=False,
+		          server_default=sa.text('0')),
+	)
+	op.add_column(
+		'achievement_notifications',
+		sa.Column('next_attempt_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=True),
+	)
+	op.add_column(
+		'achievement_notifications',
+		sa.Column('last_error', sa.Text(), nullable=True),
+	)
+	# Уже существующие неотправленные уведомления доставляются сразу
+	op.execute(
+		"UPDATE achievement_notifications SET next_attempt_at = now() "
+		"WHERE NOT is_sent"
+	)
+	op.create_index(
+		'ix_achievement_notifications_pending',
+		'achievement_notifications',
+		['next_attempt_at'],
+		postgresql_where=sa.text('NOT is_sent'),
+	)
+
+
+def downgrade() -> None:
+	op.drop_index('ix_achievement_notifications_pending',
+	              table_name='achievement_notifications')
+	op.drop_column('achievement_notifications', 'last_error')
+	op.drop_column('achievement_notifications', 'next_attempt_at')
+	op.drop_column('achievement_notifications', 'attempts')
+	op.alter_column(
+		'achievement_notifications',
+		'is_sent',
+		nullable=True,
+		server_default=None,
+	)
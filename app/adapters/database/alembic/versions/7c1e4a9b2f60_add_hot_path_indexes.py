@@ -0,0 +1,100 @@
+"""add_hot_path_indexes
+
+Revision ID: 7c1e4a9b2f60
+Revises: de33277b4a94
+Create Date: 2026-10-18 21:20:04.512347
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '7c1e4a9b2f60'
+down_revision: Union[str, None] = 'de33277b4a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Попыток построить индекс: например, дубликат, вставленный приложением
+# между очисткой и построением, оставляет индекс INVALID
+INDEX_BUILD_ATTEMPTS = 3
+
+DELETE_DUPLICATE_AWARDS = """
+	DELETE FROM user_achievements a
+	USING user_achievements b
+	WHERE a.user_id = b.user_id
+	  AND a.achievement_id = b.achievement_id
+	  AND a.id > b.id
+"""
+
+
+def _index_state(name: str) -> bool | None:
+	"""True - индекс валиден, False - INVALID после сбоя, None - его нет"""
+	return op.get_bind().execute(
+		sa.text(
+			"SELECT i.indisvalid FROM pg_index i "
+			"JOIN pg_class c ON c.oid = i.indexrelid "
+			"WHERE c.relname = :name"
+		),
+		{"name": name},
+	).scalar()
+
+
+def _create_index_concurrently(name: str, statement: str,
+                               prepare: str | None = None) -> None:
+	"""Строит индекс CONCURRENTLY и проверяет, что он валиден.
+
+	Упавшее построение оставляет INVALID индекс, который IF NOT EXISTS молча
+	пропустил бы, поэтому такой индекс удаляется и строится заново.
+	"""
+	for _ in range(INDEX_BUILD_ATTEMPTS):
+		state = _index_state(name)
+		if state:
+			return
+		if state is False:
+			op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+		if prepare:
+			op.execute(prepare)
+		try:
+			op.execute(statement)
+		except sa.exc.IntegrityError:
+			# Дубликат появился во время построения: очищаем и повторяем
+			continue
+	if not _index_state(name):
+		raise RuntimeError(
+			f"Index {name} is missing or INVALID after "
+			f"{INDEX_BUILD_ATTEMPTS} attempts"
+		)
+
+
+def upgrade() -> None:
+	# CONCURRENTLY не блокирует запись в таблицы, но не работает в транзакции
+	with op.get_context().autocommit_block():
+		# Последние события пользователя: /stats и история событий
+		_create_index_concurrently(
+			"ix_events_user_id_created_at",
+			"CREATE INDEX CONCURRENTLY ix_events_user_id_created_at "
+			"ON events (user_id, created_at DESC)",
+		)
+		# Достижения пользователя; заодно запрещает повторное начисление.
+		# Дубликаты (двойное начисление при гонке) удаляются перед каждой
+		# попыткой, оставляя самое раннее начисление
+		_create_index_concurrently(
+			"uq_user_achievements_user_id_achievement_id",
+			"CREATE UNIQUE INDEX CONCURRENTLY "
+			"uq_user_achievements_user_id_achievement_id "
+			"ON user_achievements (user_id, achievement_id)",
+			prepare=DELETE_DUPLICATE_AWARDS,
+		)
+
+
+def downgrade() -> None:
+	with op.get_context().autocommit_block():
+		op.execute(
+			"DROP INDEX CONCURRENTLY IF EXISTS "
+			"uq_user_achievements_user_id_achievement_id"
+		)
+		op.execute(
+			"DROP INDEX CONCURRENTLY IF EXISTS ix_events_user_id_created_at"
+		)
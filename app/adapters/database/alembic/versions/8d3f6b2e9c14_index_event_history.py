@@ -0,0 +1,112 @@
+"""index_event_history
+
+Revision ID: 8d3f6b2e9c14
+Revises: 4a7e2c9d1f38
+Create Date: 2026-10-19 00:31:08.557203
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '8d3f6b2e9c14'
+down_revision: Union[str, None] = '4a7e2c9d1f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Попыток построить индекс партиции, если построение оставило его INVALID
+INDEX_BUILD_ATTEMPTS = 3
+
+# Удаление индекса - только изменение каталога, но оно ждет блокировку events
+# за длинными транзакциями, а за ним встали бы вставки событий
+LOCK_TIMEOUT = "5s"
+
+
+def _index_state(name: str) -> bool | None:
+	"""True - индекс валиден, False - INVALID, None - его нет"""
+	return op.get_bind().execute(
+		sa.text(
+			"SELECT i.indisvalid FROM pg_index i "
+			"JOIN pg_class c ON c.oid = i.indexrelid "
+			"WHERE c.relname = :name"
+		),
+		{"name": name},
+	).scalar()
+
+
+def _partitions() -> list[str]:
+	return list(op.get_bind().execute(
+		sa.text(
+			"SELECT c.relname FROM pg_inherits i "
+			"JOIN pg_class c ON c.oid = i.inhrelid "
+			"WHERE i.inhparent = 'events'::regclass "
+			"ORDER BY c.relname"
+		)
+	).scalars())
+
+
+def _create_index_concurrently(name: str, statement: str) -> None:
+	"""Строит индекс CONCURRENTLY; INVALID после сбоя удаляется и строится заново"""
+	for _ in range(INDEX_BUILD_ATTEMPTS):
+		state = _index_state(name)
+		if state:
+			return
+		if state is False:
+			op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+		op.execute(statement)
+	if not _index_state(name):
+		raise RuntimeError(
+			f"Index {name} is missing or INVALID after "
+			f"{INDEX_BUILD_ATTEMPTS} attempts"
+		)
+
+
+def _create_partitioned_index(name: str, columns: str) -> None:
+	"""Строит индекс events, не блокируя вставку событий.
+
+	CREATE INDEX на секционированной таблице держит SHARE-блокировку events
+	все время построения. Поэтому родительский индекс создается ON ONLY
+	(пустым и INVALID), индекс каждой партиции строится CONCURRENTLY и
+	присоединяется к нему; когда присоединены все партиции, родительский
+	индекс становится валидным. Партиции, созданные в это время, получают
+	индекс сами.
+	"""
+	op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY events ({columns})")
+	suffix = name.removeprefix("ix_events_")
+	# CONCURRENTLY не работает в транзакции
+	with op.get_context().autocommit_block():
+		for partition in _partitions():
+			child = f"{partition}_{suffix}_idx"
+			_create_index_concurrently(
+				child,
+				f"CREATE INDEX CONCURRENTLY {child} ON {partition} ({columns})",
+			)
+			op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+	if not _index_state(name):
+		raise RuntimeError(f"Index {name} is INVALID: not every partition is attached")
+
+
+def _drop_index(name: str) -> None:
+	# DROP INDEX CONCURRENTLY не поддерживается для секционированных таблиц
+	op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+	op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade() -> None:
+	# id в индексе делает порядок истории однозначным: курсор (created_at, id)
+	# продолжает просмотр индекса без сортировки и без OFFSET
+	_create_partitioned_index(
+		"ix_events_user_id_created_at_id",
+		"user_id, created_at DESC, id DESC",
+	)
+	_drop_index("ix_events_user_id_created_at")
+
+
+def downgrade() -> None:
+	_create_partitioned_index(
+		"ix_events_user_id_created_at",
+		"user_id, created_at DESC",
+	)
+	_drop_index("ix_events_user_id_created_at_id")
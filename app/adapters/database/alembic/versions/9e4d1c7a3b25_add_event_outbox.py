@@ -0,0 +1,33 @@
+"""add_event_outbox
+
+Revision ID: 9e4d1c7a3b25
+Revises: 3b8f2d6e1a47
+Create Date: 2026-10-18 22:31:07.226415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '9e4d1c7a3b25'
+down_revision: Union[str, None] = '3b8f2d6e1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	# Outbox событий, ожидающих передачи на обработку
+	op.create_table(
+		'event_outbox',
+		sa.Column('id', sa.BigInteger(), nullable=False),
+		sa.Column('event_id', sa.Integer(), nullable=False),
+		sa.Column('created_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=True),
+		sa.PrimaryKeyConstraint('id')
+	)
+
+
+def downgrade() -> None:
+	op.drop_table('event_outbox')
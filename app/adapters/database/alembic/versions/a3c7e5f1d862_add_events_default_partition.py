@@ -0,0 +1,39 @@
+"""add_events_default_partition
+
+Revision ID: a3c7e5f1d862
+Revises: 8d3f6b2e9c14
+Create Date: 2026-10-19 01:14:36.820417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'a3c7e5f1d862'
+down_revision: Union[str, None] = '8d3f6b2e9c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	# Событие месяца без партиции (задача обслуживания отстала, загружена
+	# история) попадает сюда, а не обрывает вставку ошибкой; задача
+	# maintain_event_partitions переносит такие строки в партиции их месяцев
+	op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+
+def downgrade() -> None:
+	# Без партиции по умолчанию эти события некуда деть
+	op.execute(
+		"""
+		DO $$
+		BEGIN
+			IF EXISTS (SELECT 1 FROM events_default) THEN
+				RAISE EXCEPTION 'events_default is not empty, '
+					'run maintain-partitions first';
+			END IF;
+		END
+		$$
+		"""
+	)
+	op.execute("DROP TABLE events_default")
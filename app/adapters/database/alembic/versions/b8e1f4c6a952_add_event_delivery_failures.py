@@ -0,0 +1,43 @@
+"""add_event_delivery_failures
+
+Revision ID: b8e1f4c6a952
+Revises: a3c7e5f1d862
+Create Date: 2026-10-19 02:07:51.336904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'b8e1f4c6a952'
+down_revision: Union[str, None] = 'a3c7e5f1d862'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	# Отложенное событие возвращается в outbox с задержкой
+	op.add_column(
+		'event_outbox',
+		sa.Column('available_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=False),
+	)
+	# Счетчик неудачных попыток; исчерпавшие попытки события остаются здесь
+	# с dead_at
+	op.create_table(
+		'event_delivery_failures',
+		sa.Column('event_id', sa.Integer(), nullable=False),
+		sa.Column('attempts', sa.Integer(), nullable=False),
+		sa.Column('last_failed_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=False),
+		sa.Column('dead_at', sa.DateTime(timezone=True), nullable=True),
+		sa.PrimaryKeyConstraint('event_id')
+	)
+
+
+def downgrade() -> None:
+	op.drop_table('event_delivery_failures')
+	op.drop_column('event_outbox', 'available_at')
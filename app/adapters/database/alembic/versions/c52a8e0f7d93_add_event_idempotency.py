@@ -0,0 +1,60 @@
+"""add_event_idempotency
+
+Revision ID: c52a8e0f7d93
+Revises: 9e4d1c7a3b25
+Create Date: 2026-10-18 23:05:44.610982
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'c52a8e0f7d93'
+down_revision: Union[str, None] = '9e4d1c7a3b25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	# Ключи идемпотентности приема событий
+	op.create_table(
+		'event_idempotency_keys',
+		sa.Column('user_id', sa.Integer(), nullable=False),
+		sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+		sa.Column('event_id', sa.Integer(), nullable=False),
+		sa.Column('created_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=True),
+		sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+		sa.PrimaryKeyConstraint('user_id', 'idempotency_key')
+	)
+	op.create_index(
+		'ix_event_idempotency_keys_created_at',
+		'event_idempotency_keys',
+		['created_at'],
+	)
+
+	# Журнал примененных воркером событий
+	op.create_table(
+		'processed_events',
+		sa.Column('event_id', sa.Integer(), nullable=False),
+		sa.Column('processed_at', sa.DateTime(timezone=True),
+		          server_default=sa.text('now()'),
+		          nullable=True),
+		sa.PrimaryKeyConstraint('event_id')
+	)
+	op.create_index(
+		'ix_processed_events_processed_at',
+		'processed_events',
+		['processed_at'],
+	)
+
+
+def downgrade() -> None:
+	op.drop_index('ix_processed_events_processed_at',
+	              table_name='processed_events')
+	op.drop_table('processed_events')
+	op.drop_index('ix_event_idempotency_keys_created_at',
+	              table_name='event_idempotency_keys')
+	op.drop_table('event_idempotency_keys')
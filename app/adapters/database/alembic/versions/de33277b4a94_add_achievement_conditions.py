@@ -0,0 +1,28 @@
+"""add_achievement_conditions
+
+Revision ID: de33277b4a94
+Revises: 5fea9d724a61
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'de33277b4a94'
+down_revision: Union[str, None] = '5fea9d724a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	# Составное условие достижения (all/any по нескольким счетчикам)
+	op.add_column(
+		'achievements',
+		sa.Column('conditions', sa.JSON(), nullable=True),
+	)
+
+
+def downgrade() -> None:
+	op.drop_column('achievements', 'conditions')
@@ -23,8 +23,13 @@ def configure_mappers():
 	# Маппинг пользователей
 	mapper_registry.map_imperatively(User, users_table)
 
-	# Маппинг событий
-	mapper_registry.map_imperatively(Event, events_table)
+	# Маппинг событий: id уникален сам по себе, created_at в первичном ключе
+	# таблицы нужен только для секционирования
+	mapper_registry.map_imperatively(
+		Event,
+		events_table,
+		primary_key=[events_table.c.id],
+	)
 
 	# Маппинг счетов пользователей
 	mapper_registry.map_imperatively(UserScore, user_scores_table)
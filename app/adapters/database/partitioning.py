@@ -0,0 +1,23 @@
+"""
+Политика секционирования и хранения таблицы событий из переменных окружения
+"""
+import os
+
+from app.application.constants import EventPartitioning
+
+EVENTS_PARTITIONS_AHEAD = int(
+    os.getenv('EVENTS_PARTITIONS_AHEAD', EventPartitioning.PARTITIONS_AHEAD)
+)
+EVENTS_RETENTION_MONTHS = int(
+    os.getenv('EVENTS_RETENTION_MONTHS', EventPartitioning.RETENTION_MONTHS)
+)
+EVENTS_ARCHIVE_ENABLED = os.getenv(
+    'EVENTS_ARCHIVE_ENABLED',
+    str(EventPartitioning.ARCHIVE_ENABLED),
+).lower() in ('1', 'true', 'yes')
+EVENTS_ARCHIVE_RETENTION_MONTHS = int(
+    os.getenv(
+        'EVENTS_ARCHIVE_RETENTION_MONTHS',
+        EventPartitioning.ARCHIVE_RETENTION_MONTHS,
+    )
+)
@@ -4,6 +4,13 @@ from .user_score_repository import UserScoreRepository
 from .achievement_repository import AchievementRepository
 from .user_achievement_repository import UserAchievementRepository
 from .achievement_notification_repository import AchievementNotificationRepository
+from .user_stats_repository import UserStatsRepository
+from .event_partition_repository import EventPartitionRepository
+from .event_outbox_repository import EventOutboxRepository
+from .processed_event_repository import ProcessedEventRepository
+from .data_export_repository import DataExportRepository
+from .event_import_repository import EventImportRepository
+from .score_reconciliation_repository import ScoreReconciliationRepository
 
 __all__ = [
     "UserRepository",
@@ -11,5 +18,12 @@ __all__ = [
     "UserScoreRepository",
     "AchievementRepository",
     "UserAchievementRepository",
-    "AchievementNotificationRepository"
+    "AchievementNotificationRepository",
+    "UserStatsRepository",
+    "EventPartitionRepository",
+    "EventOutboxRepository",
+    "ProcessedEventRepository",
+    "DataExportRepository",
+    "EventImportRepository",
+    "ScoreReconciliationRepository",
 ] 
\ No newline at end of file
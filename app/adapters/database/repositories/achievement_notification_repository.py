@@ -1,8 +1,30 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update
+from sqlalchemy import (
+    Integer,
+    any_,
+    bindparam,
+    case,
+    func,
+    literal_column,
+    not_,
+    null,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.application.interfaces import IAchievementNotificationRepository
 from app.application.entities import AchievementNotification
+from app.adapters.database.tables import achievement_notifications_table
+
+
+def _ids_param(notification_ids: list[int]):
+    # Один параметр-массив вместо IN (...) на каждый ID пакета
+    return any_(bindparam(
+        "notification_ids",
+        notification_ids,
+        type_=ARRAY(Integer),
+    ))
 
 
 class AchievementNotificationRepository(IAchievementNotificationRepository):
@@ -18,9 +40,73 @@ class AchievementNotificationRepository(IAchievementNotificationRepository):
         self.session.add(notification)
         return notification
 
-    async def mark_as_sent(self, notification_id: int) -> None:
+    async def create_many(
+        self,
+        notifications: list[AchievementNotification],
+    ) -> None:
+        # Коммит за вызывающим кодом: уведомления фиксируются вместе с
+        # начислением достижений
+        if notifications:
+            await self.session.execute(
+                achievement_notifications_table.insert(),
+                [
+                    {
+                        "user_id": notification.user_id,
+                        "achievement_id": notification.achievement_id,
+                        "message": notification.message,
+                    }
+                    for notification in notifications
+                ],
+            )
+
+    async def claim_pending(self, limit: int) -> list[AchievementNotification]:
+        # Параллельные доставщики берут разные уведомления
+        result = await self.session.execute(
+            select(AchievementNotification)
+            .where(
+                not_(AchievementNotification.is_sent),
+                AchievementNotification.next_attempt_at <= func.now(),
+            )
+            .order_by(AchievementNotification.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars())
+
+    async def mark_as_sent(self, notification_ids: list[int]) -> None:
+        table = achievement_notifications_table
+        await self.session.execute(
+            update(table)
+            .where(table.c.id == _ids_param(notification_ids))
+            .values(is_sent=True, sent_at=func.now(), next_attempt_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def schedule_retry(
+        self,
+        notification_ids: list[int],
+        error: str,
+        retry_delay: int,
+        max_attempts: int,
+    ) -> None:
+        table = achievement_notifications_table
+        # Задержка считается по числу попыток каждой строки, поэтому весь
+        # пакет откладывается одним UPDATE
+        next_attempt_at = case(
+            (table.c.attempts + 1 >= max_attempts, null()),
+            else_=func.now() + literal_column("interval '1 second'") * (
+                retry_delay * func.power(2, table.c.attempts)
+            ),
+        )
         await self.session.execute(
-            update(AchievementNotification)
-            .where(AchievementNotification.id == notification_id)
-            .values(is_sent=True)
-        )
\ No newline at end of file
+            update(table)
+            .where(table.c.id == _ids_param(notification_ids))
+            .values(
+                attempts=table.c.attempts + 1,
+                next_attempt_at=next_attempt_at,
+                last_error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
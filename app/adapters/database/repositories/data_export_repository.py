@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IDataExportRepository
+from app.application.entities import ExportDataset, ExportFormat
+
+# Выгружаемые колонки и колонка времени для фильтра по периоду
+_DATASETS = {
+	ExportDataset.EVENTS: (
+		"events",
+		"id, user_id, event_type, details, created_at",
+		"created_at",
+	),
+	ExportDataset.USER_SCORES: (
+		"user_scores",
+		"user_id, login_count, levels_completed, secrets_found, updated_at",
+		"updated_at",
+	),
+	ExportDataset.USER_ACHIEVEMENTS: (
+		"user_achievements",
+		"id, user_id, achievement_id, earned_at",
+		"earned_at",
+	),
+}
+
+
+class DataExportRepository(IDataExportRepository):
+	"""Выгрузка таблиц через COPY ... TO STDOUT драйвера asyncpg.
+
+	Строки форматирует PostgreSQL, а драйвер передает их порциями байт без
+	создания объектов на строку, поэтому память не зависит от объема.
+	"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def copy_out(
+		self,
+		dataset: ExportDataset,
+		export_format: ExportFormat,
+		output: Callable[[bytes], Awaitable[None]],
+		created_from: datetime | None = None,
+		created_to: datetime | None = None,
+	) -> int:
+		table, columns, time_column = _DATASETS[ExportDataset(dataset)]
+
+		conditions, args = [], []
+		if created_from is not None:
+			args.append(created_from)
+			conditions.append(f"{time_column} >= ${len(args)}")
+		if created_to is not None:
+			args.append(created_to)
+			conditions.append(f"{time_column} < ${len(args)}")
+		query = f"SELECT {columns} FROM {table}"
+		if conditions:
+			query += " WHERE " + " AND ".join(conditions)
+
+		if export_format == ExportFormat.NDJSON:
+			# JSON экранирует управляющие символы, поэтому в CSV с
+			# разделителем и кавычкой \x02 / \x01 строки выходят как есть
+			query = f"SELECT row_to_json(t)::text FROM ({query}) t"
+			options = {"format": "csv", "delimiter": "\x02", "quote": "\x01"}
+		else:
+			options = {"format": "csv", "header": True}
+
+		connection = await self.session.connection()
+		raw_connection = await connection.get_raw_connection()
+		status = await raw_connection.driver_connection.copy_from_query(
+			query,
+			*args,
+			output=output,
+			**options,
+		)
+		# Статус команды: "COPY <число строк>"
+		return int(status.split()[-1])
@@ -0,0 +1,223 @@
+import csv
+import uuid
+
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Mapping
+
+from sqlalchemy import select, text, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IEventImportRepository
+from app.application.entities import EventType, ExportFormat, UserScore
+from app.application.exceptions import InvalidEventDataError
+from app.application.services.achievement_rules import AchievementRule
+from app.application.utils import ScoreCalculator
+from app.adapters.database.tables import user_scores_table
+from app.adapters.database.achievement_awards import award_matching
+
+# Колонки, которые можно передать в CSV; id выгрузки игнорируется, события
+# получают новые ID из последовательности events
+_STAGING_COLUMNS = ("id", "user_id", "event_type", "details", "created_at")
+
+
+class EventImportRepository(IEventImportRepository):
+	"""Загрузка событий через COPY ... FROM STDIN драйвера asyncpg.
+
+	Строки сначала попадают в UNLOGGED-таблицу без индексов (без записи в
+	WAL), где PostgreSQL проверяет типы и допустимые типы событий, затем
+	переносятся в events одним INSERT ... SELECT. Промежуточные таблицы -
+	обычные, а не временные: загрузка идет несколькими транзакциями, которые
+	пул может выполнить на разных соединениях.
+	"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	@staticmethod
+	def _users(staging: str) -> str:
+		return f"{staging}_users"
+
+	async def _copy(self, staging: str, source, **options) -> int:
+		connection = await self.session.connection()
+		raw_connection = await connection.get_raw_connection()
+		status = await raw_connection.driver_connection.copy_to_table(
+			staging,
+			source=source,
+			**options,
+		)
+		# Статус команды: "COPY <число строк>"
+		return int(status.split()[-1])
+
+	async def create_staging(self) -> str:
+		staging = f"event_import_{uuid.uuid4().hex[:12]}"
+		event_types = ", ".join(f"'{event_type.value}'" for event_type in EventType)
+		await self.session.execute(text(
+			f"CREATE UNLOGGED TABLE {staging} ("
+			"id bigint, "
+			"user_id integer NOT NULL, "
+			f"event_type text NOT NULL CHECK (event_type IN ({event_types})), "
+			"details json, "
+			"created_at timestamptz)"
+		))
+		await self.session.commit()
+		return staging
+
+	async def copy_in(
+		self,
+		staging: str,
+		import_format: ExportFormat,
+		source: AsyncIterable[bytes],
+	) -> int:
+		if import_format == ExportFormat.CSV:
+			columns, source = await self._read_header(source)
+			rows = await self._copy(
+				staging,
+				source,
+				columns=columns,
+				format="csv",
+				header=True,
+			)
+		else:
+			# Каждая строка NDJSON - одно значение json: разделитель и кавычка
+			# \x02 / \x01 не встречаются в JSON, поэтому строка не разбирается
+			raw = f"{staging}_raw"
+			await self.session.execute(text(f"CREATE UNLOGGED TABLE {raw} (doc json)"))
+			await self._copy(
+				raw,
+				source,
+				format="csv",
+				delimiter="\x02",
+				quote="\x01",
+			)
+			result = await self.session.execute(text(
+				f"INSERT INTO {staging} (user_id, event_type, details, created_at) "
+				"SELECT (doc->>'user_id')::integer, doc->>'event_type', "
+				"CASE WHEN json_typeof(doc->'details') = 'null' THEN NULL "
+				"ELSE doc->'details' END, "
+				f"(doc->>'created_at')::timestamptz FROM {raw}"
+			))
+			await self.session.execute(text(f"DROP TABLE {raw}"))
+			rows = result.rowcount
+		await self.session.commit()
+		return rows
+
+	@staticmethod
+	async def _read_header(
+		source: AsyncIterable[bytes],
+	) -> tuple[list[str], AsyncIterator[bytes]]:
+		"""Колонки из заголовка CSV и поток байт с заголовком в начале"""
+		chunks = source.__aiter__()
+		buffer = b""
+		async for chunk in chunks:
+			buffer += chunk
+			if b"\n" in buffer:
+				break
+		header = buffer.split(b"\n", 1)[0].decode().strip()
+		columns = next(csv.reader([header]), [])
+		unknown = set(columns) - set(_STAGING_COLUMNS)
+		if not columns or unknown:
+			raise InvalidEventDataError(
+				details=f"неизвестные колонки CSV: {sorted(unknown) or header!r}"
+			)
+
+		async def rest() -> AsyncIterator[bytes]:
+			yield buffer
+			async for chunk in chunks:
+				yield chunk
+
+		return columns, rest()
+
+	async def get_staged_months(self, staging: str) -> list[date]:
+		# Границы партиций - полночь UTC
+		result = await self.session.execute(text(
+			"SELECT DISTINCT date_trunc('month', "
+			"coalesce(created_at, now()) AT TIME ZONE 'UTC')::date "
+			f"FROM {staging} ORDER BY 1"
+		))
+		return list(result.scalars())
+
+	async def apply_staged(
+		self,
+		staging: str,
+		rules: Mapping[int, AchievementRule],
+	) -> dict:
+		users = self._users(staging)
+		fields = ScoreCalculator.EVENT_COUNTER_FIELDS
+
+		# Журнал processed_events пишется вместе с событиями: если те же ID
+		# когда-нибудь попадут в outbox, воркер их пропустит
+		result = await self.session.execute(text(
+			"WITH inserted AS ("
+			"INSERT INTO events (user_id, event_type, details, created_at) "
+			"SELECT user_id, event_type, details, coalesce(created_at, now()) "
+			f"FROM {staging} RETURNING id) "
+			"INSERT INTO processed_events (event_id) SELECT id FROM inserted"
+		))
+		events = result.rowcount
+
+		# Приращения счетчиков - одна агрегация по всей загрузке
+		await self.session.execute(text(
+			f"CREATE UNLOGGED TABLE {users} AS SELECT user_id, "
+			+ ", ".join(
+				f"count(*) FILTER (WHERE event_type = '{event_type.value}') "
+				f"AS {field}"
+				for event_type, field in fields.items()
+			)
+			+ f" FROM {staging} GROUP BY user_id"
+		))
+		await self.session.execute(text(
+			f"ALTER TABLE {users} ADD PRIMARY KEY (user_id)"
+		))
+		# Как и у воркера - увеличение, а не пересчет: события, которые
+		# воркеры применяют параллельно с загрузкой, не учитываются дважды
+		result = await self.session.execute(text(
+			f"INSERT INTO user_scores (user_id, {', '.join(fields.values())}, "
+			f"updated_at) SELECT user_id, {', '.join(fields.values())}, now() "
+			f"FROM {users} ON CONFLICT (user_id) DO UPDATE SET "
+			+ ", ".join(
+				f"{field} = coalesce(user_scores.{field}, 0) + excluded.{field}"
+				for field in fields.values()
+			)
+			+ ", updated_at = excluded.updated_at"
+		))
+		users_count = result.rowcount
+
+		loaded_users = select(table(users, column("user_id")).c.user_id)
+		achievements = await award_matching(
+			self.session,
+			rules,
+			user_scores_table.c.user_id.in_(loaded_users),
+		)
+
+		await self.session.commit()
+		return {
+			"events": events,
+			"users": users_count,
+			"achievements": achievements,
+		}
+
+	async def get_scores_chunk(
+		self,
+		staging: str,
+		after_user_id: int,
+		limit: int,
+	) -> list[UserScore]:
+		loaded = table(self._users(staging), column("user_id"))
+		result = await self.session.scalars(
+			select(UserScore)
+			.join(loaded, loaded.c.user_id == UserScore.user_id)
+			.where(UserScore.user_id > after_user_id)
+			.order_by(UserScore.user_id)
+			.limit(limit)
+		)
+		scores = list(result)
+		for user_score in scores:
+			self.session.expunge(user_score)
+		return scores
+
+	async def drop_staging(self, staging: str) -> None:
+		await self.session.rollback()
+		await self.session.execute(text(
+			f"DROP TABLE IF EXISTS {staging}, {staging}_raw, {self._users(staging)}"
+		))
+		await self.session.commit()
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, delete, insert, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IEventOutboxRepository
+from app.adapters.database.tables import (
+	event_outbox_table,
+	event_delivery_failures_table,
+)
+
+
+class EventOutboxRepository(IEventOutboxRepository):
+	"""Реализация outbox событий на PostgreSQL. Коммит за вызывающим кодом"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def claim(self, limit: int) -> list[int]:
+		# SKIP LOCKED: параллельные ретрансляторы забирают разные строки
+		claimed = (
+			select(event_outbox_table.c.id)
+			.where(event_outbox_table.c.available_at <= func.now())
+			.order_by(event_outbox_table.c.id)
+			.limit(limit)
+			.with_for_update(skip_locked=True)
+			.scalar_subquery()
+		)
+		result = await self.session.execute(
+			delete(event_outbox_table)
+			.where(event_outbox_table.c.id.in_(claimed))
+			.returning(event_outbox_table.c.event_id)
+		)
+		return sorted(result.scalars())
+
+	async def defer(
+		self,
+		event_ids: list[int],
+		max_retries: int,
+		retry_countdown: int,
+	) -> list[int]:
+		if not event_ids:
+			return []
+		failures = event_delivery_failures_table
+		stmt = pg_insert(failures).values(
+			[{"event_id": event_id, "attempts": 1} for event_id in set(event_ids)]
+		)
+		stmt = stmt.on_conflict_do_update(
+			index_elements=[failures.c.event_id],
+			set_={
+				"attempts": failures.c.attempts + 1,
+				"last_failed_at": func.now(),
+			},
+		).returning(failures.c.event_id, failures.c.attempts)
+		attempts = dict((await self.session.execute(stmt)).all())
+
+		now = datetime.now(timezone.utc)
+		retried = {
+			event_id: attempt
+			for event_id, attempt in attempts.items()
+			if attempt <= max_retries
+		}
+		if retried:
+			await self.session.execute(
+				insert(event_outbox_table),
+				[
+					{
+						"event_id": event_id,
+						"available_at": now + timedelta(
+							seconds=retry_countdown * 2 ** (attempt - 1)),
+					}
+					for event_id, attempt in retried.items()
+				],
+			)
+
+		dead_ids = sorted(attempts.keys() - retried.keys())
+		if dead_ids:
+			await self.session.execute(
+				update(failures)
+				.where(failures.c.event_id.in_(dead_ids))
+				.values(dead_at=func.now())
+			)
+		return dead_ids
+
+	async def requeue_dead(self) -> list[int]:
+		result = await self.session.execute(
+			delete(event_delivery_failures_table)
+			.where(event_delivery_failures_table.c.dead_at.is_not(None))
+			.returning(event_delivery_failures_table.c.event_id)
+		)
+		event_ids = sorted(result.scalars())
+		if event_ids:
+			await self.session.execute(
+				insert(event_outbox_table),
+				[{"event_id": event_id} for event_id in event_ids],
+			)
+		return event_ids
+
+	async def purge_failures(self, before: datetime) -> int:
+		result = await self.session.execute(
+			delete(event_delivery_failures_table)
+			.where(
+				event_delivery_failures_table.c.dead_at.is_(None),
+				event_delivery_failures_table.c.last_failed_at < before,
+			)
+		)
+		return result.rowcount
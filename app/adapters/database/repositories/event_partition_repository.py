@@ -0,0 +1,116 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IEventPartitionRepository
+from app.application.constants import EventPartitioning
+
+
+class EventPartitionRepository(IEventPartitionRepository):
+	"""Реализация репозитория партиций events на PostgreSQL.
+
+	Каждая операция - отдельная короткая транзакция: DDL над events берет
+	блокировку родительской таблицы, поэтому ее не ждем дольше lock_timeout.
+	"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	@staticmethod
+	def _quote(identifier: str) -> str:
+		return '"' + identifier.replace('"', '""') + '"'
+
+	@staticmethod
+	def _bound(day: date) -> str:
+		# Границы партиций - полночь UTC
+		return f"'{day.isoformat()} 00:00:00+00'"
+
+	async def _execute_ddl(self, *statements: str) -> None:
+		await self.session.execute(
+			text(f"SET LOCAL lock_timeout = '{EventPartitioning.LOCK_TIMEOUT}'")
+		)
+		for statement in statements:
+			await self.session.execute(text(statement))
+		await self.session.commit()
+
+	async def list_partitions(self) -> list[str]:
+		result = await self.session.execute(
+			text(
+				"SELECT c.relname FROM pg_inherits i "
+				"JOIN pg_class c ON c.oid = i.inhrelid "
+				"WHERE i.inhparent = 'events'::regclass "
+				"ORDER BY c.relname"
+			)
+		)
+		return list(result.scalars())
+
+	async def list_archived(self, schema: str) -> list[str]:
+		result = await self.session.execute(
+			text(
+				"SELECT tablename FROM pg_tables "
+				"WHERE schemaname = :schema AND starts_with(tablename, :prefix) "
+				"ORDER BY tablename"
+			),
+			{"schema": schema, "prefix": EventPartitioning.PARTITION_PREFIX},
+		)
+		return list(result.scalars())
+
+	async def list_default_months(self) -> list[date]:
+		result = await self.session.execute(
+			text(
+				"SELECT DISTINCT "
+				"date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+				f"FROM {self._quote(EventPartitioning.DEFAULT_PARTITION)} "
+				"ORDER BY 1"
+			)
+		)
+		return list(result.scalars())
+
+	async def create_partition(self, name: str, start: date, end: date) -> None:
+		partition = self._quote(name)
+		default = self._quote(EventPartitioning.DEFAULT_PARTITION)
+		in_range = (
+			f"created_at >= {self._bound(start)} "
+			f"AND created_at < {self._bound(end)}"
+		)
+		create = (
+			f"CREATE TABLE IF NOT EXISTS {partition} "
+			f"PARTITION OF events "
+			f"FOR VALUES FROM ({self._bound(start)}) TO ({self._bound(end)})"
+		)
+		has_rows = await self.session.scalar(
+			text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+		)
+		if not has_rows:
+			await self._execute_ddl(create)
+			return
+
+		# PostgreSQL не создает партицию, пока события ее периода лежат в
+		# партиции по умолчанию: на время переноса она отсоединяется
+		columns = "id, user_id, event_type, details, created_at"
+		await self._execute_ddl(
+			f"ALTER TABLE events DETACH PARTITION {default}",
+			create,
+			f"WITH moved AS (DELETE FROM {default} WHERE {in_range} "
+			f"RETURNING {columns}) "
+			f"INSERT INTO {partition} ({columns}) SELECT {columns} FROM moved",
+			f"ALTER TABLE events ATTACH PARTITION {default} DEFAULT",
+		)
+
+	async def detach_partition(self, name: str) -> None:
+		await self._execute_ddl(
+			f"ALTER TABLE events DETACH PARTITION {self._quote(name)}"
+		)
+
+	async def archive_partition(self, name: str, schema: str) -> None:
+		await self._execute_ddl(
+			f"CREATE SCHEMA IF NOT EXISTS {self._quote(schema)}",
+			f"ALTER TABLE {self._quote(name)} SET SCHEMA {self._quote(schema)}",
+		)
+
+	async def drop_partition(self, name: str, schema: str | None = None) -> None:
+		table = self._quote(name)
+		if schema:
+			table = f"{self._quote(schema)}.{table}"
+		await self._execute_ddl(f"DROP TABLE IF EXISTS {table}")
@@ -1,43 +1,250 @@
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.application.interfaces import IEventRepository
 from app.application.entities import Event
 from app.application.constants import Limits
+from app.adapters.database.tables import (
+	event_outbox_table,
+	event_idempotency_keys_table,
+)
 
 
 class EventRepository(IEventRepository):
 	"""Реализация репозитория событий на SQLAlchemy"""
 
+	# Попыток создать пакет при гонке за ключ идемпотентности
+	_IDEMPOTENCY_ATTEMPTS = 3
+
 	def __init__(self, session: AsyncSession):
 		self.session = session
 
-	async def create(self, event: Event) -> Event:
+	async def _add_to_outbox(self, event_ids: list[int]) -> None:
+		# В той же транзакции, что и события: событие без записи в outbox
+		# (и наоборот) не может быть закоммичено
+		await self.session.execute(
+			insert(event_outbox_table),
+			[{"event_id": event_id} for event_id in event_ids],
+		)
+
+	async def create(
+		self,
+		event: Event,
+		idempotency_key: str | None = None,
+	) -> Event:
+		if idempotency_key is not None:
+			created = await self.create_many([event], [idempotency_key])
+			return created[0]
 		self.session.add(event)
+		await self.session.flush()
+		await self._add_to_outbox([event.id])
 		await self.session.commit()
 		await self.session.refresh(event)
 		return event
 
+	async def create_many(
+		self,
+		events: list[Event],
+		idempotency_keys: list[str | None] | None = None,
+	) -> list[Event]:
+		if not events:
+			return []
+		if not idempotency_keys or not any(idempotency_keys):
+			created = await self._insert_events(events)
+			await self._add_to_outbox([event.id for event in created])
+			await self.session.commit()
+			return created
+
+		# Ключ, занятый параллельным запросом, обнаруживается при вставке
+		# ключей: транзакция откатывается, а повторная попытка уже видит его
+		# событие и возвращает его
+		for _ in range(self._IDEMPOTENCY_ATTEMPTS):
+			created = await self._create_idempotent(events, idempotency_keys)
+			if created is not None:
+				await self.session.commit()
+				return created
+			await self.session.rollback()
+		raise RuntimeError("Idempotency key conflict could not be resolved")
+
+	async def _insert_events(self, events: list[Event]) -> list[Event]:
+		# Один многострочный INSERT ... RETURNING на весь пакет
+		result = await self.session.scalars(
+			insert(Event).returning(Event, sort_by_parameter_order=True),
+			[
+				{
+					"user_id": event.user_id,
+					"event_type": event.event_type,
+					"details": event.details,
+				}
+				for event in events
+			],
+		)
+		return list(result)
+
+	async def _create_idempotent(
+		self,
+		events: list[Event],
+		idempotency_keys: list[str | None],
+	) -> list[Event] | None:
+		"""Создает события, ключей которых еще нет; None при гонке за ключ"""
+		existing = await self._get_by_idempotency_keys({
+			(event.user_id, key)
+			for event, key in zip(events, idempotency_keys)
+			if key is not None
+		})
+
+		# Для каждого события пакета: ранее созданное событие или индекс
+		# нового; повтор ключа внутри пакета дает одно событие
+		positions: list[Event | int] = []
+		new_keys: dict[tuple[int, str], int] = {}
+		to_insert: list[Event] = []
+		for event, key in zip(events, idempotency_keys):
+			pair = (event.user_id, key)
+			if key is not None and pair in existing:
+				positions.append(existing[pair])
+			elif key is not None and pair in new_keys:
+				positions.append(new_keys[pair])
+			else:
+				if key is not None:
+					new_keys[pair] = len(to_insert)
+				positions.append(len(to_insert))
+				to_insert.append(event)
+
+		created = await self._insert_events(to_insert) if to_insert else []
+
+		if new_keys:
+			result = await self.session.execute(
+				pg_insert(event_idempotency_keys_table)
+				.values([
+					{
+						"user_id": user_id,
+						"idempotency_key": key,
+						"event_id": created[index].id,
+					}
+					for (user_id, key), index in new_keys.items()
+				])
+				.on_conflict_do_nothing()
+				.returning(event_idempotency_keys_table.c.user_id)
+			)
+			if len(result.all()) < len(new_keys):
+				return None
+
+		await self._add_to_outbox([event.id for event in created])
+		return [
+			created[position] if isinstance(position, int) else position
+			for position in positions
+		]
+
+	async def _get_by_idempotency_keys(
+		self,
+		pairs: set[tuple[int, str]],
+	) -> dict[tuple[int, str], Event]:
+		if not pairs:
+			return {}
+		keys = event_idempotency_keys_table.c
+		result = await self.session.execute(
+			select(keys.user_id, keys.idempotency_key, keys.event_id)
+			.where(tuple_(keys.user_id, keys.idempotency_key).in_(list(pairs)))
+		)
+		event_ids = {
+			(user_id, key): event_id
+			for user_id, key, event_id in result.tuples()
+		}
+		events = {
+			event.id: event
+			for event in await self.get_by_ids(list(event_ids.values()))
+		}
+		return {
+			pair: events[event_id]
+			for pair, event_id in event_ids.items()
+			if event_id in events
+		}
+
+	async def purge_idempotency_keys(self, before: datetime) -> int:
+		result = await self.session.execute(
+			delete(event_idempotency_keys_table)
+			.where(event_idempotency_keys_table.c.created_at < before)
+		)
+		await self.session.commit()
+		return result.rowcount
+
 	async def get_by_id(self, event_id: int) -> Event | None:
 		result = await self.session.execute(
 			select(Event).where(Event.id == event_id)
 		)
 		return result.scalar_one_or_none()
 
-	async def get_by_user_id(self, user_id: int) -> list[Event]:
+	async def get_by_ids(
+		self,
+		event_ids: list[int],
+		created_after: datetime | None = None,
+	) -> list[Event]:
+		if not event_ids:
+			return []
+		query = select(Event).where(Event.id.in_(event_ids)).order_by(Event.id)
+		if created_after is None:
+			return list((await self.session.execute(query)).scalars())
+
+		# Граница по created_at отсекает старые партиции; не найденные в
+		# свежих партициях события дочитываются по всей таблице
 		result = await self.session.execute(
-			select(Event).where(Event.user_id == user_id).order_by(
-				Event.created_at.desc())
+			query.where(Event.created_at >= created_after)
+		)
+		events = list(result.scalars())
+		found_ids = {event.id for event in events}
+		missing_ids = [
+			event_id for event_id in event_ids if event_id not in found_ids
+		]
+		if missing_ids:
+			events += await self.get_by_ids(missing_ids)
+			events.sort(key=lambda event: event.id)
+		return events
+
+	async def get_history(
+		self,
+		user_id: int,
+		limit: int,
+		before: tuple[datetime, int] | None = None,
+		event_types: list[str] | None = None,
+		created_from: datetime | None = None,
+		created_to: datetime | None = None,
+	) -> list[Event]:
+		# Порядок совпадает с индексом (user_id, created_at DESC, id DESC):
+		# страница - это чтение limit строк индекса от позиции курсора,
+		# сколько бы событий ни было пролистано до нее
+		query = (
+			select(Event)
+			.where(Event.user_id == user_id)
+			.order_by(Event.created_at.desc(), Event.id.desc())
+			.limit(limit)
 		)
+		if before is not None:
+			query = query.where(tuple_(Event.created_at, Event.id) < before)
+		if event_types:
+			query = query.where(Event.event_type.in_(event_types))
+		# Границы по created_at к тому же отсекают лишние партиции
+		if created_from is not None:
+			query = query.where(Event.created_at >= created_from)
+		if created_to is not None:
+			query = query.where(Event.created_at < created_to)
+		result = await self.session.execute(query)
 		return list(result.scalars())
 
 	async def get_recent_by_user_id(
 		self,
 		user_id: int,
 		limit: int = Limits.RECENT_EVENTS_LIMIT,
+		created_after: datetime | None = None,
 	) -> list[Event]:
-		result = await self.session.execute(
+		query = (
 			select(Event).where(Event.user_id == user_id)
-			.order_by(Event.created_at.desc())
+			.order_by(Event.created_at.desc(), Event.id.desc())
 			.limit(limit)
 		)
+		if created_after is not None:
+			# Читаются только партиции после created_after
+			query = query.where(Event.created_at >= created_after)
+		result = await self.session.execute(query)
 		return list(result.scalars())
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IProcessedEventRepository
+from app.adapters.database.tables import processed_events_table
+
+
+class ProcessedEventRepository(IProcessedEventRepository):
+	"""Реализация журнала примененных событий на PostgreSQL"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def mark_processed(self, event_ids: list[int]) -> set[int]:
+		if not event_ids:
+			return set()
+		# Коммит за вызывающим кодом: запись в журнал фиксируется вместе со
+		# счетчиками, а параллельная транзакция с тем же событием ждет ее
+		result = await self.session.execute(
+			pg_insert(processed_events_table)
+			.values([{"event_id": event_id} for event_id in event_ids])
+			.on_conflict_do_nothing()
+			.returning(processed_events_table.c.event_id)
+		)
+		return set(result.scalars())
+
+	async def get_processed(self, event_ids: list[int]) -> set[int]:
+		if not event_ids:
+			return set()
+		result = await self.session.execute(
+			select(processed_events_table.c.event_id)
+			.where(processed_events_table.c.event_id.in_(event_ids))
+		)
+		return set(result.scalars())
+
+	async def purge(self, before: datetime) -> int:
+		result = await self.session.execute(
+			delete(processed_events_table)
+			.where(processed_events_table.c.processed_at < before)
+		)
+		await self.session.commit()
+		return result.rowcount
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import Mapping
+
+from sqlalchemy import select, exists, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces import IScoreReconciliationRepository
+from app.application.entities import User, UserScore
+from app.application.constants import DatabaseFields
+from app.application.services.achievement_rules import AchievementRule
+from app.application.utils import ScoreCalculator
+from app.adapters.database.tables import (
+	events_table,
+	processed_events_table,
+	user_scores_table,
+)
+from app.adapters.database.achievement_awards import award_matching
+
+
+class ScoreReconciliationRepository(IScoreReconciliationRepository):
+	"""Сверка user_scores с агрегатом по events на PostgreSQL"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def get_max_user_id(self) -> int:
+		result = await self.session.scalar(select(func.max(User.id)))
+		return result or 0
+
+	async def _count_applied_events(
+		self,
+		start_user_id: int,
+		end_user_id: int,
+		settled_before: datetime,
+	) -> dict[int, dict[str, int]]:
+		"""Счетчики из событий диапазона одним агрегирующим запросом"""
+		events = events_table
+		result = await self.session.execute(
+			select(
+				events.c.user_id,
+				*(
+					func.count()
+					.filter(events.c.event_type == event_type.value)
+					.label(field)
+					for event_type, field in (
+						ScoreCalculator.EVENT_COUNTER_FIELDS.items()
+					)
+				),
+			)
+			.where(
+				events.c.user_id >= start_user_id,
+				events.c.user_id < end_user_id,
+				# Свежие события, которых нет в журнале, еще в обработке:
+				# воркер сам увеличит счетчики, когда применит их
+				or_(
+					events.c.created_at < settled_before,
+					exists().where(
+						processed_events_table.c.event_id == events.c.id
+					),
+				),
+			)
+			.group_by(events.c.user_id)
+		)
+		return {
+			row.user_id: {
+				field: getattr(row, field) for field in DatabaseFields.COUNTERS
+			}
+			for row in result
+		}
+
+	async def reconcile_range(
+		self,
+		start_user_id: int,
+		end_user_id: int,
+		settled_before: datetime,
+		rules: Mapping[int, AchievementRule],
+	) -> tuple[int, list[UserScore], int]:
+		# Строки счетов блокируются до подсчета: транзакция воркера, начавшая
+		# начисление раньше, успеет закоммитить журнал и попадет в агрегат,
+		# а начавшая позже дождется исправления и увеличит уже верный счет
+		locked = await self.session.scalars(
+			select(UserScore)
+			.where(
+				UserScore.user_id >= start_user_id,
+				UserScore.user_id < end_user_id,
+			)
+			.order_by(UserScore.user_id)
+			.with_for_update()
+		)
+		current = {
+			user_score.user_id: ScoreCalculator.get_counters(user_score)
+			for user_score in locked
+		}
+		expected = await self._count_applied_events(
+			start_user_id, end_user_id, settled_before)
+
+		zero = dict.fromkeys(DatabaseFields.COUNTERS, 0)
+		fixes = [
+			{"user_id": user_id, **counters}
+			for user_id in sorted(current.keys() | expected.keys())
+			if (counters := expected.get(user_id, zero)) != current.get(
+				user_id, zero)
+		]
+
+		fixed = []
+		if fixes:
+			stmt = pg_insert(UserScore).values(
+				[{**fix, "updated_at": datetime.now(timezone.utc)} for fix in fixes]
+			)
+			stmt = stmt.on_conflict_do_update(
+				index_elements=[UserScore.user_id],
+				set_={
+					**{
+						field: getattr(stmt.excluded, field)
+						for field in DatabaseFields.COUNTERS
+					},
+					"updated_at": stmt.excluded.updated_at,
+				},
+			).returning(UserScore)
+			result = await self.session.scalars(
+				stmt,
+				execution_options={"populate_existing": True},
+			)
+			fixed = list(result)
+
+		achievements = await award_matching(
+			self.session,
+			rules,
+			user_scores_table.c.user_id.between(start_user_id, end_user_id - 1),
+		)
+		await self.session.commit()
+		return len(current.keys() | expected.keys()), fixed, achievements
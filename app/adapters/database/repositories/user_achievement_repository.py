@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.application.interfaces import IUserAchievementRepository
 from app.application.entities import UserAchievement
@@ -19,4 +20,26 @@ class UserAchievementRepository(IUserAchievementRepository):
         result = await self.session.execute(
             select(UserAchievement).where(UserAchievement.user_id == user_id)
         )
-        return list(result.scalars()) 
\ No newline at end of file
+        return list(result.scalars()) 
+
+    async def create_missing(
+        self,
+        user_id: int,
+        achievement_ids: list[int],
+    ) -> set[int]:
+        if not achievement_ids:
+            return set()
+        # Уникальный индекс (user_id, achievement_id) отсекает уже начисленные,
+        # в том числе параллельной транзакцией. Коммит за вызывающим кодом
+        result = await self.session.execute(
+            pg_insert(UserAchievement)
+            .values([
+                {"user_id": user_id, "achievement_id": achievement_id}
+                for achievement_id in achievement_ids
+            ])
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "achievement_id"]
+            )
+            .returning(UserAchievement.achievement_id)
+        )
+        return set(result.scalars())
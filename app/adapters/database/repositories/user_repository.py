@@ -1,8 +1,8 @@
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-
-
 from app.application.interfaces import IUserRepository
 from app.application.entities import User
 
@@ -18,13 +18,52 @@ class UserRepository(IUserRepository):
         await self.session.flush()
         return user
 
-    async def get_all(self) -> list[User]:
-        result = await self.session.execute(select(User))
+    async def get_page(self, after_id: int, limit: int) -> list[User]:
+        # Keyset по первичному ключу: любая страница - поиск по индексу
+        result = await self.session.execute(
+            select(User)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
         return list(result.scalars())
+
+    async def iterate_chunks(
+        self,
+        after_id: int,
+        chunk_size: int,
+    ) -> AsyncIterator[list[User]]:
+        # Серверный курсор: в памяти одновременно не больше chunk_size строк
+        result = await self.session.stream_scalars(
+            select(User)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for chunk in result.partitions():
+            yield chunk
+            # Отданные строки не нужны сессии, не копим их в identity map
+            for user in chunk:
+                self.session.expunge(user)
     
     async def get_by_id(self, user_id: int) -> User | None:
         result = await self.session.execute(
             select(User).where(User.id == user_id)
         )
         return result.scalar_one_or_none()
-    
\ No newline at end of file
+
+    async def get_existing_ids(self, user_ids: set[int]) -> set[int]:
+        if not user_ids:
+            return set()
+        result = await self.session.execute(
+            select(User.id).where(User.id.in_(user_ids))
+        )
+        return set(result.scalars())
+
+    async def get_usernames(self, user_ids: set[int]) -> dict[int, str]:
+        if not user_ids:
+            return {}
+        result = await self.session.execute(
+            select(User.id, User.username).where(User.id.in_(user_ids))
+        )
+        return dict(result.tuples())
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.application.interfaces import IUserScoreRepository
 from app.application.entities import UserScore
+from app.application.constants import DatabaseFields
 
 
 class UserScoreRepository(IUserScoreRepository):
@@ -31,4 +33,57 @@ class UserScoreRepository(IUserScoreRepository):
         self.session.add(user_score)
         await self.session.commit()
         await self.session.refresh(user_score)
-        return user_score
\ No newline at end of file
+        return user_score
+
+    async def increment_counters(
+        self,
+        user_id: int,
+        deltas: dict[str, int],
+    ) -> UserScore:
+        unknown = set(deltas) - set(DatabaseFields.COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown user score counters: {sorted(unknown)}")
+
+        values = {field: deltas.get(field, 0) for field in DatabaseFields.COUNTERS}
+        stmt = pg_insert(UserScore).values(
+            user_id=user_id,
+            updated_at=datetime.now(timezone.utc),
+            **values,
+        )
+        # Один INSERT ... ON CONFLICT DO UPDATE ... RETURNING вместо
+        # чтения и записи всей строки. Коммит остается за вызывающим кодом
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserScore.user_id],
+            set_={
+                **{
+                    field: func.coalesce(getattr(UserScore, field), 0)
+                    + getattr(stmt.excluded, field)
+                    for field in DatabaseFields.COUNTERS
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(UserScore)
+        result = await self.session.scalars(
+            stmt,
+            execution_options={"populate_existing": True},
+        )
+        return result.one()
+
+    async def get_chunk_after(
+        self,
+        after_user_id: int,
+        limit: int,
+    ) -> list[UserScore]:
+        # Keyset по уникальному user_id: каждая порция - поиск по индексу,
+        # без OFFSET, который на больших таблицах дорожает с каждой страницей
+        result = await self.session.scalars(
+            select(UserScore)
+            .where(UserScore.user_id > after_user_id)
+            .order_by(UserScore.user_id)
+            .limit(limit)
+        )
+        scores = list(result)
+        # Не копим прочитанные строки в identity map сессии при полном проходе
+        for user_score in scores:
+            self.session.expunge(user_score)
+        return scores
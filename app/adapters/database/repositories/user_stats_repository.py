@@ -0,0 +1,99 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, select, func, literal_column, type_coerce
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.application.interfaces import IUserStatsRepository
+from app.application.constants import Limits
+from app.adapters.database.tables import (
+	users_table,
+	events_table,
+	achievements_table,
+	user_achievements_table,
+)
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+class UserStatsRepository(IUserStatsRepository):
+	"""Чтение статистики пользователя одним SQL-запросом"""
+
+	def __init__(self, session: AsyncSession):
+		self.session = session
+
+	async def get_snapshot(
+		self,
+		user_id: int,
+		events_limit: int = Limits.RECENT_EVENTS_LIMIT,
+	) -> dict | None:
+		result = await self.session.execute(
+			self._snapshot_query(user_id, events_limit)
+		)
+		row = result.one_or_none()
+		if row is None:
+			return None
+		return {
+			"achievements": row.achievements,
+			"last_events": row.last_events,
+		}
+
+	@staticmethod
+	def _snapshot_query(user_id: int, events_limit: int):
+		"""Существование пользователя, названия достижений (JOIN) и последние
+		события собираются в одну строку через json_agg"""
+		ua = user_achievements_table
+		a = achievements_table
+		e = events_table
+
+		achievement_names = (
+			select(
+				func.coalesce(
+					func.json_agg(
+						aggregate_order_by(a.c.name, ua.c.earned_at, ua.c.id)
+					),
+					EMPTY_JSON_ARRAY,
+				)
+			)
+			.select_from(ua.join(a, a.c.id == ua.c.achievement_id))
+			.where(ua.c.user_id == user_id)
+			.scalar_subquery()
+		)
+
+		recent = (
+			select(e.c.id, e.c.event_type, e.c.details, e.c.created_at)
+			.where(e.c.user_id == user_id)
+			# id разводит события с одинаковым временем (пакетная вставка):
+			# порядок тот же, что у истории событий и индекса
+			.order_by(e.c.created_at.desc(), e.c.id.desc())
+			.limit(events_limit)
+			.subquery("recent")
+		)
+		last_events = (
+			select(
+				func.coalesce(
+					func.json_agg(
+						aggregate_order_by(
+							func.json_build_object(
+								"id", recent.c.id,
+								"event_type", recent.c.event_type,
+								"details", recent.c.details,
+								"created_at", recent.c.created_at,
+							),
+							recent.c.created_at.desc(),
+							recent.c.id.desc(),
+						)
+					),
+					EMPTY_JSON_ARRAY,
+				)
+			)
+			.select_from(recent)
+			.scalar_subquery()
+		)
+
+		return (
+			select(
+				users_table.c.id,
+				type_coerce(achievement_names, JSON).label("achievements"),
+				type_coerce(last_events, JSON).label("last_events"),
+			)
+			.where(users_table.c.id == user_id)
+		)
@@ -5,6 +5,10 @@ from .user_score_table import user_scores_table
 from .achievement_table import achievements_table
 from .user_achievement_table import user_achievements_table
 from .achievement_notification_table import achievement_notifications_table
+from .event_outbox_table import event_outbox_table
+from .event_idempotency_key_table import event_idempotency_keys_table
+from .processed_event_table import processed_events_table
+from .event_delivery_failure_table import event_delivery_failures_table
 
 __all__ = [
     "mapper_registry",
@@ -14,5 +18,9 @@ __all__ = [
     "user_scores_table",
     "achievements_table",
     "user_achievements_table",
-    "achievement_notifications_table"
+    "achievement_notifications_table",
+    "event_outbox_table",
+    "event_idempotency_keys_table",
+    "processed_events_table",
+    "event_delivery_failures_table",
 ] 
\ No newline at end of file
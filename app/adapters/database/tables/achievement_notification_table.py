@@ -6,7 +6,9 @@ from sqlalchemy import (
 	Boolean,
 	Text,
 	ForeignKey,
+	Index,
 	func,
+	text,
 )
 from .base import metadata
 
@@ -19,7 +21,20 @@ achievement_notifications_table = Table(
 	Column('achievement_id', Integer, ForeignKey('achievements.id'),
 	       nullable=False),
 	Column('message', Text, nullable=False),
-	Column('is_sent', Boolean, default=False),
+	Column('is_sent', Boolean, nullable=False, default=False,
+	       server_default=text('false')),
 	Column('created_at', DateTime, server_default=func.now()),
-	Column('sent_at', DateTime)
+	Column('sent_at', DateTime),
+	# Доставка с повторами: число попыток и время следующей, NULL - попытки
+	# исчерпаны
+	Column('attempts', Integer, nullable=False, default=0,
+	       server_default=text('0')),
+	Column('next_attempt_at', DateTime, server_default=func.now()),
+	Column('last_error', Text),
+	# Очередь доставки: только неотправленные уведомления
+	Index(
+		'ix_achievement_notifications_pending',
+		'next_attempt_at',
+		postgresql_where=text('NOT is_sent'),
+	),
 )
@@ -1,4 +1,13 @@
-from sqlalchemy import Table, Column, Integer, String, DateTime, Text, func
+from sqlalchemy import (
+	Table,
+	Column,
+	Integer,
+	String,
+	DateTime,
+	Text,
+	JSON,
+	func,
+)
 from .base import metadata
 from app.application.constants import Limits
 
@@ -15,5 +24,6 @@ achievements_table = Table(
 	Column('condition_field', String(Limits.ACHIEVEMENT_TYPE_MAX_LENGTH),
 	       nullable=False),
 	Column('condition_value', Integer, nullable=False),
+	Column('conditions', JSON),
 	Column('created_at', DateTime, server_default=func.now())
 )
@@ -0,0 +1,20 @@
+from sqlalchemy import Table, Column, Integer, DateTime, func
+from .base import metadata
+
+# Неудачные попытки обработки событий: отложенное событие возвращается в
+# outbox с задержкой, а исчерпавшее попытки помечается dead_at и больше не
+# ретранслируется
+event_delivery_failures_table = Table(
+	'event_delivery_failures',
+	metadata,
+	# Без внешнего ключа: первичный ключ секционированной events - (id, created_at)
+	Column('event_id', Integer, primary_key=True),
+	Column('attempts', Integer, nullable=False),
+	Column(
+		'last_failed_at',
+		DateTime(timezone=True),
+		server_default=func.now(),
+		nullable=False,
+	),
+	Column('dead_at', DateTime(timezone=True)),
+)
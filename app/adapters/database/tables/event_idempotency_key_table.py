@@ -0,0 +1,26 @@
+from sqlalchemy import (
+	Table,
+	Column,
+	Integer,
+	String,
+	DateTime,
+	ForeignKey,
+	Index,
+	func,
+)
+from .base import metadata
+from app.application.constants import Limits
+
+# Ключи идемпотентности приема событий: повтор запроса с тем же ключом
+# возвращает ранее созданное событие
+event_idempotency_keys_table = Table(
+	'event_idempotency_keys',
+	metadata,
+	Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+	Column('idempotency_key', String(Limits.IDEMPOTENCY_KEY_MAX_LENGTH),
+	       primary_key=True),
+	Column('event_id', Integer, nullable=False),
+	Column('created_at', DateTime(timezone=True), server_default=func.now()),
+	# Очистка устаревших ключей
+	Index('ix_event_idempotency_keys_created_at', 'created_at'),
+)
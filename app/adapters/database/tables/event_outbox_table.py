@@ -0,0 +1,20 @@
+from sqlalchemy import Table, Column, BigInteger, Integer, DateTime, func
+from .base import metadata
+
+# Outbox событий: строка пишется в одной транзакции с событием и удаляется
+# ретранслятором после передачи события на обработку
+event_outbox_table = Table(
+	'event_outbox',
+	metadata,
+	Column('id', BigInteger, primary_key=True),
+	# Без внешнего ключа: первичный ключ секционированной events - (id, created_at)
+	Column('event_id', Integer, nullable=False),
+	Column('created_at', DateTime(timezone=True), server_default=func.now()),
+	# Отложенное событие ретранслируется не раньше этого времени
+	Column(
+		'available_at',
+		DateTime(timezone=True),
+		server_default=func.now(),
+		nullable=False,
+	),
+)
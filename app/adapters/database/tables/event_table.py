@@ -6,18 +6,31 @@ from sqlalchemy import (
     DateTime,
     JSON,
     ForeignKey,
+    Index,
     func,
+    text,
 )
 from .base import metadata
 from app.application.constants import Limits
 
-# Таблица событий
+# Таблица событий, секционированная по месяцам created_at
 events_table = Table(
     'events',
     metadata,
-    Column('id', Integer, primary_key=True),
+    Column('id', Integer, primary_key=True, autoincrement=True),
     Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
     Column('event_type', String(Limits.EVENT_TYPE_MAX_LENGTH), nullable=False),
     Column('details', JSON),
-    Column('created_at', DateTime, server_default=func.now())
+    # Ключ помесячного секционирования, поэтому входит в первичный ключ
+    Column('created_at', DateTime(timezone=True), primary_key=True,
+           nullable=False, server_default=func.now()),
+    # История пользователя по убыванию (created_at, id): курсор страницы
+    # продолжает чтение индекса с места остановки
+    Index(
+        'ix_events_user_id_created_at_id',
+        'user_id',
+        text('created_at DESC'),
+        text('id DESC'),
+    ),
+    postgresql_partition_by='RANGE (created_at)',
 )
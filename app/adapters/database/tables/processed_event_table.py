@@ -0,0 +1,13 @@
+from sqlalchemy import Table, Column, Integer, DateTime, Index, func
+from .base import metadata
+
+# Журнал примененных событий: пишется в одной транзакции со счетчиками,
+# поэтому повторная обработка события не начисляет очки дважды
+processed_events_table = Table(
+	'processed_events',
+	metadata,
+	Column('event_id', Integer, primary_key=True),
+	Column('processed_at', DateTime(timezone=True), server_default=func.now()),
+	# Очистка устаревших записей
+	Index('ix_processed_events_processed_at', 'processed_at'),
+)
@@ -1,4 +1,12 @@
-from sqlalchemy import Table, Column, Integer, DateTime, ForeignKey, func
+from sqlalchemy import (
+	Table,
+	Column,
+	Integer,
+	DateTime,
+	ForeignKey,
+	Index,
+	func,
+)
 from .base import metadata
 
 # Таблица достижений пользователей
@@ -9,5 +17,12 @@ user_achievements_table = Table(
 	Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
 	Column('achievement_id', Integer, ForeignKey('achievements.id'),
 	       nullable=False),
-	Column('earned_at', DateTime, server_default=func.now())
+	Column('earned_at', DateTime, server_default=func.now()),
+	# Достижения пользователя; одно достижение начисляется один раз
+	Index(
+		'uq_user_achievements_user_id_achievement_id',
+		'user_id',
+		'achievement_id',
+		unique=True,
+	),
 )
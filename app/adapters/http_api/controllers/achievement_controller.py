@@ -32,6 +32,7 @@ async def get_all_achievements(
             points=achievement.points,
             condition_field=achievement.condition_field,
             condition_value=achievement.condition_value,
+            conditions=achievement.conditions,
             created_at=achievement.created_at
         )
         for achievement in achievements
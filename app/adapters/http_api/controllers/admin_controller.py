@@ -0,0 +1,101 @@
+import asyncio
+
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.adapters.http_api.dependencies import (
+    get_export_service,
+    require_admin_token,
+)
+from app.application.constants import Limits
+from app.application.entities import ExportDataset, ExportFormat
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+    responses={403: {"description": "Forbidden"}},
+)
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+async def _stream_export(
+    run: Callable[[Callable[[bytes], Awaitable[None]]], Awaitable[int]],
+) -> AsyncIterator[bytes]:
+    """Передает порции COPY клиенту через ограниченную очередь.
+
+    Пока клиент не забрал данные, COPY ждет на заполненной очереди, поэтому
+    память не растет с размером выгрузки.
+    """
+    queue = asyncio.Queue(maxsize=Limits.EXPORT_STREAM_BUFFER_CHUNKS)
+    done = object()
+
+    async def produce() -> None:
+        try:
+            await run(queue.put)
+        except asyncio.CancelledError:
+            # Клиент отключился: конца выгрузки никто не ждет, а put на
+            # заполненной очереди повис бы навсегда
+            raise
+        except Exception:
+            await queue.put(done)
+            raise
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (chunk := await queue.get()) is not done:
+            yield chunk
+        # Ошибка COPY обрывает ответ, а не отдает клиенту неполный файл молча
+        await producer
+    finally:
+        producer.cancel()
+
+
+@router.get(
+    "/export/{dataset}",
+    summary="Выгрузить таблицу",
+    response_description="Файл CSV или NDJSON, передается потоком"
+)
+async def export_dataset(
+    dataset: ExportDataset,
+    format: ExportFormat = Query(ExportFormat.CSV),
+    created_from: datetime | None = Query(
+        None, description="Начало периода (включительно)"),
+    created_to: datetime | None = Query(
+        None, description="Конец периода (не включительно)"),
+    gzip: bool = Query(False, description="Сжать ответ в gzip"),
+    export_service = Depends(get_export_service)
+) -> StreamingResponse:
+    """
+    Выгрузить events, user_scores или user_achievements через COPY.
+
+    Требует заголовок X-Admin-Token. Период фильтрует по времени создания
+    строки (для user_scores - по времени обновления).
+    """
+    filename = f"{dataset.value}.{format.value}"
+    media_type = _MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _stream_export(
+            lambda output: export_service.export(
+                dataset,
+                format,
+                output,
+                created_from=created_from,
+                created_to=created_to,
+                compress=gzip,
+            )
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
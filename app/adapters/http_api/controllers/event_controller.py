@@ -3,8 +3,11 @@ from app.adapters.http_api.schemas.event_schemas import (
 	EventRequest,
 	EventResponse,
 	EventDetails,
+	EventBatchRequest,
+	EventBatchResponse,
 )
 from app.adapters.http_api.dependencies import get_event_service
+from app.application.entities import Event
 from app.application.utils import EventTypeHelper
 
 router = APIRouter(
@@ -13,6 +16,12 @@ router = APIRouter(
     responses={404: {"description": "Not Found"}},
 )
 
+batch_router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    responses={404: {"description": "Not Found"}},
+)
+
 
 @router.post(
     "/",
@@ -31,13 +40,60 @@ async def create_event(
 	- login: Вход пользователя в игру
 	- complete_level: Завершение уровня
 	- find_secret: Найден секретный объект
+
+	Повтор запроса с тем же idempotency_key вернет ранее созданное событие.
 	"""
 	event = await event_service.process_event(
 		user_id=event_request.user_id,
 		event_type=event_request.event_type,
-		details=event_request.details.model_dump() if event_request.details else None
+		details=event_request.details.model_dump() if event_request.details else None,
+		idempotency_key=event_request.idempotency_key
 	)
 
+	return _to_event_response(event)
+
+
+@batch_router.post(
+    "/batch",
+    response_model=EventBatchResponse,
+    summary="Создать пакет событий пользователей",
+    response_description="Информация о созданных событиях"
+)
+async def create_events_batch(
+	batch_request: EventBatchRequest,
+	event_service=Depends(get_event_service)
+) -> EventBatchResponse:
+	"""
+	Создает пакет событий одним запросом.
+
+	Все события сохраняются одним INSERT и передаются на обработку через
+	outbox. Пакет принимается целиком или отклоняется. События с уже
+	принятым idempotency_key не создаются повторно: в ответе будут ранее
+	созданные события.
+	"""
+	events = await event_service.process_events_batch(
+		events=[
+			Event(
+				user_id=event_request.user_id,
+				event_type=event_request.event_type,
+				details=event_request.details.model_dump()
+				if event_request.details else None
+			)
+			for event_request in batch_request.events
+		],
+		idempotency_keys=[
+			event_request.idempotency_key
+			for event_request in batch_request.events
+		]
+	)
+
+	return EventBatchResponse(
+		count=len(events),
+		events=[_to_event_response(event) for event in events]
+	)
+
+
+def _to_event_response(event: Event) -> EventResponse:
 	return EventResponse(
 		id=event.id,
 		user_id=event.user_id,
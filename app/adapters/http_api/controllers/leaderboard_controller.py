@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, Query
+from app.adapters.http_api.schemas.leaderboard_schemas import (
+    LeaderboardResponse,
+    LeaderboardPositionResponse,
+)
+from app.adapters.http_api.dependencies import get_leaderboard_service
+from app.application.constants import Limits
+from app.application.entities import LeaderboardPeriod
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["leaderboard"],
+    responses={404: {"description": "Not Found"}},
+)
+
+
+@router.get(
+    "",
+    response_model=LeaderboardResponse,
+    summary="Получить лидерборд",
+    response_description="Страница лидерборда по убыванию счета"
+)
+async def get_leaderboard(
+    limit: int = Query(
+        Limits.LEADERBOARD_DEFAULT_LIMIT,
+        ge=1,
+        le=Limits.LEADERBOARD_MAX_LIMIT,
+    ),
+    offset: int = Query(0, ge=0),
+    period: LeaderboardPeriod = Query(LeaderboardPeriod.GLOBAL),
+    leaderboard_service = Depends(get_leaderboard_service)
+) -> LeaderboardResponse:
+    """Получить top-N игроков с пагинацией.
+
+    period: global - за все время, day / week / season - очки, набранные
+    за текущие сутки, ISO-неделю или сезон (квартал).
+    """
+    return LeaderboardResponse(
+        **await leaderboard_service.get_top(
+            limit=limit,
+            offset=offset,
+            period=period,
+        )
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=LeaderboardPositionResponse,
+    summary="Получить позицию пользователя в лидерборде",
+    response_description="Место пользователя и его соседи"
+)
+async def get_user_position(
+    user_id: int,
+    neighbours: int = Query(
+        Limits.LEADERBOARD_NEIGHBOURS,
+        ge=0,
+        le=Limits.LEADERBOARD_MAX_LIMIT,
+    ),
+    period: LeaderboardPeriod = Query(LeaderboardPeriod.GLOBAL),
+    leaderboard_service = Depends(get_leaderboard_service)
+) -> LeaderboardPositionResponse:
+    """Получить место пользователя и по neighbours игроков выше и ниже"""
+    return LeaderboardPositionResponse(
+        **await leaderboard_service.get_user_position(
+            user_id=user_id,
+            neighbours=neighbours,
+            period=period,
+        )
+    )
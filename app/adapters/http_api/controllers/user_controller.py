@@ -1,10 +1,25 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from app.adapters.http_api.schemas.user_schemas import (
     UserResponse,
+    UserListResponse,
     UserScoreResponse,
     UserCreateRequest,
 )
-from app.adapters.http_api.dependencies import get_user_service
+from app.adapters.http_api.schemas.event_schemas import (
+    EventDetails,
+    EventHistoryItem,
+    EventHistoryResponse,
+)
+from app.adapters.http_api.dependencies import (
+    get_user_service,
+    get_event_service,
+)
+from app.application.constants import Limits
+from app.application.entities import EventType
+from app.application.utils import EventTypeHelper
 
 router = APIRouter(
     prefix="/users",
@@ -38,24 +53,63 @@ async def create_user(
 
 @router.get(
     "/",
-    response_model=list[UserResponse],
-    summary="Получить всех пользователей",
-    response_description="Список всех пользователей"
+    response_model=UserListResponse,
+    summary="Получить список пользователей",
+    response_description="Страница пользователей по возрастанию ID",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+    },
 )
-async def get_all_users(
+async def get_users(
+    after_id: int = Query(0, ge=0, description="ID последнего пользователя "
+                                               "предыдущей страницы"),
+    limit: int = Query(
+        Limits.USERS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=Limits.USERS_PAGE_MAX_LIMIT,
+    ),
+    stream: bool = Query(False, description="Выгрузить всех пользователей "
+                                            "после after_id в NDJSON"),
     user_service = Depends(get_user_service)
-) -> list[UserResponse]:
-    """Получить всех пользователей"""
-    users = await user_service.get_all_users()
-    return [
-        UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            created_at=user.created_at
+):
+    """Получить пользователей постранично (keyset по ID).
+
+    stream=true отдает всех пользователей после after_id построчно в NDJSON
+    по мере чтения из БД, limit при этом не применяется.
+    """
+    if stream:
+        return StreamingResponse(
+            _users_ndjson(user_service.iterate_users(after_id=after_id)),
+            media_type="application/x-ndjson",
+        )
+
+    users = await user_service.get_users_page(after_id=after_id, limit=limit)
+    return UserListResponse(
+        users=[
+            UserResponse(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                created_at=user.created_at
+            )
+            for user in users
+        ],
+        limit=limit,
+        next_after_id=users[-1].id if len(users) == limit else None,
+    )
+
+
+async def _users_ndjson(chunks):
+    async for users in chunks:
+        yield "".join(
+            UserResponse(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                created_at=user.created_at
+            ).model_dump_json() + "\n"
+            for user in users
         )
-        for user in users
-    ]
 
 
 @router.get(
@@ -96,3 +150,56 @@ async def get_user_score(
         secrets_found=score.secrets_found,
         updated_at=score.updated_at
     )
+
+
+@router.get(
+    "/{user_id}/events",
+    response_model=EventHistoryResponse,
+    summary="Получить историю событий пользователя",
+    response_description="Страница событий, новые первыми"
+)
+async def get_user_events(
+    user_id: int,
+    limit: int = Query(
+        Limits.EVENT_HISTORY_DEFAULT_LIMIT,
+        ge=1,
+        le=Limits.EVENT_HISTORY_MAX_LIMIT,
+    ),
+    cursor: str | None = Query(None, description="next_cursor предыдущей "
+                                                  "страницы"),
+    event_type: list[EventType] | None = Query(None, description="Только "
+                                               "события этих типов"),
+    created_from: datetime | None = Query(None, description="Не раньше "
+                                          "(включительно)"),
+    created_to: datetime | None = Query(None, description="Раньше этого "
+                                        "момента"),
+    event_service = Depends(get_event_service)
+) -> EventHistoryResponse:
+    """Получить историю событий пользователя с курсорной пагинацией.
+
+    Курсор задает позицию (created_at, id) последнего события страницы,
+    поэтому глубокие страницы читаются так же быстро, как первая.
+    Фильтры следующих страниц должны совпадать с фильтрами первой.
+    """
+    history = await event_service.get_user_history(
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor,
+        event_types=event_type,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return EventHistoryResponse(
+        user_id=history["user_id"],
+        events=[
+            EventHistoryItem(
+                id=event.id,
+                event_type=EventTypeHelper.to_string(event.event_type),
+                details=EventDetails(**event.details) if event.details else None,
+                created_at=event.created_at,
+            )
+            for event in history["events"]
+        ],
+        limit=history["limit"],
+        next_cursor=history["next_cursor"],
+    )
@@ -1,7 +1,10 @@
 """
 Dependency injection контейнер для всех сервисов и репозиториев.
 """
-from fastapi import Depends
+import os
+import secrets
+
+from fastapi import Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.adapters.database.session import get_async_session
 from app.adapters.database.repositories import (
@@ -10,18 +13,32 @@ from app.adapters.database.repositories import (
 	AchievementRepository,
 	UserScoreRepository,
 	UserAchievementRepository,
-	AchievementNotificationRepository
+	AchievementNotificationRepository,
+	UserStatsRepository,
+	DataExportRepository,
 )
 from app.adapters.cache.redis_repository import RedisUserScoreRepository
+from app.adapters.cache.leaderboard_repository import RedisLeaderboardRepository
 from app.application.services.event_service import EventService
 from app.application.services.achievement_service import AchievementService
 from app.application.services.user_service import UserService
 from app.application.services.stats_service import StatsService
+from app.application.services.leaderboard_service import LeaderboardService
+from app.application.services.export_service import ExportService
+from app.application.exceptions import AdminAccessDeniedError
+
+# Токен административных эндпоинтов; без него они отключены
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
 
+def get_redis_repository(request: Request) -> RedisUserScoreRepository:
+	"""Redis кеш поверх общего пула приложения (создается в lifespan)"""
+	return request.app.state.redis_repository
 
-def get_redis_repository() -> RedisUserScoreRepository:
-	"""Фабрика для создания Redis кеша"""
-	return RedisUserScoreRepository()
+
+def get_leaderboard_repository(request: Request) -> RedisLeaderboardRepository:
+	"""Лидерборд поверх общего пула Redis приложения"""
+	return request.app.state.leaderboard_repository
 
 
 async def get_user_repository(
@@ -66,6 +83,13 @@ async def get_achievement_notification_repository(
 	return AchievementNotificationRepository(session)
 
 
+async def get_user_stats_repository(
+	session: AsyncSession = Depends(get_async_session)
+) -> UserStatsRepository:
+	"""Фабрика для создания репозитория чтения статистики"""
+	return UserStatsRepository(session)
+
+
 async def get_user_service(
 	user_repository: UserRepository = Depends(get_user_repository),
 	user_score_repository: UserScoreRepository = Depends(
@@ -84,23 +108,13 @@ async def get_event_service(
 
 
 async def get_stats_service(
-	user_repository: UserRepository = Depends(get_user_repository),
-	user_score_repository: UserScoreRepository = Depends(
-		get_user_score_repository),
-	user_achievement_repository: UserAchievementRepository = Depends(
-		get_user_achievement_repository),
-	event_repository: EventRepository = Depends(get_event_repository),
-	achievement_repository: AchievementRepository = Depends(
-		get_achievement_repository),
+	user_stats_repository: UserStatsRepository = Depends(
+		get_user_stats_repository),
 	redis_repository: RedisUserScoreRepository = Depends(get_redis_repository)
 ) -> StatsService:
 	"""Фабрика для создания сервиса статистики"""
 	return StatsService(
-		user_repository,
-		user_score_repository,
-		user_achievement_repository,
-		event_repository,
-		achievement_repository,
+		user_stats_repository,
 		redis_repository
 	)
 
@@ -124,3 +138,37 @@ async def get_achievement_service(
 		user_score_repository,
 		redis_repository
 	)
+
+
+async def get_leaderboard_service(
+	leaderboard_repository: RedisLeaderboardRepository = Depends(
+		get_leaderboard_repository),
+	user_repository: UserRepository = Depends(get_user_repository)
+) -> LeaderboardService:
+	"""Фабрика для создания сервиса лидерборда"""
+	return LeaderboardService(leaderboard_repository, user_repository)
+
+
+async def get_data_export_repository(
+	session: AsyncSession = Depends(get_async_session)
+) -> DataExportRepository:
+	"""Фабрика для создания репозитория выгрузки"""
+	return DataExportRepository(session)
+
+
+async def get_export_service(
+	export_repository: DataExportRepository = Depends(
+		get_data_export_repository)
+) -> ExportService:
+	"""Фабрика для создания сервиса выгрузки"""
+	return ExportService(export_repository)
+
+
+async def require_admin_token(
+	x_admin_token: str | None = Header(default=None)
+) -> None:
+	"""Проверяет заголовок X-Admin-Token"""
+	if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(
+		x_admin_token.encode(), ADMIN_TOKEN.encode()
+	):
+		raise AdminAccessDeniedError()
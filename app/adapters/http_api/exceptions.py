@@ -2,14 +2,19 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from app.application.exceptions import (
 	UserNotFoundError,
+	UsersNotFoundError,
 	UserScoreNotFoundError,
 	EventNotFoundError,
 	InvalidEventDataError,
+	InvalidCursorError,
 	EventServiceError,
 	AchievementServiceError,
 	StatsServiceError,
 	ValidationError,
 	UserAlreadyExistsError,
+	UserNotRankedError,
+	LeaderboardServiceError,
+	AdminAccessDeniedError,
 )
 
 
@@ -33,6 +38,12 @@ class ExceptionHandler:
 		return ExceptionHandler._create_error_response(
 			status.HTTP_404_NOT_FOUND, exc)
 
+	@staticmethod
+	async def users_not_found_handler(request: Request,
+	                                  exc: UsersNotFoundError):
+		return ExceptionHandler._create_error_response(
+			status.HTTP_404_NOT_FOUND, exc)
+
 	@staticmethod
 	async def user_score_not_found_handler(request: Request,
 	                                       exc: UserScoreNotFoundError):
@@ -51,6 +62,18 @@ class ExceptionHandler:
 		return ExceptionHandler._create_error_response(
 			status.HTTP_400_BAD_REQUEST, exc)
 
+	@staticmethod
+	async def invalid_cursor_handler(request: Request,
+	                                 exc: InvalidCursorError):
+		return ExceptionHandler._create_error_response(
+			status.HTTP_400_BAD_REQUEST, exc)
+
+	@staticmethod
+	async def admin_access_denied_handler(request: Request,
+	                                      exc: AdminAccessDeniedError):
+		return ExceptionHandler._create_error_response(
+			status.HTTP_403_FORBIDDEN, exc)
+
 	@staticmethod
 	async def validation_error_handler(request: Request, exc: ValidationError):
 		return ExceptionHandler._create_error_response(
@@ -74,6 +97,18 @@ class ExceptionHandler:
 		return ExceptionHandler._create_error_response(
 			status.HTTP_500_INTERNAL_SERVER_ERROR, exc)
 
+	@staticmethod
+	async def leaderboard_service_error_handler(request: Request,
+	                                            exc: LeaderboardServiceError):
+		return ExceptionHandler._create_error_response(
+			status.HTTP_500_INTERNAL_SERVER_ERROR, exc)
+
+	@staticmethod
+	async def user_not_ranked_handler(request: Request,
+	                                  exc: UserNotRankedError):
+		return ExceptionHandler._create_error_response(
+			status.HTTP_404_NOT_FOUND, exc)
+
 	@staticmethod
 	async def user_already_exists_handler(request: Request,
 	                                      exc: UserAlreadyExistsError):
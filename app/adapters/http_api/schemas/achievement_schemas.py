@@ -16,6 +16,9 @@ class AchievementResponse(BaseModel):
 	                             max_length=Limits.ACHIEVEMENT_TYPE_MAX_LENGTH)
 	condition_value: int = Field(..., description="Значение для достижения",
 	                             ge=0)
+	conditions: dict | None = Field(
+		None,
+		description="Составное условие: {\"all\"|\"any\": [{\"field\", \"value\"}]}")
 	created_at: datetime = Field(..., description="Дата создания")
 
 	model_config = {"from_attributes": True}
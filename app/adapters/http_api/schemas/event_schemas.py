@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from app.application.entities import EventType
+from app.application.constants import Limits
 
 
 class EventDetails(BaseModel):
@@ -18,6 +19,21 @@ class EventRequest(BaseModel):
 	details: EventDetails | None = Field(
 		None,
 		description="Дополнительные данные события")
+	idempotency_key: str | None = Field(
+		None,
+		min_length=1,
+		max_length=Limits.IDEMPOTENCY_KEY_MAX_LENGTH,
+		description="Ключ идемпотентности: повтор с тем же ключом вернет "
+		            "ранее созданное событие")
+
+
+class EventBatchRequest(BaseModel):
+	"""Модель запроса для пакетного создания событий"""
+	events: list[EventRequest] = Field(
+		...,
+		min_length=1,
+		max_length=Limits.EVENT_BATCH_MAX_SIZE,
+		description="События пакета")
 
 
 class EventResponse(BaseModel):
@@ -31,3 +47,31 @@ class EventResponse(BaseModel):
 	message: str = Field(..., description="Сообщение о результате")
 
 	model_config = {"from_attributes": True}
+
+
+class EventBatchResponse(BaseModel):
+	"""Модель ответа пакетного создания событий"""
+	count: int = Field(..., description="Количество созданных событий")
+	events: list[EventResponse] = Field(..., description="Созданные события")
+
+
+class EventHistoryItem(BaseModel):
+	"""Событие в истории пользователя"""
+	id: int = Field(..., description="ID события")
+	event_type: str = Field(..., description="Тип события")
+	details: EventDetails | None = Field(None,
+	                                     description="Дополнительные данные")
+	created_at: datetime = Field(..., description="Время создания")
+
+	model_config = {"from_attributes": True}
+
+
+class EventHistoryResponse(BaseModel):
+	"""Модель ответа страницы истории событий"""
+	user_id: int = Field(..., description="ID пользователя")
+	events: list[EventHistoryItem] = Field(...,
+	                                       description="События, новые первыми")
+	limit: int = Field(..., description="Размер страницы")
+	next_cursor: str | None = Field(
+		None,
+		description="Курсор следующей страницы, null - страница последняя")
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from app.application.entities import LeaderboardPeriod
+
+
+class LeaderboardEntryResponse(BaseModel):
+	"""Модель строки лидерборда"""
+	rank: int = Field(..., description="Место в лидерборде, с 1", ge=1)
+	user_id: int = Field(..., description="ID пользователя")
+	username: str | None = Field(None, description="Имя пользователя")
+	score: int = Field(..., description="Общий счет", ge=0)
+
+
+class LeaderboardResponse(BaseModel):
+	"""Модель страницы лидерборда"""
+	period: LeaderboardPeriod = Field(..., description="Период лидерборда")
+	total: int = Field(..., description="Всего игроков в лидерборде", ge=0)
+	limit: int = Field(..., description="Размер страницы")
+	offset: int = Field(..., description="Смещение страницы")
+	entries: list[LeaderboardEntryResponse] = Field(
+		..., description="Игроки по убыванию счета")
+
+
+class LeaderboardPositionResponse(BaseModel):
+	"""Модель позиции пользователя в лидерборде"""
+	period: LeaderboardPeriod = Field(..., description="Период лидерборда")
+	user_id: int = Field(..., description="ID пользователя")
+	rank: int = Field(..., description="Место в лидерборде, с 1", ge=1)
+	score: int = Field(..., description="Общий счет", ge=0)
+	total: int = Field(..., description="Всего игроков в лидерборде", ge=0)
+	neighbours: list[LeaderboardEntryResponse] = Field(
+		..., description="Соседи пользователя, включая его самого")
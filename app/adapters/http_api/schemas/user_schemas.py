@@ -15,6 +15,16 @@ class UserResponse(BaseModel):
 	model_config = {"from_attributes": True}
 
 
+class UserListResponse(BaseModel):
+	"""Модель ответа страницы пользователей"""
+	users: list[UserResponse] = Field(..., description="Пользователи по id")
+	limit: int = Field(..., description="Размер страницы")
+	next_after_id: int | None = Field(
+		None,
+		description="after_id следующей страницы, null - страница последняя",
+	)
+
+
 class UserScoreResponse(BaseModel):
 	"""Модель ответа счета пользователя"""
 	user_id: int = Field(..., description="ID пользователя")
@@ -0,0 +1,78 @@
+"""
+Получатели уведомлений о достижениях; выбираются переменной NOTIFICATION_SINK
+"""
+import asyncio
+import json
+import logging
+import os
+import urllib.request
+
+from app.application.interfaces import INotificationSink
+from app.application.entities import AchievementNotification
+from app.application.constants import NotificationDelivery
+
+logger = logging.getLogger(__name__)
+
+
+class LogNotificationSink(INotificationSink):
+    """Пишет уведомления в лог воркера"""
+
+    async def send(self, notifications: list[AchievementNotification]) -> None:
+        for notification in notifications:
+            logger.info(
+                f"[Achievement] User #{notification.user_id}: "
+                f"{notification.message}"
+            )
+
+
+class WebhookNotificationSink(INotificationSink):
+    """Отправляет пакет уведомлений одним POST-запросом в JSON"""
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = NotificationDelivery.WEBHOOK_TIMEOUT,
+    ):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, notifications: list[AchievementNotification]) -> None:
+        body = json.dumps({
+            "notifications": [
+                {
+                    "id": notification.id,
+                    "user_id": notification.user_id,
+                    "achievement_id": notification.achievement_id,
+                    "message": notification.message,
+                }
+                for notification in notifications
+            ],
+        }).encode()
+        # Блокирующий запрос выполняется в потоке, не останавливая event loop
+        await asyncio.to_thread(self._post, body)
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # Ответ не 2xx поднимает HTTPError, и пакет уходит на повтор
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def create_notification_sink() -> INotificationSink:
+    sink = os.getenv("NOTIFICATION_SINK", NotificationDelivery.SINK_LOG)
+    if sink == NotificationDelivery.SINK_WEBHOOK:
+        return WebhookNotificationSink(
+            os.environ["NOTIFICATION_WEBHOOK_URL"],
+            timeout=float(os.getenv(
+                "NOTIFICATION_WEBHOOK_TIMEOUT",
+                NotificationDelivery.WEBHOOK_TIMEOUT,
+            )),
+        )
+    if sink != NotificationDelivery.SINK_LOG:
+        raise ValueError(f"Unknown NOTIFICATION_SINK: {sink}")
+    return LogNotificationSink()
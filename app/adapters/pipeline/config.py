@@ -0,0 +1,23 @@
+import os
+
+from app.application.constants import CeleryConfig, EventStream
+
+# Режим обработки событий из outbox: task (задача Celery на пакет), batch
+# (ретранслятор обрабатывает пакеты сам) или stream (через Redis Stream и
+# воркер app.composites.stream_worker, без Celery)
+EVENT_PROCESSING_MODE = os.getenv(
+    'EVENT_PROCESSING_MODE',
+    CeleryConfig.PROCESSING_MODE_TASK,
+)
+EVENT_BATCH_SIZE = int(
+    os.getenv('EVENT_BATCH_SIZE', CeleryConfig.EVENT_BATCH_SIZE)
+)
+EVENT_RELAY_INTERVAL = float(
+    os.getenv('EVENT_RELAY_INTERVAL', CeleryConfig.EVENT_RELAY_INTERVAL)
+)
+
+# Записи, которые упавший потребитель не подтвердил за это время, забирает
+# другой потребитель группы
+EVENT_STREAM_CLAIM_MIN_IDLE_MS = int(
+    os.getenv('EVENT_STREAM_CLAIM_MIN_IDLE_MS', EventStream.CLAIM_MIN_IDLE_MS)
+)
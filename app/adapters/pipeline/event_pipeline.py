@@ -0,0 +1,267 @@
+"""
+Обработка событий из outbox, общая для воркеров Celery и Redis Streams
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from app.adapters.database.repositories import (
+    EventRepository,
+    AchievementRepository,
+    UserAchievementRepository,
+    UserScoreRepository,
+    AchievementNotificationRepository,
+    EventOutboxRepository,
+    ProcessedEventRepository,
+)
+from app.adapters.cache.redis_repository import RedisUserScoreRepository
+from app.application.utils import ScoreCalculator, LeaderboardPeriodHelper
+from app.application.entities import UserScore, AchievementNotification
+from app.application.services.achievement_catalog import (
+    AchievementCatalog,
+    achievement_catalog_cache,
+)
+from app.application.constants import (
+    CeleryConfig,
+    EventPartitioning,
+    Messages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Передает пакет ID событий на обработку и возвращает ID, которые нужно
+# отложить (вернуть в outbox с задержкой)
+Dispatch = Callable[[list[int]], Awaitable[list[int]]]
+
+
+class EventPipeline:
+    """Ретрансляция outbox и применение событий к счету и достижениям.
+
+    Не зависит от способа доставки: session_factory и Redis-клиент
+    передает процесс, в котором выполняется обработка.
+    """
+
+    def __init__(self, session_factory, redis_repo: RedisUserScoreRepository):
+        self.session_factory = session_factory
+        self.redis_repo = redis_repo
+
+    async def relay(
+        self,
+        dispatch: Dispatch,
+        batch_size: int,
+        max_batches: int = CeleryConfig.EVENT_RELAY_MAX_BATCHES,
+    ) -> int:
+        """Передает события из outbox через dispatch (at-least-once)."""
+        relayed = 0
+
+        for _ in range(max_batches):
+            # Строки outbox удаляются только вместе с успешной передачей
+            # пакета: при любой ошибке транзакция откатывается и пакет уйдет
+            # повторно
+            async with self.session_factory() as session:
+                outbox_repo = EventOutboxRepository(session)
+                event_ids = await outbox_repo.claim(batch_size)
+                if not event_ids:
+                    break
+
+                # События упавших пользователей вернутся в outbox с задержкой
+                dead_ids = await self._defer(
+                    outbox_repo, await dispatch(event_ids))
+                await session.commit()
+            self._log_dead(dead_ids)
+            relayed += len(event_ids)
+
+            if len(event_ids) < batch_size:
+                break
+
+        return relayed
+
+    async def defer(self, event_ids: list[int]) -> None:
+        """Возвращает необработанные события в outbox с задержкой.
+
+        Политика повторов одна для всех режимов: задержка растет
+        экспоненциально, а после EVENT_MAX_RETRIES неудачных попыток событие
+        остается в event_delivery_failures с отметкой dead_at.
+        """
+        if not event_ids:
+            return
+        async with self.session_factory() as session:
+            dead_ids = await self._defer(EventOutboxRepository(session), event_ids)
+            await session.commit()
+        self._log_dead(dead_ids)
+
+    @staticmethod
+    async def _defer(
+        outbox_repo: EventOutboxRepository,
+        event_ids: list[int],
+    ) -> list[int]:
+        return await outbox_repo.defer(
+            event_ids,
+            max_retries=CeleryConfig.EVENT_MAX_RETRIES,
+            retry_countdown=CeleryConfig.EVENT_RETRY_COUNTDOWN,
+        )
+
+    @staticmethod
+    def _log_dead(dead_ids: list[int]) -> None:
+        if dead_ids:
+            logger.error(
+                f"Events {dead_ids} failed {CeleryConfig.EVENT_MAX_RETRIES + 1} "
+                f"times, moved to dead letters (see requeue-dead-events)"
+            )
+
+    async def process(self, event_ids: list[int]) -> list[int]:
+        """Обрабатывает пакет событий, группируя их по пользователям.
+
+        Возвращает ID событий, которые нужно обработать повторно.
+        """
+        # Быстрый пропуск повторов по метке в Redis; источник истины - журнал
+        # processed_events, проверяемый в транзакции начисления
+        already_processed = await self.redis_repo.get_processed_events(event_ids)
+        if already_processed:
+            logger.info(
+                f"Skipping already processed events {sorted(already_processed)}"
+            )
+            event_ids = [i for i in event_ids if i not in already_processed]
+            if not event_ids:
+                return []
+
+        async with self.session_factory() as session:
+            # Обрабатываются в основном только что созданные события: сначала
+            # ищем в свежих партициях events
+            events = await EventRepository(session).get_by_ids(
+                event_ids,
+                created_after=datetime.now(timezone.utc) - timedelta(
+                    days=EventPartitioning.LOOKUP_WINDOW_DAYS
+                ),
+            )
+            catalog = await achievement_catalog_cache.get(
+                AchievementRepository(session), self.redis_repo
+            )
+
+        found_ids = {event.id for event in events}
+        for event_id in event_ids:
+            if event_id not in found_ids:
+                logger.warning(f"Event {event_id} not found")
+
+        events_by_user = defaultdict(list)
+        for event in events:
+            events_by_user[event.user_id].append(event)
+
+        deferred_ids = []
+        for user_id, user_events in events_by_user.items():
+            user_event_ids = [event.id for event in user_events]
+
+            try:
+                user_score, new_achievements, user_events = (
+                    await self._apply_user_events(user_id, user_events, catalog)
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error processing events {user_event_ids} "
+                    f"of user {user_id}: {e}",
+                    exc_info=True,
+                )
+                deferred_ids.extend(user_event_ids)
+                continue
+
+            if not user_events:
+                logger.info(
+                    f"Events {user_event_ids} of user {user_id} already applied"
+                )
+                await self.redis_repo.mark_events_processed(user_event_ids)
+                continue
+
+            # После коммита ошибки кеша не должны приводить к повторному
+            # начислению
+            try:
+                await self.redis_repo.mark_events_processed(
+                    [event.id for event in user_events]
+                )
+                total_score = ScoreCalculator.calculate_total_score(user_score)
+                # Счет и закешированный /stats обновляются одним вызовом Lua
+                await self.redis_repo.update_user_progress(
+                    user_id,
+                    total_score,
+                    new_achievements,
+                    user_events,
+                    LeaderboardPeriodHelper.get_period_increments(user_events),
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Post-commit side effects failed for user {user_id}: {e}"
+                )
+
+            logger.info(
+                f"Applied {len(user_events)} events for user {user_id}, "
+                f"new achievements: {new_achievements}"
+            )
+
+        return deferred_ids
+
+    async def _apply_user_events(
+        self,
+        user_id: int,
+        events: list,
+        catalog: AchievementCatalog,
+    ) -> tuple[UserScore | None, list[str], list]:
+        """Применяет все события пользователя одним UPDATE и одним коммитом.
+
+        Возвращает счет, новые достижения и события, примененные этим вызовом:
+        уже примененные ранее события пропускаются.
+        """
+        async with self.session_factory() as session:
+            score_repo = UserScoreRepository(session)
+            user_achievement_repo = UserAchievementRepository(session)
+
+            # Журнал пишется в той же транзакции, что и счетчики: событие либо
+            # применено вместе с записью в журнал, либо не применено вовсе
+            applied_ids = await ProcessedEventRepository(session).mark_processed(
+                [event.id for event in events]
+            )
+            events = [event for event in events if event.id in applied_ids]
+            if not events:
+                return None, [], []
+
+            deltas = ScoreCalculator.get_counter_deltas(
+                event.event_type for event in events
+            )
+
+            # Атомарный upsert блокирует строку user_scores до коммита, поэтому
+            # транзакции одного пользователя сериализуются без Redis-блокировки,
+            # а достижения ниже читаются уже после коммита конкурирующей
+            # транзакции
+            user_score = await score_repo.increment_counters(user_id, deltas)
+
+            # Проверяем только достижения, пороги которых пересек этот пакет
+            new_counters = ScoreCalculator.get_counters(user_score)
+            old_counters = {
+                field: value - deltas.get(field, 0)
+                for field, value in new_counters.items()
+            }
+            candidates = catalog.rules.newly_satisfied(old_counters, new_counters)
+
+            # Одним INSERT ... ON CONFLICT DO NOTHING: уже полученные
+            # достижения отсекает уникальный индекс, а не предварительное чтение
+            awarded_ids = await user_achievement_repo.create_missing(
+                user_id, [ach.id for ach in candidates]
+            )
+            awarded = [ach for ach in candidates if ach.id in awarded_ids]
+
+            # Уведомления сохраняются вместе с достижениями и доставляются
+            # пакетами задачей deliver_achievement_notifications
+            await AchievementNotificationRepository(session).create_many([
+                AchievementNotification(
+                    user_id=user_id,
+                    achievement_id=ach.id,
+                    message=Messages.ACHIEVEMENT_UNLOCKED.format(
+                        achievement_name=ach.name),
+                )
+                for ach in awarded
+            ])
+
+            # Журнал, счетчики, достижения и уведомления фиксируются одной
+            # транзакцией
+            await session.commit()
+
+        return user_score, [ach.name for ach in awarded], events
@@ -22,7 +22,35 @@ class CacheSettings:
 
     STATS_KEY_PREFIX = "user:"
     STATS_KEY_SUFFIX = ":stats"
-    STATS_TTL = 60  # 1 минута
+    # Воркер обновляет документ /stats на месте, поэтому его можно держать дольше
+    STATS_TTL = 600  # 10 минут
+    STATS_GENERATION_SUFFIX = ":stats:gen"  # Счетчик обновлений документа
+    STATS_LOCK_SUFFIX = ":stats:lock"  # Блокировка перестроения документа
+    STATS_LOCK_TTL_MS = 5000
+    STATS_REBUILD_WAIT = 1.0  # Сколько ждать чужого перестроения, секунд
+    STATS_REBUILD_POLL_INTERVAL = 0.05  # секунд
+
+    ACHIEVEMENT_CATALOG_VERSION_KEY = "achievements:catalog:version"
+    ACHIEVEMENT_CATALOG_TTL = 300  # 5 минут
+    ACHIEVEMENT_CATALOG_VERSION_CHECK_INTERVAL = 5  # секунд
+
+    # Метка примененного события: быстрый пропуск повторов до похода в БД
+    PROCESSED_EVENT_KEY_PREFIX = "event:processed:"
+    PROCESSED_EVENT_TTL = 24 * 3600  # 1 день
+
+    LEADERBOARD_KEY = "leaderboard:global"  # ZSET: user_id -> общий счет
+    # Перестроение идет во временный ключ, который затем заменяет основной
+    LEADERBOARD_REBUILD_KEY = "leaderboard:global:rebuild"
+    # Флаг идущего перестроения: воркер пишет счет и во временный ключ
+    LEADERBOARD_REBUILD_FLAG_KEY = "leaderboard:global:rebuilding"
+    LEADERBOARD_REBUILD_FLAG_TTL = 3600  # 1 час
+    # Лидерборды периодов: leaderboard:day:2026-10-18, leaderboard:week:2026-W42,
+    # leaderboard:season:2026-Q4. Ключ истекает через заданное время после
+    # окончания периода, поэтому прошлый период еще можно посмотреть
+    LEADERBOARD_PERIOD_KEY_PREFIX = "leaderboard:"
+    LEADERBOARD_DAY_RETENTION = 7 * 24 * 3600  # 7 дней
+    LEADERBOARD_WEEK_RETENTION = 4 * 7 * 24 * 3600  # 4 недели
+    LEADERBOARD_SEASON_RETENTION = 92 * 24 * 3600  # один сезон
 
     @staticmethod
     def get_score_key(user_id: int) -> str:
@@ -40,6 +68,18 @@ class CacheSettings:
     def get_stats_key(user_id: int) -> str:
         return f"{CacheSettings.STATS_KEY_PREFIX}{user_id}{CacheSettings.STATS_KEY_SUFFIX}"
 
+    @staticmethod
+    def get_stats_generation_key(user_id: int) -> str:
+        return f"{CacheSettings.STATS_KEY_PREFIX}{user_id}{CacheSettings.STATS_GENERATION_SUFFIX}"
+
+    @staticmethod
+    def get_processed_event_key(event_id: int) -> str:
+        return f"{CacheSettings.PROCESSED_EVENT_KEY_PREFIX}{event_id}"
+
+    @staticmethod
+    def get_stats_lock_key(user_id: int) -> str:
+        return f"{CacheSettings.STATS_KEY_PREFIX}{user_id}{CacheSettings.STATS_LOCK_SUFFIX}"
+
 
 # Лимиты системы
 class Limits:
@@ -52,6 +92,20 @@ class Limits:
     ACHIEVEMENT_TYPE_MAX_LENGTH = 50  # Максимальная длина типа достижения
     ACHIEVEMENT_NAME_MAX_LENGTH = 100  # Максимальная длина названия достижения
     EVENT_TYPE_MAX_LENGTH = 50  # Максимальная длина типа события
+    EVENT_BATCH_MAX_SIZE = 500  # Максимальное количество событий в пакете
+    IDEMPOTENCY_KEY_MAX_LENGTH = 100  # Максимальная длина ключа идемпотентности
+    LEADERBOARD_DEFAULT_LIMIT = 10  # Размер страницы лидерборда по умолчанию
+    LEADERBOARD_MAX_LIMIT = 100  # Максимальный размер страницы лидерборда
+    LEADERBOARD_NEIGHBOURS = 5  # Соседей сверху и снизу от позиции игрока
+    LEADERBOARD_REBUILD_CHUNK_SIZE = 5000  # Строк user_scores за один запрос
+    USERS_PAGE_DEFAULT_LIMIT = 100  # Размер страницы списка пользователей
+    USERS_PAGE_MAX_LIMIT = 1000  # Максимальный размер страницы пользователей
+    USERS_STREAM_CHUNK_SIZE = 1000  # Строк курсора за одну выборку при выгрузке
+    EVENT_HISTORY_DEFAULT_LIMIT = 50  # Размер страницы истории событий
+    EVENT_HISTORY_MAX_LIMIT = 500  # Максимальный размер страницы истории
+    EXPORT_STREAM_BUFFER_CHUNKS = 16  # Порций COPY в очереди к HTTP-клиенту
+    IMPORT_READ_CHUNK_SIZE = 1024 * 1024  # Байт файла загрузки за одно чтение
+    IMPORT_CACHE_CHUNK_SIZE = 1000  # Счетов в Redis за один конвейер
 
 
 # Поля базы данных
@@ -62,11 +116,36 @@ class DatabaseFields:
     SECRETS_FOUND = "secrets_found"
     LEVEL_ID = "level_id"
 
+    # Счетчики таблицы user_scores
+    COUNTERS = (LOGIN_COUNT, LEVELS_COMPLETED, SECRETS_FOUND)
+
 
 # Конфигурация Redis
 class RedisConfig:
     """Настройки Redis"""
     DEFAULT_URL = "redis://localhost:6379/0"
+    MAX_CONNECTIONS = 50  # Размер общего пула соединений процесса
+    POOL_TIMEOUT = 5  # Ожидание свободного соединения из пула, сек
+    SOCKET_TIMEOUT = 5.0  # Таймаут операции на сокете, сек
+    SOCKET_CONNECT_TIMEOUT = 5.0  # Таймаут установки соединения, сек
+    HEALTH_CHECK_INTERVAL = 30  # PING простаивающего соединения перед выдачей, сек
+
+
+# Секционирование таблицы событий
+class EventPartitioning:
+    """Настройки помесячного секционирования events"""
+    PARTITION_PREFIX = "events_p"  # events_p202610 - события октября 2026
+    DEFAULT_PARTITION = "events_default"  # События месяцев без своей партиции
+    PARTITIONS_AHEAD = 3  # Сколько месяцев вперед держать готовые партиции
+    RETENTION_MONTHS = 0  # Сколько месяцев хранить в events, 0 - без ограничения
+    ARCHIVE_ENABLED = True  # Переносить старые партиции в архив, а не удалять
+    ARCHIVE_SCHEMA = "archive"
+    ARCHIVE_RETENTION_MONTHS = 0  # Сколько хранить архив, 0 - без ограничения
+    MAINTENANCE_INTERVAL = 6 * 3600  # Период задачи обслуживания, секунд
+    LOCK_TIMEOUT = "5s"  # Не ждать блокировку events дольше, повторить позже
+    # События почти всегда ищутся вскоре после создания: сначала смотрим только
+    # свежие партиции
+    LOOKUP_WINDOW_DAYS = 7
 
 
 # Конфигурация Celery
@@ -74,9 +153,87 @@ class CeleryConfig:
     """Настройки Celery"""
     RESULT_EXPIRES = 3600  # Время жизни результата в секундах
 
+    # Результат задач обработки событий никто не читает: не пишем его в Redis
+    IGNORE_RESULT = True
+    TASK_SERIALIZER = "msgpack"  # Компактнее json для списков ID событий
+    # json принимается, чтобы дочитать сообщения, поставленные до перехода
+    ACCEPT_CONTENT = ["msgpack", "json"]
+    PREFETCH_MULTIPLIER = 4  # Сообщений, резервируемых процессом воркера
+    # Подтверждение после выполнения: задача упавшего воркера будет выдана
+    # повторно, что безопасно благодаря журналу processed_events
+    ACKS_LATE = True
+
+    # Сколько корутин задач одновременно выполняется в общем event loop
+    # воркера с пулом потоков (-P threads); под это число подобран пул БД
+    ASYNC_CONCURRENCY = 20
+
+    # Режимы обработки событий из outbox
+    PROCESSING_MODE_TASK = "task"  # Задача Celery на каждый пакет из outbox
+    PROCESSING_MODE_BATCH = "batch"  # Ретранслятор сам обрабатывает пакеты
+    PROCESSING_MODE_STREAM = "stream"  # Redis Stream и воркер без Celery
+
+    EVENT_BATCH_SIZE = 500  # Событий, забираемых из outbox за раз
+    EVENT_RELAY_INTERVAL = 1.0  # Период запуска ретранслятора outbox в секундах
+    EVENT_RELAY_MAX_BATCHES = 20  # Пакетов за один запуск ретранслятора
+
+    # Повтор событий безопасен (журнал processed_events), поэтому ретраи
+    # частые: 5, 10, 20, 40, 80 секунд. Во всех режимах необработанное
+    # событие возвращается в outbox с этой задержкой, а после
+    # EVENT_MAX_RETRIES повторов остается в event_delivery_failures
+    EVENT_RETRY_COUNTDOWN = 5
+    EVENT_MAX_RETRIES = 5
+
+    # Сколько хранить ключи идемпотентности и журнал примененных событий
+    IDEMPOTENCY_RETENTION_DAYS = 30
+    IDEMPOTENCY_PURGE_INTERVAL = 24 * 3600  # Период очистки, секунд
+
+
+# Обработка событий через Redis Streams
+class EventStream:
+    """Настройки режима stream (группа потребителей Redis Stream)"""
+    STREAM_KEY = "events:stream"  # Записи {event_id} из outbox
+    GROUP = "event-processors"
+    READ_BLOCK_MS = 1000  # Ожидание новых записей в XREADGROUP
+    CLAIM_MIN_IDLE_MS = 60 * 1000  # Простой записи до передачи другому потребителю
+    CLAIM_INTERVAL = 15.0  # Период проверки зависших записей, секунд
+
+
+# Доставка уведомлений о достижениях
+class NotificationDelivery:
+    """Настройки пакетной доставки уведомлений"""
+    SINK_LOG = "log"  # Запись в лог воркера
+    SINK_WEBHOOK = "webhook"  # POST пакета в JSON на NOTIFICATION_WEBHOOK_URL
+    BATCH_SIZE = 500  # Уведомлений за одну отправку
+    MAX_BATCHES = 20  # Пакетов за один запуск задачи доставки
+    INTERVAL = 5.0  # Период задачи доставки, секунд
+    WEBHOOK_TIMEOUT = 5.0  # Таймаут запроса к вебхуку, секунд
+    # Повтор через 30 с, 1, 2, 4... минуты; после MAX_ATTEMPTS попыток
+    # уведомление остается неотправленным с текстом последней ошибки
+    RETRY_DELAY = 30
+    MAX_ATTEMPTS = 8
+
+
+# Сверка счетов пользователей с таблицей событий
+class ScoreReconciliation:
+    """Настройки сверки user_scores с events"""
+    CHUNK_SIZE = 1000  # Диапазон user_id одной задачи
+    MAX_CHUNK_SIZE = 5000  # Строк в одном INSERT исправлений
+    KEY_PREFIX = "reconcile:"  # Хеш прогресса запуска reconcile:{run_id}
+    DONE_SUFFIX = ":done"  # Множество начал завершенных диапазонов
+    PROGRESS_TTL = 7 * 24 * 3600  # Сколько хранить прогресс, секунд
+
+    @staticmethod
+    def get_progress_key(run_id: str) -> str:
+        return f"{ScoreReconciliation.KEY_PREFIX}{run_id}"
+
+    @staticmethod
+    def get_done_key(run_id: str) -> str:
+        return f"{ScoreReconciliation.KEY_PREFIX}{run_id}{ScoreReconciliation.DONE_SUFFIX}"
+
 
 # Сообщения
 class Messages:
     """Константы сообщений"""
     EVENT_PROCESSING_SUCCESS = "Event {event_id} processed: +{points} points (total: {total_score})"
-    EVENT_PROCESSING_ERROR = "Error processing event {event_id}: {error}"
\ No newline at end of file
+    EVENT_PROCESSING_ERROR = "Error processing event {event_id}: {error}"
+    ACHIEVEMENT_UNLOCKED = "Achievement unlocked: {achievement_name}"
\ No newline at end of file
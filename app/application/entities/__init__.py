@@ -1,4 +1,10 @@
-from .enums import EventType, AchievementType
+from .enums import (
+    EventType,
+    AchievementType,
+    LeaderboardPeriod,
+    ExportDataset,
+    ExportFormat,
+)
 from .user import User
 from .event import Event
 from .user_score import UserScore
@@ -9,6 +15,9 @@ from .achievement_notification import AchievementNotification
 __all__ = [
     "EventType",
     "AchievementType",
+    "LeaderboardPeriod",
+    "ExportDataset",
+    "ExportFormat",
     "User",
     "Event",
     "UserScore",
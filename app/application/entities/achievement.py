@@ -12,5 +12,8 @@ class Achievement:
     points: int  # Количество очков за достижение
     condition_field: str  # Поле для проверки (login_count, levels_completed)
     condition_value: int  # Значение для достижения
+    # Составное условие {"all"|"any": [...]} из листьев
+    # {"field": ..., "value": ...}; если задано, заменяет condition_field/value
+    conditions: dict | None = None
     id: int | None = None
     created_at: datetime | None = None 
\ No newline at end of file
@@ -11,4 +11,7 @@ class AchievementNotification:
     is_sent: bool = False
     id: int | None = None
     created_at: datetime | None = None
-    sent_at: datetime | None = None 
\ No newline at end of file
+    sent_at: datetime | None = None
+    attempts: int = 0
+    next_attempt_at: datetime | None = None
+    last_error: str | None = None
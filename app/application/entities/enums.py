@@ -12,4 +12,25 @@ class AchievementType(str, Enum):
     """Типы достижений"""
     NEWCOMER = "newcomer"  # 1+ вход
     EXPLORER = "explorer"  # 3+ найденных секрета
-    MASTER = "master"  # 10+ завершенных уровней 
\ No newline at end of file
+    MASTER = "master"  # 10+ завершенных уровней
+
+
+class LeaderboardPeriod(str, Enum):
+    """Периоды лидерборда"""
+    GLOBAL = "global"  # За все время
+    DAY = "day"  # Текущие сутки (UTC)
+    WEEK = "week"  # Текущая ISO-неделя
+    SEASON = "season"  # Текущий сезон (квартал)
+
+
+class ExportDataset(str, Enum):
+    """Таблицы, доступные для выгрузки"""
+    EVENTS = "events"
+    USER_SCORES = "user_scores"
+    USER_ACHIEVEMENTS = "user_achievements"
+
+
+class ExportFormat(str, Enum):
+    """Форматы выгрузки"""
+    CSV = "csv"  # С заголовком
+    NDJSON = "ndjson"  # JSON-объект на строку
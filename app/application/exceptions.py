@@ -31,6 +31,12 @@ class UserNotFoundError(AppError):
 	code = 'user_service.user_not_found'
 
 
+class UsersNotFoundError(AppError):
+	"""Исключение для случая когда часть пользователей пакета не найдена"""
+	msg_template = 'Пользователи с ID {user_ids} не найдены'
+	code = 'user_service.users_not_found'
+
+
 class UserScoreNotFoundError(AppError):
 	"""Исключение для случая когда счет пользователя не найден"""
 	msg_template = 'Счет для пользователя {user_id} не найден'
@@ -56,6 +62,12 @@ class InvalidEventDataError(AppError):
 	code = 'event_service.invalid_event_data'
 
 
+class InvalidCursorError(AppError):
+	"""Исключение для некорректного курсора страницы"""
+	msg_template = 'Некорректный курсор: {cursor}'
+	code = 'event_service.invalid_cursor'
+
+
 class EventServiceError(AppError):
 	"""Базовое исключение для сервиса событий"""
 	msg_template = 'Ошибка сервиса событий: {error}'
@@ -76,6 +88,26 @@ class StatsServiceError(AppError):
 	code = 'stats_service.error'
 
 
+# Исключения для лидерборда
+class UserNotRankedError(AppError):
+	"""Исключение для случая когда пользователя нет в лидерборде"""
+	msg_template = 'Пользователь с ID {user_id} отсутствует в лидерборде'
+	code = 'leaderboard_service.user_not_ranked'
+
+
+class LeaderboardServiceError(AppError):
+	"""Базовое исключение для сервиса лидерборда"""
+	msg_template = 'Ошибка сервиса лидерборда: {error}'
+	code = 'leaderboard_service.error'
+
+
+# Исключения для административных операций
+class AdminAccessDeniedError(AppError):
+	"""Исключение для запроса без действующего административного токена"""
+	msg_template = 'Доступ запрещен: требуется токен администратора'
+	code = 'admin.access_denied'
+
+
 # Исключения для валидации
 class ValidationError(AppError):
 	"""Базовое исключение для ошибок валидации"""
@@ -4,6 +4,14 @@ from .user_score_interface import IUserScoreRepository
 from .achievement_interface import IAchievementRepository
 from .user_achievement_interface import IUserAchievementRepository
 from .achievement_notification_interface import IAchievementNotificationRepository
+from .user_stats_interface import IUserStatsRepository
+from .event_partition_interface import IEventPartitionRepository
+from .event_outbox_interface import IEventOutboxRepository
+from .processed_event_interface import IProcessedEventRepository
+from .notification_sink_interface import INotificationSink
+from .data_export_interface import IDataExportRepository
+from .event_import_interface import IEventImportRepository
+from .score_reconciliation_interface import IScoreReconciliationRepository
 
 __all__ = [
     "IUserRepository",
@@ -11,5 +19,13 @@ __all__ = [
     "IUserScoreRepository", 
     "IAchievementRepository",
     "IUserAchievementRepository",
-    "IAchievementNotificationRepository"
+    "IAchievementNotificationRepository",
+    "IUserStatsRepository",
+    "IEventPartitionRepository",
+    "IEventOutboxRepository",
+    "IProcessedEventRepository",
+    "INotificationSink",
+    "IDataExportRepository",
+    "IEventImportRepository",
+    "IScoreReconciliationRepository",
 ] 
\ No newline at end of file
@@ -13,5 +13,32 @@ class IAchievementNotificationRepository(ABC):
         pass
 
     @abstractmethod
-    async def mark_as_sent(self, notification_id: int) -> None:
-        pass 
\ No newline at end of file
+    async def create_many(
+        self,
+        notifications: list[AchievementNotification],
+    ) -> None:
+        """Добавить уведомления в текущую транзакцию без коммита"""
+        pass
+
+    @abstractmethod
+    async def claim_pending(self, limit: int) -> list[AchievementNotification]:
+        """Заблокировать до конца транзакции уведомления, готовые к доставке"""
+        pass
+
+    @abstractmethod
+    async def mark_as_sent(self, notification_ids: list[int]) -> None:
+        pass
+
+    @abstractmethod
+    async def schedule_retry(
+        self,
+        notification_ids: list[int],
+        error: str,
+        retry_delay: int,
+        max_attempts: int,
+    ) -> None:
+        """Отложить доставку на retry_delay * 2^попыток секунд.
+
+        После max_attempts попыток уведомление больше не доставляется.
+        """
+        pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from app.application.entities import ExportDataset, ExportFormat
+
+
+class IDataExportRepository(ABC):
+    """Абстрактный репозиторий массовой выгрузки таблиц"""
+
+    @abstractmethod
+    async def copy_out(
+        self,
+        dataset: ExportDataset,
+        export_format: ExportFormat,
+        output: Callable[[bytes], Awaitable[None]],
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> int:
+        """Передать строки таблицы в output порциями байт по мере чтения.
+
+        created_from включительно, created_to - нет. Возвращает число строк.
+        """
+        pass
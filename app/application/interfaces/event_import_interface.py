@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import AsyncIterable, Mapping
+
+from app.application.entities import ExportFormat, UserScore
+from app.application.services.achievement_rules import AchievementRule
+
+
+class IEventImportRepository(ABC):
+    """Абстрактный репозиторий массовой загрузки событий"""
+
+    @abstractmethod
+    async def create_staging(self) -> str:
+        """Создать промежуточную таблицу загрузки и вернуть ее имя."""
+        pass
+
+    @abstractmethod
+    async def copy_in(
+        self,
+        staging: str,
+        import_format: ExportFormat,
+        source: AsyncIterable[bytes],
+    ) -> int:
+        """Загрузить строки из source в промежуточную таблицу.
+
+        CSV читается с заголовком, колонки берутся из него. Возвращает число
+        загруженных строк.
+        """
+        pass
+
+    @abstractmethod
+    async def get_staged_months(self, staging: str) -> list[date]:
+        """Первые дни месяцев, в которые попадают загруженные события."""
+        pass
+
+    @abstractmethod
+    async def apply_staged(
+        self,
+        staging: str,
+        rules: Mapping[int, AchievementRule],
+    ) -> dict:
+        """Перенести события в events одной транзакцией.
+
+        События отмечаются обработанными, счетчики user_scores увеличиваются
+        на число событий каждого типа, а достижения, правила которых
+        выполняются после этого, начисляются. Возвращает число событий,
+        пользователей и начисленных достижений.
+        """
+        pass
+
+    @abstractmethod
+    async def get_scores_chunk(
+        self,
+        staging: str,
+        after_user_id: int,
+        limit: int,
+    ) -> list[UserScore]:
+        """Счета пользователей из загрузки, по возрастанию user_id."""
+        pass
+
+    @abstractmethod
+    async def drop_staging(self, staging: str) -> None:
+        """Удалить промежуточные таблицы загрузки."""
+        pass
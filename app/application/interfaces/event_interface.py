@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from app.application.entities import Event
 from app.application.constants import Limits
 
@@ -7,7 +8,22 @@ class IEventRepository(ABC):
     """Абстрактный репозиторий событий"""
     
     @abstractmethod
-    async def create(self, event: Event) -> Event:
+    async def create(
+        self,
+        event: Event,
+        idempotency_key: str | None = None,
+    ) -> Event:
+        """С ключом, уже использованным этим пользователем, возвращает ранее
+        созданное событие вместо нового"""
+        pass
+    
+    @abstractmethod
+    async def create_many(
+        self,
+        events: list[Event],
+        idempotency_keys: list[str | None] | None = None,
+    ) -> list[Event]:
+        """idempotency_keys - ключи событий в том же порядке, что и events"""
         pass
     
     @abstractmethod
@@ -15,7 +31,27 @@ class IEventRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_user_id(self, user_id: int) -> list[Event]:
+    async def get_by_ids(
+        self,
+        event_ids: list[int],
+        created_after: datetime | None = None,
+    ) -> list[Event]:
+        """created_after - подсказка для отсечения партиций: события старше
+        нее тоже находятся, но отдельным запросом"""
+        pass
+    
+    @abstractmethod
+    async def get_history(
+        self,
+        user_id: int,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+        event_types: list[str] | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Event]:
+        """События пользователя по убыванию (created_at, id), строго раньше
+        позиции before; created_from включительно, created_to - нет"""
         pass
     
     @abstractmethod
@@ -23,5 +59,10 @@ class IEventRepository(ABC):
         self,
         user_id: int,
         limit: int = Limits.RECENT_EVENTS_LIMIT,
+        created_after: datetime | None = None,
     ) -> list[Event]:
         pass
+
+    @abstractmethod
+    async def purge_idempotency_keys(self, before: datetime) -> int:
+        pass
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class IEventOutboxRepository(ABC):
+	"""Абстрактный репозиторий outbox событий"""
+
+	@abstractmethod
+	async def claim(self, limit: int) -> list[int]:
+		"""Забирает до limit событий из outbox, время которых подошло.
+
+		Строки удаляются в текущей транзакции: если она откатится, события
+		останутся в outbox и будут переданы повторно.
+		"""
+		pass
+
+	@abstractmethod
+	async def defer(
+		self,
+		event_ids: list[int],
+		max_retries: int,
+		retry_countdown: int,
+	) -> list[int]:
+		"""Учитывает неудачную попытку и возвращает события в outbox.
+
+		Событие ретранслируется через retry_countdown * 2 ** (попытка - 1)
+		секунд; после max_retries повторов оно помечается мертвым и в outbox
+		не возвращается. Возвращает ID мертвых событий.
+		"""
+		pass
+
+	@abstractmethod
+	async def requeue_dead(self) -> list[int]:
+		"""Возвращает мертвые события в outbox со сброшенным счетчиком"""
+		pass
+
+	@abstractmethod
+	async def purge_failures(self, before: datetime) -> int:
+		"""Удаляет счетчики попыток живых событий, не падавших с before"""
+		pass
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+
+class IEventPartitionRepository(ABC):
+	"""Абстрактный репозиторий партиций таблицы событий"""
+
+	@abstractmethod
+	async def list_partitions(self) -> list[str]:
+		"""Имена партиций, присоединенных к events"""
+		pass
+
+	@abstractmethod
+	async def list_archived(self, schema: str) -> list[str]:
+		"""Имена отсоединенных партиций в схеме архива"""
+		pass
+
+	@abstractmethod
+	async def list_default_months(self) -> list[date]:
+		"""Месяцы событий, лежащих в партиции по умолчанию"""
+		pass
+
+	@abstractmethod
+	async def create_partition(self, name: str, start: date, end: date) -> None:
+		"""Создать партицию [start, end), перенеся в нее события этого
+		периода из партиции по умолчанию"""
+		pass
+
+	@abstractmethod
+	async def detach_partition(self, name: str) -> None:
+		pass
+
+	@abstractmethod
+	async def archive_partition(self, name: str, schema: str) -> None:
+		pass
+
+	@abstractmethod
+	async def drop_partition(self, name: str, schema: str | None = None) -> None:
+		pass
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from ..entities import AchievementNotification
+
+
+class INotificationSink(ABC):
+    """Абстрактный получатель уведомлений о достижениях"""
+
+    @abstractmethod
+    async def send(self, notifications: list[AchievementNotification]) -> None:
+        """Доставить пакет целиком; при ошибке поднять исключение"""
+        pass
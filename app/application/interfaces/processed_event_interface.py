@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class IProcessedEventRepository(ABC):
+	"""Абстрактный журнал примененных событий"""
+
+	@abstractmethod
+	async def mark_processed(self, event_ids: list[int]) -> set[int]:
+		"""Отмечает события примененными в текущей транзакции.
+
+		Возвращает ID событий, которые еще не были применены.
+		"""
+		pass
+
+	@abstractmethod
+	async def get_processed(self, event_ids: list[int]) -> set[int]:
+		"""ID событий из event_ids, уже записанных в журнал"""
+		pass
+
+	@abstractmethod
+	async def purge(self, before: datetime) -> int:
+		pass
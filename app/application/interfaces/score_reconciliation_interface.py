@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Mapping
+
+from app.application.entities import UserScore
+from app.application.services.achievement_rules import AchievementRule
+
+
+class IScoreReconciliationRepository(ABC):
+    """Абстрактный репозиторий сверки счетов с таблицей событий"""
+
+    @abstractmethod
+    async def get_max_user_id(self) -> int:
+        """Наибольший ID пользователя, 0 если пользователей нет."""
+        pass
+
+    @abstractmethod
+    async def reconcile_range(
+        self,
+        start_user_id: int,
+        end_user_id: int,
+        settled_before: datetime,
+        rules: Mapping[int, AchievementRule],
+    ) -> tuple[int, list[UserScore], int]:
+        """Пересчитать счетчики пользователей из [start_user_id, end_user_id).
+
+        События до settled_before считаются примененными, более новые - только
+        если они есть в журнале processed_events. Расхождения исправляются,
+        недостающие достижения начисляются одной транзакцией. Возвращает
+        число проверенных пользователей, исправленные счета и число
+        начисленных достижений.
+        """
+        pass
@@ -15,3 +15,15 @@ class IUserAchievementRepository(ABC):
 	@abstractmethod
 	async def get_by_user_id(self, user_id: int) -> list[UserAchievement]:
 		pass
+
+	@abstractmethod
+	async def create_missing(
+		self,
+		user_id: int,
+		achievement_ids: list[int],
+	) -> set[int]:
+		"""Начисляет достижения, которых у пользователя еще нет.
+
+		Возвращает ID действительно начисленных достижений.
+		"""
+		pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from app.application.entities import User
 
 
@@ -10,9 +11,27 @@ class IUserRepository(ABC):
 		pass
 
 	@abstractmethod
-	async def get_all(self) -> list[User]:
+	async def get_page(self, after_id: int, limit: int) -> list[User]:
+		"""Пользователи с id > after_id по возрастанию id"""
+		pass
+
+	@abstractmethod
+	def iterate_chunks(
+		self,
+		after_id: int,
+		chunk_size: int,
+	) -> AsyncIterator[list[User]]:
+		"""Все пользователи с id > after_id порциями через курсор на сервере"""
 		pass
 
 	@abstractmethod
 	async def get_by_id(self, user_id: int) -> User | None:
 		pass
+
+	@abstractmethod
+	async def get_existing_ids(self, user_ids: set[int]) -> set[int]:
+		pass
+
+	@abstractmethod
+	async def get_usernames(self, user_ids: set[int]) -> dict[int, str]:
+		pass
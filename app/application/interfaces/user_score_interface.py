@@ -17,3 +17,20 @@ class IUserScoreRepository(ABC):
 	@abstractmethod
 	async def create(self, user_score: UserScore) -> UserScore:
 		pass
+
+	@abstractmethod
+	async def increment_counters(
+		self,
+		user_id: int,
+		deltas: dict[str, int],
+	) -> UserScore:
+		pass
+
+	@abstractmethod
+	async def get_chunk_after(
+		self,
+		after_user_id: int,
+		limit: int,
+	) -> list[UserScore]:
+		"""Следующая порция счетов по возрастанию user_id (keyset-пагинация)"""
+		pass
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+from app.application.constants import Limits
+
+
+class IUserStatsRepository(ABC):
+	"""Абстрактный репозиторий чтения статистики пользователя"""
+
+	@abstractmethod
+	async def get_snapshot(
+		self,
+		user_id: int,
+		events_limit: int = Limits.RECENT_EVENTS_LIMIT,
+	) -> dict | None:
+		pass
@@ -0,0 +1,124 @@
+"""
+Процессный кеш каталога достижений с версионной инвалидацией через Redis
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+from app.application.entities import Achievement
+from app.application.interfaces import IAchievementRepository
+from app.application.constants import CacheSettings
+from app.application.services.achievement_rules import AchievementRuleEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AchievementCatalog:
+	"""Неизменяемый снимок каталога достижений"""
+	achievements: tuple[Achievement, ...] = ()
+	version: str | None = None
+	by_id: Mapping[int, Achievement] = field(
+		default_factory=lambda: MappingProxyType({}))
+	by_field: Mapping[str, tuple[Achievement, ...]] = field(
+		default_factory=lambda: MappingProxyType({}))
+	rules: AchievementRuleEngine = field(
+		default_factory=lambda: AchievementRuleEngine(()))
+
+	@classmethod
+	def build(
+		cls,
+		achievements: list[Achievement],
+		version: str | None = None,
+	) -> "AchievementCatalog":
+		"""Строит снимок, индексы по id и condition_field и движок правил"""
+		by_field: dict[str, list[Achievement]] = {}
+		for achievement in achievements:
+			by_field.setdefault(achievement.condition_field, []).append(
+				achievement)
+
+		return cls(
+			achievements=tuple(achievements),
+			version=version,
+			by_id=MappingProxyType({a.id: a for a in achievements}),
+			by_field=MappingProxyType({
+				name: tuple(sorted(items, key=lambda a: a.condition_value))
+				for name, items in by_field.items()
+			}),
+			rules=AchievementRuleEngine(achievements),
+		)
+
+	def get(self, achievement_id: int) -> Achievement | None:
+		return self.by_id.get(achievement_id)
+
+
+class AchievementCatalogCache:
+	"""Загружает каталог один раз и обновляет его по версии в Redis или TTL"""
+
+	def __init__(
+		self,
+		ttl: float = CacheSettings.ACHIEVEMENT_CATALOG_TTL,
+		version_check_interval: float = (
+			CacheSettings.ACHIEVEMENT_CATALOG_VERSION_CHECK_INTERVAL),
+	):
+		self.ttl = ttl
+		self.version_check_interval = version_check_interval
+		self._catalog: AchievementCatalog | None = None
+		self._loaded_at = 0.0
+		self._checked_at = 0.0
+		self._lock = asyncio.Lock()
+
+	async def get(
+		self,
+		achievement_repo: IAchievementRepository,
+		redis_cache=None,
+	) -> AchievementCatalog:
+		"""Вернуть актуальный каталог, при необходимости перезагрузив его"""
+		now = time.monotonic()
+		catalog = self._catalog
+		if catalog is not None and (
+			now - self._checked_at < self.version_check_interval
+		):
+			return catalog
+
+		version = await self._get_version(redis_cache)
+		if (
+			catalog is not None
+			and version == catalog.version
+			and now - self._loaded_at < self.ttl
+		):
+			self._checked_at = now
+			return catalog
+
+		async with self._lock:
+			# Каталог мог обновить конкурирующий вызов, пока мы ждали
+			if self._catalog is not catalog:
+				return self._catalog
+
+			achievements = await achievement_repo.get_all()
+			self._catalog = AchievementCatalog.build(achievements, version)
+			self._loaded_at = self._checked_at = time.monotonic()
+			logger.info(
+				f"Achievement catalog loaded: {len(achievements)} achievements, "
+				f"version={version}"
+			)
+			return self._catalog
+
+	async def invalidate(self, redis_cache=None) -> None:
+		"""Сбросить каталог во всех процессах (локально и через версию в Redis)"""
+		self._catalog = None
+		if redis_cache:
+			await redis_cache.bump_achievement_catalog_version()
+
+	@staticmethod
+	async def _get_version(redis_cache) -> str | None:
+		if not redis_cache:
+			return None
+		return await redis_cache.get_achievement_catalog_version()
+
+
+# Процессный синглтон: каталог общий для всех запросов и задач процесса
+achievement_catalog_cache = AchievementCatalogCache()
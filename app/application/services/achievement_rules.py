@@ -0,0 +1,145 @@
+"""
+Скомпилированный движок правил достижений.
+
+Для каждого счетчика хранится отсортированный массив порогов, поэтому при
+изменении счетчика с old на new проверяются только достижения с порогом в
+интервале (old, new], найденные бинарным поиском.
+"""
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Mapping
+
+from app.application.entities import Achievement
+from app.application.constants import DatabaseFields
+
+logger = logging.getLogger(__name__)
+
+ALL = "all"
+ANY = "any"
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+	"""Правило достижения: лист (счетчик >= порог) или all/any из правил"""
+	field: str | None = None
+	value: int | None = None
+	operator: str | None = None
+	children: tuple["AchievementRule", ...] = ()
+
+	@classmethod
+	def compile(cls, achievement: Achievement) -> "AchievementRule":
+		"""Компилирует правило из conditions или condition_field/value"""
+		if achievement.conditions:
+			return cls._compile_node(achievement.conditions)
+		return cls._compile_leaf(
+			achievement.condition_field, achievement.condition_value)
+
+	@classmethod
+	def _compile_node(cls, node: dict) -> "AchievementRule":
+		if not isinstance(node, dict):
+			raise ValueError(f"Invalid achievement condition: {node!r}")
+		for operator in (ALL, ANY):
+			if operator in node:
+				children = node[operator]
+				if not isinstance(children, list) or not children:
+					raise ValueError(
+						f"Condition '{operator}' must be a non-empty list")
+				return cls(
+					operator=operator,
+					children=tuple(cls._compile_node(c) for c in children),
+				)
+		return cls._compile_leaf(node.get("field"), node.get("value"))
+
+	@classmethod
+	def _compile_leaf(cls, field, value) -> "AchievementRule":
+		if field not in DatabaseFields.COUNTERS:
+			raise ValueError(f"Unknown condition field: {field!r}")
+		if not isinstance(value, int) or isinstance(value, bool):
+			raise ValueError(f"Invalid condition value: {value!r}")
+		return cls(field=field, value=value)
+
+	def leaves(self):
+		"""Все листья правила (пары счетчик-порог)"""
+		if self.operator is None:
+			yield self
+			return
+		for child in self.children:
+			yield from child.leaves()
+
+	def is_satisfied(self, counters: Mapping[str, int]) -> bool:
+		if self.operator is None:
+			return (counters.get(self.field) or 0) >= self.value
+		if self.operator == ALL:
+			return all(c.is_satisfied(counters) for c in self.children)
+		return any(c.is_satisfied(counters) for c in self.children)
+
+
+class AchievementRuleEngine:
+	"""Индекс порогов по счетчикам для инкрементальной проверки достижений"""
+
+	def __init__(self, achievements: tuple[Achievement, ...] | list):
+		self.rules: dict[int, AchievementRule] = {}
+		entries: dict[str, list[tuple[int, Achievement]]] = {}
+
+		for achievement in achievements:
+			try:
+				rule = AchievementRule.compile(achievement)
+			except ValueError as e:
+				logger.error(
+					f"Achievement {achievement.id} skipped: {e}")
+				continue
+			self.rules[achievement.id] = rule
+			for leaf in rule.leaves():
+				entries.setdefault(leaf.field, []).append(
+					(leaf.value, achievement))
+
+		self._thresholds: dict[str, list[int]] = {}
+		self._targets: dict[str, list[Achievement]] = {}
+		for field, items in entries.items():
+			items.sort(key=lambda item: item[0])
+			self._thresholds[field] = [value for value, _ in items]
+			self._targets[field] = [achievement for _, achievement in items]
+
+	def candidates(
+		self,
+		field: str,
+		old_value: int,
+		new_value: int,
+	) -> list[Achievement]:
+		"""Достижения с порогом по field в интервале (old_value, new_value]"""
+		thresholds = self._thresholds.get(field)
+		if not thresholds or new_value <= old_value:
+			return []
+		low = bisect_right(thresholds, old_value)
+		high = bisect_right(thresholds, new_value)
+		return self._targets[field][low:high]
+
+	def newly_satisfied(
+		self,
+		old_counters: Mapping[str, int],
+		new_counters: Mapping[str, int],
+	) -> list[Achievement]:
+		"""Достижения, условие которых стало выполняться при переходе old->new"""
+		result: dict[int, Achievement] = {}
+		for field, new_value in new_counters.items():
+			old_value = old_counters.get(field) or 0
+			for achievement in self.candidates(field, old_value, new_value or 0):
+				if achievement.id in result:
+					continue
+				rule = self.rules[achievement.id]
+				# Для any правило могло выполняться и раньше по другому счетчику
+				if (
+					rule.is_satisfied(new_counters)
+					and not rule.is_satisfied(old_counters)
+				):
+					result[achievement.id] = achievement
+		return list(result.values())
+
+	def is_satisfied(
+		self,
+		achievement: Achievement,
+		counters: Mapping[str, int],
+	) -> bool:
+		rule = self.rules.get(achievement.id)
+		return rule is not None and rule.is_satisfied(counters)
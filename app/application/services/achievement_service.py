@@ -6,6 +6,9 @@ from app.application.interfaces import (
 	IUserScoreRepository,
 )
 from app.application.exceptions import AchievementServiceError
+from app.application.services.achievement_catalog import (
+	achievement_catalog_cache,
+)
 
 
 class AchievementService:
@@ -28,7 +31,9 @@ class AchievementService:
 	async def get_all_achievements(self) -> list[Achievement]:
 		"""Получить все доступные достижения"""
 		try:
-			return await self.achievement_repo.get_all()
+			catalog = await achievement_catalog_cache.get(
+				self.achievement_repo, self.redis_cache)
+			return list(catalog.achievements)
 		except Exception as e:
 			raise AchievementServiceError(error=str(e))
 
@@ -41,11 +46,12 @@ class AchievementService:
 			user_achievements = await self.user_achievement_repo.get_by_user_id(
 				user_id=user_id
 			)
+			catalog = await achievement_catalog_cache.get(
+				self.achievement_repo, self.redis_cache)
 			detailed_achievements = []
 
 			for user_achievement in user_achievements:
-				achievement = await self.achievement_repo.get_by_id(
-					user_achievement.achievement_id)
+				achievement = catalog.get(user_achievement.achievement_id)
 				if achievement:
 					detailed_achievements.append({
 						"id": user_achievement.id,
@@ -0,0 +1,129 @@
+import logging
+import zlib
+
+from datetime import timedelta
+from typing import AsyncIterable, AsyncIterator
+
+from app.application.interfaces import (
+	IEventImportRepository,
+	IEventPartitionRepository,
+	IAchievementRepository,
+)
+from app.application.entities import ExportFormat
+from app.application.constants import Limits
+from app.application.utils import ScoreCalculator
+from app.application.services.achievement_catalog import (
+	achievement_catalog_cache,
+)
+from app.application.services.event_partition_service import (
+	EventPartitionService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EventImportService:
+	"""Сервис массовой загрузки исторических событий.
+
+	События не проходят через outbox и воркеры: счетчики и достижения
+	пересчитываются в SQL для всей загрузки сразу, кеш Redis обновляется
+	после коммита.
+	"""
+
+	def __init__(
+		self,
+		import_repo: IEventImportRepository,
+		partition_repo: IEventPartitionRepository,
+		achievement_repo: IAchievementRepository,
+		redis_cache,
+	):
+		self.import_repo = import_repo
+		self.partition_repo = partition_repo
+		self.achievement_repo = achievement_repo
+		self.redis_cache = redis_cache
+
+	@staticmethod
+	async def _decompress(source: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+		# wbits=47: gzip или zlib, формат определяется по заголовку
+		decompressor = zlib.decompressobj(wbits=47)
+		async for chunk in source:
+			data = decompressor.decompress(chunk)
+			if data:
+				yield data
+		tail = decompressor.flush()
+		if tail:
+			yield tail
+
+	async def import_events(
+		self,
+		import_format: ExportFormat,
+		source: AsyncIterable[bytes],
+		compressed: bool = False,
+		cache_chunk_size: int = Limits.IMPORT_CACHE_CHUNK_SIZE,
+	) -> dict:
+		"""Загружает события из source и применяет их к счетам и достижениям.
+
+		Загрузка атомарна: при ошибке в данных (неизвестный тип события или
+		пользователь) в events не попадает ни одна строка.
+		"""
+		if compressed:
+			source = self._decompress(source)
+
+		staging = await self.import_repo.create_staging()
+		try:
+			loaded = await self.import_repo.copy_in(staging, import_format, source)
+			logger.info(f"Event import: {loaded} rows staged")
+
+			await self._ensure_partitions(
+				await self.import_repo.get_staged_months(staging))
+			catalog = await achievement_catalog_cache.get(
+				self.achievement_repo, self.redis_cache)
+			report = await self.import_repo.apply_staged(
+				staging, catalog.rules.rules)
+			logger.info(f"Event import applied: {report}")
+
+			report["cached_users"] = await self._refresh_cache(
+				staging, cache_chunk_size)
+		finally:
+			await self.import_repo.drop_staging(staging)
+		return report
+
+	async def _ensure_partitions(self, months) -> None:
+		"""Создает партиции events для месяцев загрузки, которых еще нет"""
+		attached = set(await self.partition_repo.list_partitions())
+		for month in months:
+			name = EventPartitionService.get_partition_name(month)
+			if name in attached:
+				continue
+			next_month = (month + timedelta(days=32)).replace(day=1)
+			await self.partition_repo.create_partition(name, month, next_month)
+			logger.info(f"Event import: partition {name} created")
+
+	async def _refresh_cache(self, staging: str, chunk_size: int) -> int:
+		"""Переписывает счета пользователей загрузки в Redis.
+
+		События уже закоммичены, поэтому ошибка Redis не прерывает загрузку:
+		счета восстановит команда rebuild-leaderboard или следующее событие.
+		"""
+		total = 0
+		last_user_id = 0
+		try:
+			while True:
+				chunk = await self.import_repo.get_scores_chunk(
+					staging,
+					after_user_id=last_user_id,
+					limit=chunk_size,
+				)
+				if not chunk:
+					break
+				await self.redis_cache.set_scores_many({
+					user_score.user_id: ScoreCalculator.calculate_total_score(
+						user_score)
+					for user_score in chunk
+				})
+				total += len(chunk)
+				last_user_id = chunk[-1].user_id
+		except Exception as e:
+			logger.error(
+				f"Event import: Redis refresh failed after {total} users: {e}")
+		return total
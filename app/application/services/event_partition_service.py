@@ -0,0 +1,109 @@
+import logging
+import re
+
+from datetime import date, datetime, timezone
+
+from app.application.interfaces import IEventPartitionRepository
+from app.application.constants import EventPartitioning
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(
+	rf"^{EventPartitioning.PARTITION_PREFIX}(\d{{4}})(\d{{2}})$"
+)
+
+
+def _add_months(month: date, months: int) -> date:
+	index = month.year * 12 + month.month - 1 + months
+	return date(index // 12, index % 12 + 1, 1)
+
+
+class EventPartitionService:
+	"""Сервис обслуживания помесячных партиций таблицы событий"""
+
+	def __init__(
+		self,
+		partition_repo: IEventPartitionRepository,
+		partitions_ahead: int = EventPartitioning.PARTITIONS_AHEAD,
+		retention_months: int = EventPartitioning.RETENTION_MONTHS,
+		archive_enabled: bool = EventPartitioning.ARCHIVE_ENABLED,
+		archive_retention_months: int = EventPartitioning.ARCHIVE_RETENTION_MONTHS,
+	):
+		self.partition_repo = partition_repo
+		self.partitions_ahead = partitions_ahead
+		self.retention_months = retention_months
+		self.archive_enabled = archive_enabled
+		self.archive_retention_months = archive_retention_months
+
+	@staticmethod
+	def get_partition_name(month: date) -> str:
+		return f"{EventPartitioning.PARTITION_PREFIX}{month:%Y%m}"
+
+	@staticmethod
+	def parse_partition_month(name: str) -> date | None:
+		match = _PARTITION_NAME.match(name)
+		if not match:
+			return None
+		return date(int(match.group(1)), int(match.group(2)), 1)
+
+	async def maintain(self, today: date | None = None) -> dict:
+		"""Создает партиции вперед и выводит старые по политике хранения.
+
+		События из партиции по умолчанию переносятся в партиции своих месяцев.
+
+		Партиция месяца, закончившегося больше retention_months месяцев назад,
+		отсоединяется от events и переносится в схему архива (или удаляется,
+		если архив выключен). Архив старше archive_retention_months удаляется.
+		"""
+		today = today or datetime.now(timezone.utc).date()
+		current_month = today.replace(day=1)
+		report = {"created": [], "archived": [], "dropped": []}
+
+		attached = set(await self.partition_repo.list_partitions())
+		months = {
+			_add_months(current_month, offset)
+			for offset in range(self.partitions_ahead + 1)
+		}
+		# События месяцев без партиции попали в партицию по умолчанию: их
+		# месяцы получают свои партиции и дальше подчиняются политике хранения
+		months.update(await self.partition_repo.list_default_months())
+		for month in sorted(months):
+			name = self.get_partition_name(month)
+			if name not in attached:
+				await self.partition_repo.create_partition(
+					name, month, _add_months(month, 1))
+				attached.add(name)
+				report["created"].append(name)
+
+		if self.retention_months > 0:
+			oldest_kept = _add_months(current_month, -self.retention_months)
+			for name in sorted(attached):
+				month = self.parse_partition_month(name)
+				if month is None or month >= oldest_kept:
+					continue
+				await self.partition_repo.detach_partition(name)
+				if self.archive_enabled:
+					await self.partition_repo.archive_partition(
+						name, EventPartitioning.ARCHIVE_SCHEMA)
+					report["archived"].append(name)
+				else:
+					await self.partition_repo.drop_partition(name)
+					report["dropped"].append(name)
+
+		if self.archive_enabled and self.archive_retention_months > 0:
+			oldest_archived = _add_months(
+				current_month,
+				-(self.retention_months + self.archive_retention_months),
+			)
+			for name in await self.partition_repo.list_archived(
+				EventPartitioning.ARCHIVE_SCHEMA
+			):
+				month = self.parse_partition_month(name)
+				if month is None or month >= oldest_archived:
+					continue
+				await self.partition_repo.drop_partition(
+					name, EventPartitioning.ARCHIVE_SCHEMA)
+				report["dropped"].append(name)
+
+		logger.info(f"Event partitions maintained: {report}")
+		return report
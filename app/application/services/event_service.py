@@ -1,4 +1,7 @@
 import logging
+
+from datetime import datetime
+
 from app.application.entities import Event, EventType
 from app.application.interfaces import (
 	IUserRepository,
@@ -6,13 +9,16 @@ from app.application.interfaces import (
 )
 from app.application.exceptions import (
 	InvalidEventDataError,
-	EventServiceError
+	EventServiceError,
+	UsersNotFoundError,
 )
 from app.application.utils import (
+	EventCursor,
+	EventTypeHelper,
 	ValidationHelper,
 	UserValidator,
 )
-from app.adapters.celery.tasks import process_event as celery_process_event
+from app.application.constants import Limits
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +39,12 @@ class EventService:
 		user_id: int,
 		event_type: EventType,
 		details: dict | None = None,
+		idempotency_key: str | None = None,
 	) -> Event:
-		"""Обрабатывает событие пользователя"""
+		"""Обрабатывает событие пользователя.
+
+		Повтор с тем же idempotency_key возвращает ранее созданное событие.
+		"""
 		if not ValidationHelper.validate_user_id(user_id=user_id):
 			raise InvalidEventDataError(details="Некорректный ID пользователя")
 
@@ -52,11 +62,96 @@ class EventService:
 				event_type=event_type,
 				details=details
 			)
-			event = await self.event_repo.create(event=event)
+			# Событие и его запись в outbox коммитятся вместе; на обработку
+			# его передаст ретранслятор outbox
+			return await self.event_repo.create(
+				event=event,
+				idempotency_key=idempotency_key,
+			)
 
-			celery_process_event.delay(event.id)
+		except Exception as e:
+			raise EventServiceError(error=str(e)) from e
 
-			return event
+	async def process_events_batch(
+		self,
+		events: list[Event],
+		idempotency_keys: list[str | None] | None = None,
+	) -> list[Event]:
+		"""Сохраняет пакет событий одним INSERT вместе с записями outbox.
+
+		idempotency_keys - ключи событий в том же порядке; для уже принятых
+		ключей возвращаются ранее созданные события.
+		"""
+		if not events:
+			return []
+
+		for index, event in enumerate(events):
+			if not ValidationHelper.validate_user_id(user_id=event.user_id):
+				raise InvalidEventDataError(
+					details=f"Событие #{index}: некорректный ID пользователя")
+			if not ValidationHelper.validate_event_details(
+				details=event.details):
+				raise InvalidEventDataError(
+					details=f"Событие #{index}: некорректные детали события")
+
+		user_ids = {event.user_id for event in events}
+		existing_ids = await self.user_repo.get_existing_ids(user_ids=user_ids)
+		missing_ids = sorted(user_ids - existing_ids)
+		if missing_ids:
+			raise UsersNotFoundError(
+				user_ids=", ".join(map(str, missing_ids)),
+				context={"user_ids": missing_ids},
+			)
+
+		try:
+			return await self.event_repo.create_many(
+				events=events,
+				idempotency_keys=idempotency_keys,
+			)
 
 		except Exception as e:
 			raise EventServiceError(error=str(e)) from e
+
+	async def get_user_history(
+		self,
+		user_id: int,
+		limit: int = Limits.EVENT_HISTORY_DEFAULT_LIMIT,
+		cursor: str | None = None,
+		event_types: list[EventType] | None = None,
+		created_from: datetime | None = None,
+		created_to: datetime | None = None,
+	) -> dict:
+		"""Страница истории событий пользователя, новые первыми.
+
+		next_cursor продолжает выборку с тем же фильтром; None - страница
+		последняя.
+		"""
+		await UserValidator.ensure_user_exists(
+			user_repo=self.user_repo,
+			user_id=user_id,
+		)
+		before = EventCursor.decode(cursor) if cursor else None
+
+		# Лишняя строка показывает, есть ли следующая страница
+		events = await self.event_repo.get_history(
+			user_id=user_id,
+			limit=limit + 1,
+			before=before,
+			event_types=[
+				EventTypeHelper.to_string(event_type)
+				for event_type in event_types or []
+			],
+			created_from=created_from,
+			created_to=created_to,
+		)
+		next_cursor = None
+		if len(events) > limit:
+			events = events[:limit]
+			next_cursor = EventCursor.encode(events[-1].created_at, events[-1].id)
+
+		return {
+			"user_id": user_id,
+			"events": events,
+			"limit": limit,
+			"next_cursor": next_cursor,
+		}
@@ -0,0 +1,51 @@
+import logging
+import zlib
+
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from app.application.interfaces import IDataExportRepository
+from app.application.entities import ExportDataset, ExportFormat
+
+logger = logging.getLogger(__name__)
+
+
+class ExportService:
+	"""Сервис массовой выгрузки таблиц в CSV или NDJSON"""
+
+	def __init__(self, export_repo: IDataExportRepository):
+		self.export_repo = export_repo
+
+	async def export(
+		self,
+		dataset: ExportDataset,
+		export_format: ExportFormat,
+		output: Callable[[bytes], Awaitable[None]],
+		created_from: datetime | None = None,
+		created_to: datetime | None = None,
+		compress: bool = False,
+	) -> int:
+		"""Передает выгрузку в output порциями байт, при compress - в gzip.
+
+		Возвращает число выгруженных строк.
+		"""
+		# wbits=31: поток в формате gzip, сжимается по мере поступления
+		compressor = zlib.compressobj(wbits=31)
+
+		async def write_compressed(chunk: bytes) -> None:
+			compressed = compressor.compress(chunk)
+			if compressed:
+				await output(compressed)
+
+		rows = await self.export_repo.copy_out(
+			dataset,
+			export_format,
+			write_compressed if compress else output,
+			created_from=created_from,
+			created_to=created_to,
+		)
+		if compress:
+			await output(compressor.flush())
+
+		logger.info(f"Exported {rows} rows of {dataset.value} as {export_format.value}")
+		return rows
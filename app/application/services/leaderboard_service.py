@@ -0,0 +1,138 @@
+import logging
+
+from app.application.interfaces import IUserRepository, IUserScoreRepository
+from app.application.constants import Limits
+from app.application.exceptions import (
+	LeaderboardServiceError,
+	UserNotFoundError,
+	UserNotRankedError,
+)
+from app.application.entities import LeaderboardPeriod
+from app.application.utils import ScoreCalculator, LeaderboardPeriodHelper
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardService:
+	"""Сервис лидербордов (общего и по периодам)"""
+
+	def __init__(
+		self,
+		leaderboard_cache,
+		user_repo: IUserRepository,
+		user_score_repo: IUserScoreRepository | None = None
+	):
+		self.leaderboard_cache = leaderboard_cache
+		self.user_repo = user_repo
+		self.user_score_repo = user_score_repo
+
+	async def get_top(
+		self,
+		limit: int = Limits.LEADERBOARD_DEFAULT_LIMIT,
+		offset: int = 0,
+		period: LeaderboardPeriod = LeaderboardPeriod.GLOBAL,
+	) -> dict:
+		"""Страница лидерборда периода, отсортированная по убыванию счета"""
+		try:
+			total, entries = await self.leaderboard_cache.get_top(
+				offset=offset,
+				limit=limit,
+				key=LeaderboardPeriodHelper.get_key(period),
+			)
+		except Exception as e:
+			raise LeaderboardServiceError(error=str(e))
+
+		return {
+			"period": period,
+			"total": total,
+			"limit": limit,
+			"offset": offset,
+			"entries": await self._with_usernames(offset, entries),
+		}
+
+	async def get_user_position(
+		self,
+		user_id: int,
+		neighbours: int = Limits.LEADERBOARD_NEIGHBOURS,
+		period: LeaderboardPeriod = LeaderboardPeriod.GLOBAL,
+	) -> dict:
+		"""Позиция пользователя в лидерборде периода и его соседи"""
+		key = LeaderboardPeriodHelper.get_key(period)
+		try:
+			position = await self.leaderboard_cache.get_position(
+				user_id=user_id,
+				neighbours=neighbours,
+				key=key,
+			)
+			total = await self.leaderboard_cache.get_total(key=key)
+		except Exception as e:
+			raise LeaderboardServiceError(error=str(e))
+
+		if position is None:
+			# Пользователь без очков и несуществующий различаются кодом ошибки
+			if not await self.user_repo.get_existing_ids({user_id}):
+				raise UserNotFoundError(user_id=user_id)
+			raise UserNotRankedError(user_id=user_id)
+
+		start, entries = position
+		entries = await self._with_usernames(start, entries)
+		current = next(e for e in entries if e["user_id"] == user_id)
+		return {
+			"period": period,
+			"user_id": user_id,
+			"rank": current["rank"],
+			"score": current["score"],
+			"total": total,
+			"neighbours": entries,
+		}
+
+	async def rebuild(
+		self,
+		chunk_size: int = Limits.LEADERBOARD_REBUILD_CHUNK_SIZE,
+	) -> int:
+		"""Перестроить общий лидерборд из user_scores порциями по chunk_size.
+
+		Читающие запросы продолжают обслуживаться старым лидербордом, пока
+		новый не заменит его одной атомарной операцией.
+		"""
+		await self.leaderboard_cache.start_rebuild()
+		total = 0
+		last_user_id = 0
+		try:
+			while True:
+				chunk = await self.user_score_repo.get_chunk_after(
+					after_user_id=last_user_id,
+					limit=chunk_size,
+				)
+				if not chunk:
+					break
+				await self.leaderboard_cache.add_rebuild_chunk({
+					user_score.user_id: ScoreCalculator.calculate_total_score(
+						user_score)
+					for user_score in chunk
+				})
+				total += len(chunk)
+				last_user_id = chunk[-1].user_id
+				logger.info(f"Leaderboard rebuild: {total} users loaded")
+			await self.leaderboard_cache.finish_rebuild()
+		except BaseException:
+			await self.leaderboard_cache.abort_rebuild()
+			raise
+		return total
+
+	async def _with_usernames(
+		self,
+		start: int,
+		entries: list[tuple[int, int]],
+	) -> list[dict]:
+		usernames = await self.user_repo.get_usernames(
+			{user_id for user_id, _ in entries})
+		return [
+			{
+				"rank": start + index + 1,
+				"user_id": user_id,
+				"username": usernames.get(user_id),
+				"score": score,
+			}
+			for index, (user_id, score) in enumerate(entries)
+		]
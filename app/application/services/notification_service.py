@@ -0,0 +1,57 @@
+import logging
+
+from app.application.interfaces import (
+	IAchievementNotificationRepository,
+	INotificationSink,
+)
+from app.application.constants import NotificationDelivery
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDeliveryService:
+	"""Пакетная доставка сохраненных уведомлений с повторами"""
+
+	def __init__(
+		self,
+		notification_repo: IAchievementNotificationRepository,
+		sink: INotificationSink,
+		max_attempts: int = NotificationDelivery.MAX_ATTEMPTS,
+		retry_delay: int = NotificationDelivery.RETRY_DELAY,
+	):
+		self.notification_repo = notification_repo
+		self.sink = sink
+		self.max_attempts = max_attempts
+		self.retry_delay = retry_delay
+
+	async def deliver_pending(
+		self,
+		batch_size: int = NotificationDelivery.BATCH_SIZE,
+	) -> dict:
+		"""Отправляет один пакет готовых к доставке уведомлений.
+
+		Пакет заблокирован до отметки результата, поэтому параллельные
+		доставщики его не отправят повторно.
+		"""
+		notifications = await self.notification_repo.claim_pending(batch_size)
+		if not notifications:
+			return {"sent": 0, "failed": 0}
+
+		try:
+			await self.sink.send(notifications)
+		except Exception as e:
+			logger.warning(
+				f"Notification delivery failed for {len(notifications)} "
+				f"notifications: {e}"
+			)
+			await self.notification_repo.schedule_retry(
+				[notification.id for notification in notifications],
+				error=str(e),
+				retry_delay=self.retry_delay,
+				max_attempts=self.max_attempts,
+			)
+			return {"sent": 0, "failed": len(notifications)}
+
+		await self.notification_repo.mark_as_sent(
+			[notification.id for notification in notifications])
+		return {"sent": len(notifications), "failed": 0}
@@ -0,0 +1,153 @@
+import logging
+import uuid
+
+from datetime import datetime, timedelta, timezone
+
+from app.application.interfaces import (
+	IScoreReconciliationRepository,
+	IAchievementRepository,
+)
+from app.application.constants import (
+	CeleryConfig,
+	EventPartitioning,
+	ScoreReconciliation,
+)
+from app.application.utils import ScoreCalculator
+from app.application.services.achievement_catalog import (
+	achievement_catalog_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Диапазон user_id [начало, конец)
+Chunk = tuple[int, int]
+
+
+class ScoreReconciliationService:
+	"""Сервис сверки user_scores с таблицей событий.
+
+	Пользователи делятся на диапазоны user_id, которые проверяются
+	независимо (в том числе параллельно разными воркерами); прогресс запуска
+	хранится в Redis, поэтому прерванный запуск продолжается с
+	незавершенных диапазонов.
+	"""
+
+	def __init__(
+		self,
+		reconciliation_repo: IScoreReconciliationRepository,
+		progress_repo,
+		achievement_repo: IAchievementRepository,
+		redis_cache,
+		retention_months: int = EventPartitioning.RETENTION_MONTHS,
+	):
+		self.reconciliation_repo = reconciliation_repo
+		self.progress_repo = progress_repo
+		self.achievement_repo = achievement_repo
+		self.redis_cache = redis_cache
+		self.retention_months = retention_months
+
+	def _check_events_complete(self) -> None:
+		# Счетчики пересчитываются из events: если старые партиции выводятся
+		# по политике хранения, пересчет занизил бы счет
+		if self.retention_months > 0:
+			raise RuntimeError(
+				"Score reconciliation requires the full event history, "
+				f"but EVENTS_RETENTION_MONTHS={self.retention_months}"
+			)
+
+	@staticmethod
+	def plan_chunks(max_user_id: int, chunk_size: int) -> list[Chunk]:
+		return [
+			(start, min(start + chunk_size, max_user_id + 1))
+			for start in range(1, max_user_id + 1, chunk_size)
+		]
+
+	async def start(
+		self,
+		chunk_size: int = ScoreReconciliation.CHUNK_SIZE,
+	) -> tuple[str, list[Chunk]]:
+		"""Создает запуск сверки и возвращает его ID и диапазоны"""
+		self._check_events_complete()
+		if not 0 < chunk_size <= ScoreReconciliation.MAX_CHUNK_SIZE:
+			raise ValueError(
+				f"Chunk size must be in 1..{ScoreReconciliation.MAX_CHUNK_SIZE}")
+
+		run_id = uuid.uuid4().hex[:12]
+		max_user_id = await self.reconciliation_repo.get_max_user_id()
+		chunks = self.plan_chunks(max_user_id, chunk_size)
+		await self.progress_repo.create_run(
+			run_id, chunk_size, max_user_id, len(chunks))
+		logger.info(
+			f"Score reconciliation {run_id}: {len(chunks)} chunks "
+			f"up to user {max_user_id}"
+		)
+		return run_id, chunks
+
+	async def resume(self, run_id: str) -> list[Chunk]:
+		"""Возвращает незавершенные диапазоны запуска"""
+		self._check_events_complete()
+		run = await self.progress_repo.get_run(run_id)
+		if run is None:
+			raise ValueError(f"Score reconciliation run {run_id} not found")
+		done = await self.progress_repo.get_done_chunks(run_id)
+		return [
+			chunk
+			for chunk in self.plan_chunks(run["max_user_id"], run["chunk_size"])
+			if chunk[0] not in done
+		]
+
+	async def get_progress(self, run_id: str) -> dict | None:
+		return await self.progress_repo.get_run(run_id)
+
+	async def reconcile_chunk(
+		self,
+		run_id: str,
+		start_user_id: int,
+		end_user_id: int,
+	) -> dict:
+		"""Сверяет диапазон пользователей и исправляет расхождения"""
+		self._check_events_complete()
+		catalog = await achievement_catalog_cache.get(
+			self.achievement_repo, self.redis_cache)
+		# Записи журнала моложе срока хранения не удаляются, поэтому событие,
+		# созданное позже этой границы, применено тогда и только тогда, когда
+		# оно есть в журнале
+		settled_before = datetime.now(timezone.utc) - timedelta(
+			days=CeleryConfig.IDEMPOTENCY_RETENTION_DAYS)
+
+		checked, fixed, achievements = (
+			await self.reconciliation_repo.reconcile_range(
+				start_user_id,
+				end_user_id,
+				settled_before,
+				catalog.rules.rules,
+			)
+		)
+		if fixed:
+			logger.warning(
+				f"Score reconciliation {run_id}: fixed counters of users "
+				f"{[user_score.user_id for user_score in fixed]}"
+			)
+			# Исправленный счет может быть и меньше закешированного
+			try:
+				await self.redis_cache.set_scores_many(
+					{
+						user_score.user_id: ScoreCalculator.calculate_total_score(
+							user_score)
+						for user_score in fixed
+					},
+					gt=False,
+				)
+			except Exception as e:
+				logger.error(
+					f"Score reconciliation {run_id}: Redis refresh failed "
+					f"for users {start_user_id}..{end_user_id - 1}: {e}"
+				)
+
+		await self.progress_repo.complete_chunk(
+			run_id, start_user_id, checked, len(fixed), achievements)
+		return {
+			"checked": checked,
+			"fixed": len(fixed),
+			"achievements": achievements,
+		}
@@ -1,16 +1,13 @@
-import json
+import asyncio
+import time
 
-from app.application.interfaces import (
-	IUserRepository,
-	IUserScoreRepository,
-	IUserAchievementRepository,
-	IEventRepository,
-	IAchievementRepository,
-)
-from app.application.constants import Limits
-from app.application.exceptions import StatsServiceError
-from app.application.utils import UserValidator, EventTypeHelper
-from app.application.constants import CacheSettings
+from app.application.interfaces import IUserStatsRepository
+from app.application.constants import Limits, CacheSettings
+from app.application.exceptions import StatsServiceError, UserNotFoundError
+
+# Перестроения /stats, выполняющиеся в этом процессе: конкурентные запросы
+# одного пользователя ждут результата первого вместо повторного похода в БД
+_inflight_rebuilds: dict[int, asyncio.Future] = {}
 
 
 class StatsService:
@@ -18,84 +15,103 @@ class StatsService:
 
 	def __init__(
 		self,
-		user_repo: IUserRepository,
-		user_score_repo: IUserScoreRepository,
-		user_achievement_repo: IUserAchievementRepository,
-		event_repo: IEventRepository,
-		achievement_repo: IAchievementRepository,
+		user_stats_repo: IUserStatsRepository,
 		redis_cache=None
 	):
-		self.user_repo = user_repo
-		self.user_score_repo = user_score_repo
-		self.user_achievement_repo = user_achievement_repo
-		self.event_repo = event_repo
-		self.achievement_repo = achievement_repo
+		self.user_stats_repo = user_stats_repo
 		self.redis_cache = redis_cache
 
 	async def get_user_stats(self, user_id: int) -> dict:
-		"""Получить полную статистику пользователя с кешированием"""
-		await UserValidator.ensure_user_exists(
-			user_repo=self.user_repo,
-			user_id=user_id,
-		)
+		"""Получить полную статистику пользователя с кешированием.
+
+		Документ /stats поддерживается воркером в актуальном состоянии,
+		поэтому обычно запрос обслуживается одним пайплайном Redis.
+		"""
+		cached_data, score, generation = await self._read_cache(user_id)
+		if cached_data:
+			return cached_data
 
-		cache_key = CacheSettings.get_stats_key(user_id=user_id)
+		inflight = _inflight_rebuilds.get(user_id)
+		if inflight is not None:
+			return await asyncio.shield(inflight)
 
-		# Пытаемся получить из кеша весь ответ
+		future = asyncio.get_running_loop().create_future()
+		_inflight_rebuilds[user_id] = future
+		try:
+			stats_data = await self._rebuild(user_id, score, generation)
+			future.set_result(stats_data)
+			return stats_data
+		except asyncio.CancelledError:
+			future.cancel()
+			raise
+		except Exception as e:
+			future.set_exception(e)
+			# Исключение получит вызывающий код; ожидающих может не быть
+			future.exception()
+			raise
+		finally:
+			del _inflight_rebuilds[user_id]
+
+	async def _rebuild(
+		self,
+		user_id: int,
+		score: int,
+		generation: str | None,
+	) -> dict:
+		"""Перестраивает /stats из БД, не более одного раза на пользователя"""
+		locked = True
 		if self.redis_cache:
-			cached_data = await self.redis_cache.redis.get(cache_key)
-			if cached_data:
-				return json.loads(cached_data)
+			locked = await self.redis_cache.acquire_stats_lock(user_id=user_id)
+			if not locked:
+				# Перестроение уже идет в другом процессе — ждем его результат
+				cached_data = await self._wait_for_rebuild(user_id)
+				if cached_data:
+					return cached_data
 
 		try:
-			score = 0
-			if self.redis_cache:
-				try:
-					score = await self.redis_cache.get_score(user_id=user_id)
-				except Exception:
-					pass
-
-			user_achievements = await self.user_achievement_repo.get_by_user_id(
-				user_id=user_id
-			)
-			achievement_names = []
-			for user_achievement in user_achievements:
-				achievement = await self.achievement_repo.get_by_id(
-					achievement_id=user_achievement.achievement_id
+			try:
+				snapshot = await self.user_stats_repo.get_snapshot(
+					user_id=user_id,
+					events_limit=Limits.RECENT_EVENTS_LIMIT,
 				)
-				if achievement:
-					achievement_names.append(achievement.name)
+			except Exception as e:
+				raise StatsServiceError(error=str(e))
 
-			last_events = await self.event_repo.get_recent_by_user_id(
-				user_id=user_id,
-				limit=Limits.RECENT_EVENTS_LIMIT,
-			)
+			if snapshot is None:
+				raise UserNotFoundError(user_id=user_id)
 
 			stats_data = {
 				"user_id": user_id,
 				"score": score,
-				"achievements": achievement_names,
-				"last_events": [
-					{
-						"id": event.id,
-						"event_type": EventTypeHelper.to_string(
-							event.event_type),
-						"details": event.details,
-						"created_at": event.created_at.isoformat()
-					}
-					for event in last_events
-				]
+				"achievements": snapshot["achievements"],
+				"last_events": snapshot["last_events"],
 			}
 
-			# Сохраняем в Redis целиком
 			if self.redis_cache:
-				await self.redis_cache.redis.set(
-					cache_key,
-					json.dumps(stats_data),
-					ex=CacheSettings.STATS_TTL
+				await self.redis_cache.set_stats(
+					user_id=user_id,
+					stats=stats_data,
+					generation=generation,
 				)
 
 			return stats_data
+		finally:
+			if self.redis_cache and locked:
+				await self.redis_cache.release_stats_lock(user_id=user_id)
 
-		except Exception as e:
-			raise StatsServiceError(error=str(e))
+	async def _read_cache(
+		self,
+		user_id: int,
+	) -> tuple[dict | None, int, str | None]:
+		if not self.redis_cache:
+			return None, 0, None
+		return await self.redis_cache.get_stats_and_score(user_id=user_id)
+
+	async def _wait_for_rebuild(self, user_id: int) -> dict | None:
+		deadline = time.monotonic() + CacheSettings.STATS_REBUILD_WAIT
+		while time.monotonic() < deadline:
+			await asyncio.sleep(CacheSettings.STATS_REBUILD_POLL_INTERVAL)
+			cached_data = await self.redis_cache.get_stats(user_id=user_id)
+			if cached_data:
+				return cached_data
+		return None
@@ -1,8 +1,11 @@
+from typing import AsyncIterator
+
 from sqlalchemy.exc import IntegrityError
 from app.application.entities import User, UserScore
 from app.application.interfaces import IUserRepository, IUserScoreRepository
 from app.application.exceptions import UserNotFoundError, UserScoreNotFoundError
 from app.application.exceptions import UserAlreadyExistsError
+from app.application.constants import Limits
 
 class UserService:
     """Сервис для работы с пользователями"""
@@ -23,9 +26,24 @@ class UserService:
         except IntegrityError:
             raise UserAlreadyExistsError(email=email)
 
-    async def get_all_users(self) -> list[User]:
-        """Получить всех пользователей"""
-        return await self.user_repo.get_all()
+    async def get_users_page(
+        self,
+        after_id: int = 0,
+        limit: int = Limits.USERS_PAGE_DEFAULT_LIMIT,
+    ) -> list[User]:
+        """Страница пользователей после after_id"""
+        return await self.user_repo.get_page(after_id=after_id, limit=limit)
+
+    def iterate_users(
+        self,
+        after_id: int = 0,
+        chunk_size: int = Limits.USERS_STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[list[User]]:
+        """Все пользователи после after_id порциями, без загрузки в память"""
+        return self.user_repo.iterate_chunks(
+            after_id=after_id,
+            chunk_size=chunk_size,
+        )
     
     async def get_user_by_id(self, user_id: int) -> User:
         """Получить пользователя по ID"""
@@ -1,11 +1,21 @@
 """
 Утилиты для работы с событиями, очками и достижениями
 """
+import base64
+import binascii
 import json
 
-from app.application.entities import EventType, UserScore
-from app.application.constants import EventPoints, DatabaseFields, Limits
-from app.application.exceptions import UserNotFoundError
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.application.entities import EventType, LeaderboardPeriod, UserScore
+from app.application.constants import (
+    CacheSettings,
+    DatabaseFields,
+    EventPoints,
+    Limits,
+)
+from app.application.exceptions import InvalidCursorError, UserNotFoundError
+from app.application.services.achievement_rules import AchievementRule
 
 
 class EventTypeHelper:
@@ -34,6 +44,13 @@ class UserValidator:
 
 class ScoreCalculator:
     """Класс для расчета очков и проверки достижений"""
+
+    # Счетчик user_scores, который увеличивает каждый тип события
+    EVENT_COUNTER_FIELDS = {
+        EventType.LOGIN: DatabaseFields.LOGIN_COUNT,
+        EventType.COMPLETE_LEVEL: DatabaseFields.LEVELS_COMPLETED,
+        EventType.FIND_SECRET: DatabaseFields.SECRETS_FOUND,
+    }
     
     @staticmethod
     def calculate_event_points(
@@ -64,17 +81,107 @@ class ScoreCalculator:
         )
     
     @staticmethod
-    def update_user_score_counters(
-        user_score: UserScore,
-        event_type: EventType,
-    ) -> None:
-        """Обновляет счетчики пользователя в зависимости от типа события"""
-        if event_type == EventType.LOGIN:
-            user_score.login_count += 1
-        elif event_type == EventType.COMPLETE_LEVEL:
-            user_score.levels_completed += 1
-        elif event_type == EventType.FIND_SECRET:
-            user_score.secrets_found += 1
+    def get_counters(user_score: UserScore) -> dict[str, int]:
+        """Возвращает счетчики пользователя в виде словаря"""
+        return {
+            field: getattr(user_score, field) or 0
+            for field in DatabaseFields.COUNTERS
+        }
+
+    @staticmethod
+    def get_counter_deltas(event_types) -> dict[str, int]:
+        """Сворачивает типы событий в приращения счетчиков пользователя"""
+        deltas: dict[str, int] = {}
+        for event_type in event_types:
+            field = ScoreCalculator.EVENT_COUNTER_FIELDS.get(EventType(event_type))
+            if field:
+                deltas[field] = deltas.get(field, 0) + 1
+        return deltas
+
+
+class LeaderboardPeriodHelper:
+    """Класс для работы с периодами лидерборда"""
+
+    # Периоды с отдельными ключами; общий лидерборд ведется по счету пользователя
+    BUCKETED_PERIODS = (
+        LeaderboardPeriod.DAY,
+        LeaderboardPeriod.WEEK,
+        LeaderboardPeriod.SEASON,
+    )
+
+    RETENTION = {
+        LeaderboardPeriod.DAY: CacheSettings.LEADERBOARD_DAY_RETENTION,
+        LeaderboardPeriod.WEEK: CacheSettings.LEADERBOARD_WEEK_RETENTION,
+        LeaderboardPeriod.SEASON: CacheSettings.LEADERBOARD_SEASON_RETENTION,
+    }
+
+    @staticmethod
+    def get_bounds(period: LeaderboardPeriod, day: date) -> tuple[date, date, str]:
+        """Возвращает начало, конец (не включительно) и метку периода дня day"""
+        if period == LeaderboardPeriod.DAY:
+            return day, day + timedelta(days=1), day.isoformat()
+        if period == LeaderboardPeriod.WEEK:
+            year, week, weekday = day.isocalendar()
+            start = day - timedelta(days=weekday - 1)
+            return start, start + timedelta(days=7), f"{year}-W{week:02d}"
+        if period == LeaderboardPeriod.SEASON:
+            quarter = (day.month - 1) // 3
+            start = date(day.year, quarter * 3 + 1, 1)
+            end = (
+                date(day.year + 1, 1, 1) if quarter == 3
+                else date(day.year, quarter * 3 + 4, 1)
+            )
+            return start, end, f"{day.year}-Q{quarter + 1}"
+        raise ValueError(f"Period {period} has no buckets")
+
+    @staticmethod
+    def get_key(
+        period: LeaderboardPeriod,
+        moment: datetime | None = None,
+    ) -> str:
+        """Возвращает ключ ZSET лидерборда периода, в который попадает moment"""
+        if period == LeaderboardPeriod.GLOBAL:
+            return CacheSettings.LEADERBOARD_KEY
+        moment = moment or datetime.now(timezone.utc)
+        _, _, label = LeaderboardPeriodHelper.get_bounds(
+            period, LeaderboardPeriodHelper._utc_date(moment))
+        return f"{CacheSettings.LEADERBOARD_PERIOD_KEY_PREFIX}{period.value}:{label}"
+
+    @staticmethod
+    def get_period_increments(events) -> list[tuple[str, int, int]]:
+        """Сворачивает события в приращения лидербордов периодов.
+
+        Возвращает [(ключ, очки, unix-время истечения ключа)]. Очки за событие
+        считаются без бонуса уровня, как и общий счет.
+        """
+        increments: dict[str, list[int]] = {}
+        for event in events:
+            points = ScoreCalculator.calculate_event_points(
+                EventType(event.event_type))
+            if not points:
+                continue
+            moment = event.created_at or datetime.now(timezone.utc)
+            day = LeaderboardPeriodHelper._utc_date(moment)
+            for period in LeaderboardPeriodHelper.BUCKETED_PERIODS:
+                key = LeaderboardPeriodHelper.get_key(period, moment)
+                if key not in increments:
+                    _, end, _ = LeaderboardPeriodHelper.get_bounds(period, day)
+                    expire_at = int(
+                        datetime.combine(end, time(), timezone.utc).timestamp()
+                    ) + LeaderboardPeriodHelper.RETENTION[period]
+                    increments[key] = [0, expire_at]
+                increments[key][0] += points
+        return [
+            (key, points, expire_at)
+            for key, (points, expire_at) in increments.items()
+        ]
+
+    @staticmethod
+    def _utc_date(moment: datetime) -> date:
+        # Наивное время из БД считаем UTC
+        if moment.tzinfo is None:
+            return moment.date()
+        return moment.astimezone(timezone.utc).date()
 
 
 class AchievementChecker:
@@ -82,9 +189,10 @@ class AchievementChecker:
     
     @staticmethod
     def check_achievement_condition(achievement, user_score: UserScore) -> bool:
-        """Проверяет выполнение условия достижения"""
-        field_value = getattr(user_score, achievement.condition_field, 0)
-        return field_value >= achievement.condition_value
+        """Проверяет выполнение условия достижения (в т.ч. составного)"""
+        return AchievementRule.compile(achievement).is_satisfied(
+            ScoreCalculator.get_counters(user_score)
+        )
     
     @staticmethod
     def get_earned_achievement_ids(user_achievements) -> set[int]:
@@ -114,4 +222,21 @@ class ValidationHelper:
             json_str = json.dumps(details)
             return len(json_str.encode('utf-8')) <= Limits.MAX_JSON_SIZE_BYTES
         except (TypeError, ValueError):
-            return False 
\ No newline at end of file
+            return False 
+
+class EventCursor:
+    """Непрозрачный курсор истории событий: позиция (created_at, id)"""
+
+    @staticmethod
+    def encode(created_at: datetime, event_id: int) -> str:
+        payload = json.dumps([created_at.isoformat(), event_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> tuple[datetime, int]:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, event_id = json.loads(payload)
+            return datetime.fromisoformat(created_at), int(event_id)
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursorError(cursor=cursor)
@@ -0,0 +1,471 @@
+"""
+Композит CLI - служебные команды обслуживания.
+
+Запуск: python -m app.composites.cli <команда>
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import redis.asyncio as redis
+
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.adapters.cache.pool import (
+	create_redis_pool,
+	create_redis_client,
+	close_redis_client,
+)
+from app.adapters.cache.leaderboard_repository import RedisLeaderboardRepository
+from app.adapters.cache.redis_repository import RedisUserScoreRepository
+from app.adapters.cache.reconciliation_repository import (
+	RedisReconciliationRepository,
+)
+from app.adapters.database.session import AsyncSessionLocal, DATABASE_URL
+from app.adapters.database.repositories import (
+	EventRepository,
+	EventOutboxRepository,
+	ProcessedEventRepository,
+	UserRepository,
+	UserScoreRepository,
+	EventPartitionRepository,
+	DataExportRepository,
+	EventImportRepository,
+	AchievementRepository,
+	ScoreReconciliationRepository,
+)
+from app.adapters.database.partitioning import (
+	EVENTS_PARTITIONS_AHEAD,
+	EVENTS_RETENTION_MONTHS,
+	EVENTS_ARCHIVE_ENABLED,
+	EVENTS_ARCHIVE_RETENTION_MONTHS,
+)
+from app.application.constants import (
+	Limits,
+	RedisConfig,
+	ScoreReconciliation,
+)
+from app.application.entities import (
+	Event,
+	EventType,
+	ExportDataset,
+	ExportFormat,
+)
+from app.application.services.event_service import EventService
+from app.application.services.leaderboard_service import LeaderboardService
+from app.application.services.event_partition_service import (
+	EventPartitionService,
+)
+from app.application.services.export_service import ExportService
+from app.application.services.event_import_service import EventImportService
+from app.application.services.score_reconciliation_service import (
+	ScoreReconciliationService,
+)
+
+
+async def rebuild_leaderboard(chunk_size: int) -> int:
+	"""Перестраивает глобальный лидерборд из user_scores"""
+	redis_client = create_redis_client(create_redis_pool())
+	try:
+		async with AsyncSessionLocal() as session:
+			service = LeaderboardService(
+				RedisLeaderboardRepository(client=redis_client),
+				UserRepository(session),
+				UserScoreRepository(session),
+			)
+			return await service.rebuild(chunk_size=chunk_size)
+	finally:
+		await close_redis_client(redis_client)
+
+
+async def maintain_event_partitions(retention_months: int) -> dict:
+	"""Создает партиции events вперед и выводит старые по политике хранения"""
+	async with AsyncSessionLocal() as session:
+		service = EventPartitionService(
+			EventPartitionRepository(session),
+			partitions_ahead=EVENTS_PARTITIONS_AHEAD,
+			retention_months=retention_months,
+			archive_enabled=EVENTS_ARCHIVE_ENABLED,
+			archive_retention_months=EVENTS_ARCHIVE_RETENTION_MONTHS,
+		)
+		return await service.maintain()
+
+
+async def requeue_dead_events() -> list[int]:
+	"""Возвращает события, исчерпавшие попытки, в outbox"""
+	async with AsyncSessionLocal() as session:
+		event_ids = await EventOutboxRepository(session).requeue_dead()
+		await session.commit()
+	return event_ids
+
+
+async def export_dataset(
+	dataset: ExportDataset,
+	export_format: ExportFormat,
+	output_path: str,
+	created_from: datetime | None,
+	created_to: datetime | None,
+	compress: bool,
+) -> int:
+	"""Выгружает таблицу через COPY в файл или в stdout ("-")"""
+	# Отдельный движок без echo: SQL-лог не должен попасть в выгрузку на stdout
+	engine = create_async_engine(DATABASE_URL)
+	stream = (
+		sys.stdout.buffer if output_path == "-" else open(output_path, "wb")
+	)
+
+	async def write(chunk: bytes) -> None:
+		stream.write(chunk)
+
+	try:
+		async with async_sessionmaker(engine)() as session:
+			return await ExportService(DataExportRepository(session)).export(
+				dataset,
+				export_format,
+				write,
+				created_from=created_from,
+				created_to=created_to,
+				compress=compress,
+			)
+	finally:
+		stream.flush()
+		if stream is not sys.stdout.buffer:
+			stream.close()
+		await engine.dispose()
+
+
+async def _read_file(path: str):
+	with open(path, "rb") as stream:
+		while chunk := stream.read(Limits.IMPORT_READ_CHUNK_SIZE):
+			yield chunk
+
+
+async def import_events(
+	path: str,
+	import_format: ExportFormat,
+	compressed: bool,
+) -> dict:
+	"""Загружает события из файла через COPY и пересчитывает счета"""
+	redis_client = create_redis_client(create_redis_pool())
+	try:
+		async with AsyncSessionLocal() as session:
+			service = EventImportService(
+				EventImportRepository(session),
+				EventPartitionRepository(session),
+				AchievementRepository(session),
+				RedisUserScoreRepository(client=redis_client),
+			)
+			return await service.import_events(
+				import_format,
+				_read_file(path),
+				compressed=compressed,
+			)
+	finally:
+		await close_redis_client(redis_client)
+
+
+async def start_score_reconciliation(
+	chunk_size: int,
+	run_id: str | None,
+) -> tuple[str, int]:
+	"""Создает (или продолжает) запуск сверки и ставит диапазоны в очередь"""
+	# Импорт здесь: модуль задач поднимает движок и настройки воркера
+	from app.adapters.celery.tasks import dispatch_score_reconciliation
+
+	redis_client = create_redis_client(create_redis_pool())
+	try:
+		async with AsyncSessionLocal() as session:
+			service = ScoreReconciliationService(
+				ScoreReconciliationRepository(session),
+				RedisReconciliationRepository(client=redis_client),
+				AchievementRepository(session),
+				RedisUserScoreRepository(client=redis_client),
+				retention_months=EVENTS_RETENTION_MONTHS,
+			)
+			if run_id is None:
+				run_id, chunks = await service.start(chunk_size)
+			else:
+				chunks = await service.resume(run_id)
+	finally:
+		await close_redis_client(redis_client)
+
+	dispatch_score_reconciliation(run_id, chunks)
+	return run_id, len(chunks)
+
+
+async def get_reconciliation_progress(run_id: str) -> dict | None:
+	redis_client = create_redis_client(create_redis_pool())
+	try:
+		return await RedisReconciliationRepository(
+			client=redis_client).get_run(run_id)
+	finally:
+		await close_redis_client(redis_client)
+
+
+# Команды самого бенчмарка между снимками счетчиков: INFO commandstats
+# попадает в статистику уже после ответа, а за ним идет INFO memory
+BENCHMARK_OWN_COMMANDS = {"info": 2}
+
+
+async def _redis_usage(redis_client) -> dict:
+	"""Счетчики вызовов команд Redis и память"""
+	commands = await redis_client.info("commandstats")
+	memory = await redis_client.info("memory")
+	return {
+		"commands": {
+			name.removeprefix("cmdstat_"): stats["calls"]
+			for name, stats in commands.items()
+		},
+		"used_memory": memory["used_memory"],
+	}
+
+
+async def _count_result_keys(redis_client) -> int:
+	"""Число ключей результатов Celery"""
+	result_keys = 0
+	async for _ in redis_client.scan_iter(match="celery-task-meta-*", count=1000):
+		result_keys += 1
+	return result_keys
+
+
+async def benchmark_events(user_id: int, count: int, timeout: float) -> dict:
+	"""Нагрузка на брокер и Redis в пересчете на одно событие.
+
+	Создает count событий пользователя user_id так же, как API, ждет, пока
+	воркер их обработает, и сравнивает INFO Redis до и после. Запуск на
+	работающем стенде с теми настройками Celery, которые нужно сравнить.
+
+	Между снимками бенчмарк не обращается к Redis: обработку он ждет по
+	журналу processed_events в PostgreSQL, ключи результатов считает вне
+	снимков, а свои два вызова INFO вычитает. Снимки снимаются отдельным
+	соединением без health check, чтобы в счетчики не попал его PING.
+	"""
+	redis_client = redis.from_url(
+		os.getenv("REDIS_URL", RedisConfig.DEFAULT_URL),
+		decode_responses=True,
+	)
+	try:
+		result_keys_before = await _count_result_keys(redis_client)
+		before = await _redis_usage(redis_client)
+		started = time.monotonic()
+
+		event_ids = []
+		async with AsyncSessionLocal() as session:
+			service = EventService(EventRepository(session), UserRepository(session))
+			for offset in range(0, count, Limits.EVENT_BATCH_MAX_SIZE):
+				size = min(Limits.EVENT_BATCH_MAX_SIZE, count - offset)
+				events = await service.process_events_batch([
+					Event(user_id=user_id, event_type=EventType.LOGIN)
+					for _ in range(size)
+				])
+				event_ids.extend(event.id for event in events)
+
+		pending = set(event_ids)
+		while pending and time.monotonic() - started < timeout:
+			await asyncio.sleep(0.5)
+			async with AsyncSessionLocal() as session:
+				pending -= await ProcessedEventRepository(session).get_processed(
+					list(pending))
+		elapsed = time.monotonic() - started
+
+		after = await _redis_usage(redis_client)
+		result_keys_after = await _count_result_keys(redis_client)
+	finally:
+		await redis_client.aclose()
+
+	processed = len(event_ids) - len(pending)
+	per_event = max(processed, 1)
+	calls = {
+		name: after["commands"][name]
+		- before["commands"].get(name, 0)
+		- BENCHMARK_OWN_COMMANDS.get(name, 0)
+		for name in after["commands"]
+	}
+	calls = {name: delta for name, delta in calls.items() if delta > 0}
+	return {
+		"events": len(event_ids),
+		"processed": processed,
+		"seconds": round(elapsed, 2),
+		"events_per_second": round(processed / elapsed, 1) if elapsed else None,
+		"redis_commands_per_event": round(sum(calls.values()) / per_event, 2),
+		"redis_memory_bytes_per_event": round(
+			(after["used_memory"] - before["used_memory"]) / per_event),
+		"celery_result_keys_added": result_keys_after - result_keys_before,
+		"commands_per_event": {
+			name: round(delta / per_event, 2)
+			for name, delta in sorted(calls.items(), key=lambda item: -item[1])
+		},
+		"excluded_benchmark_commands": BENCHMARK_OWN_COMMANDS,
+	}
+
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(prog="python -m app.composites.cli")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	rebuild = commands.add_parser(
+		"rebuild-leaderboard",
+		help="Перестроить лидерборд из PostgreSQL",
+	)
+	rebuild.add_argument(
+		"--chunk-size",
+		type=int,
+		default=Limits.LEADERBOARD_REBUILD_CHUNK_SIZE,
+		help="Строк user_scores за один запрос",
+	)
+
+	partitions = commands.add_parser(
+		"maintain-partitions",
+		help="Создать партиции events вперед и вывести старые в архив",
+	)
+	partitions.add_argument(
+		"--retention-months",
+		type=int,
+		default=EVENTS_RETENTION_MONTHS,
+		help="Сколько месяцев хранить в events, 0 - без ограничения",
+	)
+
+	commands.add_parser(
+		"requeue-dead-events",
+		help="Вернуть в outbox события, исчерпавшие попытки обработки",
+	)
+
+	benchmark = commands.add_parser(
+		"benchmark-events",
+		help="Измерить нагрузку на брокер и Redis на одно событие",
+	)
+	benchmark.add_argument(
+		"--user-id",
+		type=int,
+		required=True,
+		help="Существующий пользователь, от имени которого создаются события",
+	)
+	benchmark.add_argument("--events", type=int, default=1000)
+	benchmark.add_argument(
+		"--timeout",
+		type=float,
+		default=300,
+		help="Сколько секунд ждать обработки событий воркером",
+	)
+
+	export = commands.add_parser(
+		"export",
+		help="Выгрузить таблицу в CSV или NDJSON через COPY",
+	)
+	export.add_argument("dataset", choices=[d.value for d in ExportDataset])
+	export.add_argument(
+		"--format",
+		choices=[f.value for f in ExportFormat],
+		default=ExportFormat.CSV.value,
+	)
+	export.add_argument(
+		"--from",
+		dest="created_from",
+		type=datetime.fromisoformat,
+		help="Начало периода в ISO 8601 (включительно)",
+	)
+	export.add_argument(
+		"--to",
+		dest="created_to",
+		type=datetime.fromisoformat,
+		help="Конец периода в ISO 8601 (не включительно)",
+	)
+	export.add_argument("--gzip", action="store_true", help="Сжать в gzip")
+	export.add_argument(
+		"--output",
+		default="-",
+		help="Файл выгрузки, по умолчанию stdout",
+	)
+
+	import_ = commands.add_parser(
+		"import-events",
+		help="Загрузить исторические события через COPY и пересчитать счета",
+	)
+	import_.add_argument(
+		"path",
+		help="CSV с заголовком (user_id,event_type,details,created_at) или NDJSON",
+	)
+	import_.add_argument(
+		"--format",
+		choices=[f.value for f in ExportFormat],
+		default=ExportFormat.CSV.value,
+	)
+	import_.add_argument("--gzip", action="store_true", help="Файл сжат gzip")
+
+	reconcile = commands.add_parser(
+		"reconcile-scores",
+		help="Сверить user_scores с events на воркерах Celery",
+	)
+	reconcile.add_argument(
+		"--chunk-size",
+		type=int,
+		default=ScoreReconciliation.CHUNK_SIZE,
+		help="Диапазон user_id одной задачи",
+	)
+	reconcile.add_argument(
+		"--resume",
+		metavar="RUN_ID",
+		help="Продолжить запуск с незавершенных диапазонов",
+	)
+
+	status = commands.add_parser(
+		"reconcile-status",
+		help="Прогресс запуска сверки",
+	)
+	status.add_argument("run_id")
+	return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+	logging.basicConfig(level=logging.INFO)
+	args = build_parser().parse_args(argv)
+
+	if args.command == "rebuild-leaderboard":
+		total = asyncio.run(rebuild_leaderboard(args.chunk_size))
+		print(f"Leaderboard rebuilt: {total} users")
+	elif args.command == "maintain-partitions":
+		report = asyncio.run(maintain_event_partitions(args.retention_months))
+		print(f"Event partitions maintained: {report}")
+	elif args.command == "requeue-dead-events":
+		event_ids = asyncio.run(requeue_dead_events())
+		print(f"Dead events requeued: {len(event_ids)}")
+	elif args.command == "benchmark-events":
+		report = asyncio.run(
+			benchmark_events(args.user_id, args.events, args.timeout))
+		print(json.dumps(report, indent=2))
+	elif args.command == "export":
+		rows = asyncio.run(export_dataset(
+			ExportDataset(args.dataset),
+			ExportFormat(args.format),
+			args.output,
+			args.created_from,
+			args.created_to,
+			args.gzip,
+		))
+		# В stderr, чтобы не смешивать со строками выгрузки
+		print(f"Exported {rows} rows", file=sys.stderr)
+	elif args.command == "import-events":
+		report = asyncio.run(import_events(
+			args.path,
+			ExportFormat(args.format),
+			args.gzip,
+		))
+		print(f"Events imported: {report}")
+	elif args.command == "reconcile-scores":
+		run_id, chunks = asyncio.run(
+			start_score_reconciliation(args.chunk_size, args.resume))
+		print(f"Score reconciliation {run_id}: {chunks} chunks queued")
+	elif args.command == "reconcile-status":
+		progress = asyncio.run(get_reconciliation_progress(args.run_id))
+		if progress is None:
+			raise SystemExit(f"Score reconciliation run {args.run_id} not found")
+		print(json.dumps(progress, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -1,31 +1,62 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from app.adapters.cache.pool import (
+	create_redis_pool,
+	create_redis_client,
+	close_redis_client,
+	get_pool_stats,
+)
+from app.adapters.cache.redis_repository import RedisUserScoreRepository
+from app.adapters.cache.leaderboard_repository import RedisLeaderboardRepository
 from app.adapters.http_api.controllers import (
 	event_controller,
 	user_controller,
 	achievement_controller,
-	stats_controller
+	stats_controller,
+	leaderboard_controller,
+	admin_controller,
 )
 from app.adapters.http_api.exceptions import ExceptionHandler
 from app.application.exceptions import (
 	UserNotFoundError,
+	UsersNotFoundError,
 	UserScoreNotFoundError,
 	EventNotFoundError,
 	InvalidEventDataError,
+	InvalidCursorError,
 	EventServiceError,
 	AchievementServiceError,
 	StatsServiceError,
 	ValidationError,
 	UserAlreadyExistsError,
+	UserNotRankedError,
+	LeaderboardServiceError,
+	AdminAccessDeniedError,
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""Один пул соединений Redis на все время жизни приложения"""
+	redis_client = create_redis_client(create_redis_pool())
+	app.state.redis_repository = RedisUserScoreRepository(client=redis_client)
+	app.state.leaderboard_repository = RedisLeaderboardRepository(
+		client=redis_client)
+	try:
+		yield
+	finally:
+		await close_redis_client(redis_client)
+
+
 # Композит HTTP API - точка входа приложения
 def create_app() -> FastAPI:
 	"""Создает и настраивает FastAPI приложение"""
 	app = FastAPI(
 		title="Gaming Achievement System",
 		description="API для игровой системы событий и достижений",
-		version="1.0.0"
+		version="1.0.0",
+		lifespan=lifespan
 	)
 
 	# Регистрируем обработчики исключений с приоритетом (специфичные первыми)
@@ -33,14 +64,24 @@ def create_app() -> FastAPI:
 	# 404 Not Found
 	app.add_exception_handler(UserNotFoundError,
 	                          ExceptionHandler.user_not_found_handler)
+	app.add_exception_handler(UsersNotFoundError,
+	                          ExceptionHandler.users_not_found_handler)
 	app.add_exception_handler(UserScoreNotFoundError,
 	                          ExceptionHandler.user_score_not_found_handler)
 	app.add_exception_handler(EventNotFoundError,
 	                          ExceptionHandler.event_not_found_handler)
+	app.add_exception_handler(UserNotRankedError,
+	                          ExceptionHandler.user_not_ranked_handler)
 
 	# 400 Bad Request
 	app.add_exception_handler(InvalidEventDataError,
 	                          ExceptionHandler.invalid_event_data_handler)
+	app.add_exception_handler(InvalidCursorError,
+	                          ExceptionHandler.invalid_cursor_handler)
+
+	# 403 Forbidden
+	app.add_exception_handler(AdminAccessDeniedError,
+	                          ExceptionHandler.admin_access_denied_handler)
 
 	# 422 Validation Error
 	app.add_exception_handler(ValidationError,
@@ -53,6 +94,8 @@ def create_app() -> FastAPI:
 	                          ExceptionHandler.achievement_service_error_handler)
 	app.add_exception_handler(StatsServiceError,
 	                          ExceptionHandler.stats_service_error_handler)
+	app.add_exception_handler(LeaderboardServiceError,
+	                          ExceptionHandler.leaderboard_service_error_handler)
 	app.add_exception_handler(UserAlreadyExistsError,
 	                          ExceptionHandler.user_already_exists_handler)
 
@@ -64,9 +107,12 @@ def create_app() -> FastAPI:
 
 	# Регистрируем все контроллеры напрямую с префиксом /api/v1
 	app.include_router(event_controller.router, prefix="/api/v1")
+	app.include_router(event_controller.batch_router, prefix="/api/v1")
 	app.include_router(user_controller.router, prefix="/api/v1")
 	app.include_router(achievement_controller.router, prefix="/api/v1")
 	app.include_router(stats_controller.router, prefix="/api/v1")
+	app.include_router(leaderboard_controller.router, prefix="/api/v1")
+	app.include_router(admin_controller.router, prefix="/api/v1")
 
 	@app.get("/")
 	def read_root():
@@ -76,9 +122,28 @@ def create_app() -> FastAPI:
 			"docs": "/docs",
 			"endpoints": {
 				"events": "/api/v1/event",
+				"events_batch": "/api/v1/events/batch",
 				"users": "/api/v1/users",
 				"achievements": "/api/v1/achievements",
-				"stats": "/api/v1/stats"
+				"stats": "/api/v1/stats",
+				"leaderboard": "/api/v1/leaderboard",
+				"admin": "/api/v1/admin",
+				"health": "/health"
+			}
+		}
+
+	@app.get("/health")
+	async def health():
+		redis_client = app.state.redis_repository.redis
+		try:
+			redis_ok = await redis_client.ping()
+		except Exception:
+			redis_ok = False
+		return {
+			"status": "ok" if redis_ok else "degraded",
+			"redis": {
+				"ok": redis_ok,
+				"pool": get_pool_stats(redis_client.connection_pool)
 			}
 		}
 
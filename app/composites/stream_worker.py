@@ -0,0 +1,163 @@
+"""
+Композит воркера Redis Streams - обработка событий без Celery (режим stream).
+
+Запуск: python -m app.composites.stream_worker
+
+Процесс ретранслирует outbox в поток events:stream и читает его как
+потребитель группы. Процессов может быть несколько: записи распределяются
+между ними, а записи упавшего процесса забирают остальные.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.adapters.cache.pool import (
+	create_redis_pool,
+	create_redis_client,
+	close_redis_client,
+)
+from app.adapters.cache.redis_repository import RedisUserScoreRepository
+from app.adapters.cache.event_stream_repository import (
+	RedisEventStreamRepository,
+	StreamEntry,
+)
+from app.adapters.database.session import DATABASE_URL
+from app.adapters.pipeline.config import (
+	EVENT_BATCH_SIZE,
+	EVENT_RELAY_INTERVAL,
+	EVENT_STREAM_CLAIM_MIN_IDLE_MS,
+)
+from app.adapters.pipeline.event_pipeline import EventPipeline
+from app.application.constants import EventStream
+
+logger = logging.getLogger(__name__)
+
+
+class StreamWorker:
+	"""Ретранслятор outbox и потребитель группы в одном event loop"""
+
+	def __init__(
+		self,
+		pipeline: EventPipeline,
+		stream: RedisEventStreamRepository,
+		consumer: str,
+	):
+		self.pipeline = pipeline
+		self.stream = stream
+		self.consumer = consumer
+		self.stopping = asyncio.Event()
+
+	async def run(self) -> None:
+		await self.stream.ensure_group()
+		logger.info(f"Stream worker {self.consumer} started")
+		await asyncio.gather(
+			self._loop(self._relay, EVENT_RELAY_INTERVAL),
+			self._loop(self._consume, 0),
+			self._loop(self._reclaim, EventStream.CLAIM_INTERVAL),
+		)
+		logger.info(f"Stream worker {self.consumer} stopped")
+
+	def stop(self) -> None:
+		self.stopping.set()
+
+	async def _loop(self, step, interval: float) -> None:
+		while not self.stopping.is_set():
+			delay = interval
+			try:
+				await step()
+			except Exception as e:
+				logger.error(f"Stream worker {step.__name__} failed: {e}", exc_info=True)
+				# Не крутим цикл вхолостую, пока Redis или БД недоступны
+				delay = delay or EventStream.CLAIM_INTERVAL
+			if not delay:
+				continue
+			try:
+				await asyncio.wait_for(self.stopping.wait(), timeout=delay)
+			except asyncio.TimeoutError:
+				pass
+
+	async def _relay(self) -> None:
+		await self.pipeline.relay(self.stream.publish, EVENT_BATCH_SIZE)
+
+	async def _consume(self) -> None:
+		entries = await self.stream.read(self.consumer, count=EVENT_BATCH_SIZE)
+		if entries:
+			await self._handle(entries)
+
+	async def _reclaim(self) -> None:
+		"""Забирает записи, которые потребители получили, но не подтвердили.
+
+		Потребитель упал посреди обработки: это неудачная попытка, поэтому
+		события откладываются через outbox по общей политике повторов.
+		"""
+		start_id = "0-0"
+		while not self.stopping.is_set():
+			start_id, entries = await self.stream.claim_stale(
+				self.consumer,
+				min_idle_ms=EVENT_STREAM_CLAIM_MIN_IDLE_MS,
+				count=EVENT_BATCH_SIZE,
+				start_id=start_id,
+			)
+			if entries:
+				logger.info(f"Reclaimed {len(entries)} stale stream entries")
+				await self.pipeline.defer([event_id for _, event_id in entries])
+				await self.stream.ack([entry_id for entry_id, _ in entries])
+			if start_id == "0-0":
+				break
+
+	async def _handle(self, entries: list[StreamEntry]) -> None:
+		deferred_ids = await self.pipeline.process(
+			[event_id for _, event_id in entries]
+		)
+		# Отложенные события возвращаются в outbox; если это не удалось,
+		# записи остаются в PEL и будут забраны после
+		# EVENT_STREAM_CLAIM_MIN_IDLE_MS
+		await self.pipeline.defer(deferred_ids)
+		await self.stream.ack([entry_id for entry_id, _ in entries])
+
+
+async def run_worker() -> None:
+	engine = create_async_engine(
+		DATABASE_URL,
+		echo=False,
+		future=True,
+		pool_size=5,
+		max_overflow=10,
+		pool_pre_ping=True,
+		pool_recycle=1800,
+	)
+	redis_client = create_redis_client(create_redis_pool())
+	worker = StreamWorker(
+		EventPipeline(
+			async_sessionmaker(engine, expire_on_commit=False),
+			RedisUserScoreRepository(client=redis_client),
+		),
+		RedisEventStreamRepository(client=redis_client),
+		consumer=os.getenv(
+			"EVENT_STREAM_CONSUMER",
+			f"{socket.gethostname()}-{os.getpid()}",
+		),
+	)
+
+	loop = asyncio.get_running_loop()
+	for sig in (signal.SIGINT, signal.SIGTERM):
+		loop.add_signal_handler(sig, worker.stop)
+
+	try:
+		await worker.run()
+	finally:
+		await close_redis_client(redis_client)
+		await engine.dispose()
+
+
+def main() -> None:
+	logging.basicConfig(level=logging.INFO)
+	asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,138 @@
+"""
+Регрессия планов запросов горячих путей на заполненной базе.
+
+Нужна база, мигрированная до head: DATABASE_URL=... alembic upgrade head.
+Без DATABASE_URL тесты пропускаются. Данные создаются в транзакции, которая
+откатывается в конце теста.
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+	not DATABASE_URL, reason="DATABASE_URL is not set"
+)
+
+USERS = 200
+EVENTS_PER_USER = 100
+
+# Индекс событий пользователя до и после добавления id в ключ
+EVENTS_INDEXES = ("ix_events_user_id_created_at", "ix_events_user_id_created_at_id")
+AWARDS_INDEX = "uq_user_achievements_user_id_achievement_id"
+
+
+def _index_names(plan: dict) -> set[str]:
+	names = set()
+	if "Index Name" in plan:
+		names.add(plan["Index Name"])
+	for child in plan.get("Plans", []):
+		names |= _index_names(child)
+	return names
+
+
+async def _seed(connection) -> int:
+	from sqlalchemy import text
+
+	await connection.execute(text(
+		"INSERT INTO users (username, email) "
+		"SELECT 'plan_test_' || g, 'plan_test_' || g || '@example.com' "
+		"FROM generate_series(1, :users) g"
+	), {"users": USERS})
+	await connection.execute(text(
+		"INSERT INTO events (user_id, event_type, details, created_at) "
+		"SELECT u.id, 'login', NULL, now() - g * interval '1 second' "
+		"FROM users u CROSS JOIN generate_series(1, :events) g "
+		"WHERE u.username LIKE 'plan_test_%'"
+	), {"events": EVENTS_PER_USER})
+	await connection.execute(text(
+		"INSERT INTO user_achievements (user_id, achievement_id) "
+		"SELECT u.id, a.id FROM users u CROSS JOIN achievements a "
+		"WHERE u.username LIKE 'plan_test_%'"
+	))
+	await connection.execute(text("ANALYZE users, events, user_achievements"))
+	return await connection.scalar(text(
+		"SELECT min(id) FROM users WHERE username LIKE 'plan_test_%'"
+	))
+
+
+async def _plans(run_queries) -> list[set[str]]:
+	"""Выполняет запросы репозиториев и возвращает индексы из их планов.
+
+	Каждому индексу партиции events сопоставляется родительский индекс.
+	"""
+	from sqlalchemy import event, text
+	from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+	import app.adapters.database  # noqa: F401  (императивный маппинг)
+
+	engine = create_async_engine(DATABASE_URL)
+	statements = []
+
+	def capture(conn, cursor, statement, parameters, context, executemany):
+		if statement.lstrip().upper().startswith("SELECT"):
+			statements.append((statement, parameters))
+
+	try:
+		async with engine.connect() as connection:
+			transaction = await connection.begin()
+			try:
+				user_id = await _seed(connection)
+				parents = dict((await connection.execute(text(
+					"SELECT c.relname, p.relname FROM pg_inherits i "
+					"JOIN pg_class c ON c.oid = i.inhrelid "
+					"JOIN pg_class p ON p.oid = i.inhparent "
+					"WHERE p.relkind = 'I'"
+				))).all())
+
+				event.listen(engine.sync_engine, "before_cursor_execute", capture)
+				session = AsyncSession(
+					bind=connection,
+					join_transaction_mode="create_savepoint",
+				)
+				await run_queries(session, user_id)
+				event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+				plans = []
+				for statement, parameters in statements:
+					result = await connection.exec_driver_sql(
+						f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+					plan = result.scalar()
+					plan = json.loads(plan) if isinstance(plan, str) else plan
+					plans.append({
+						parents.get(name, name)
+						for name in _index_names(plan[0]["Plan"])
+					})
+				return plans
+			finally:
+				await transaction.rollback()
+	finally:
+		await engine.dispose()
+
+
+def test_user_events_use_user_created_at_index():
+	from app.adapters.database.repositories import EventRepository
+
+	async def run_queries(session, user_id):
+		repo = EventRepository(session)
+		await repo.get_recent_by_user_id(user_id)
+		await repo.get_history(user_id, limit=50)
+
+	plans = asyncio.run(_plans(run_queries))
+	assert len(plans) == 2
+	for indexes in plans:
+		assert indexes & set(EVENTS_INDEXES), indexes
+
+
+def test_user_achievements_use_unique_index():
+	from app.adapters.database.repositories import UserAchievementRepository
+
+	async def run_queries(session, user_id):
+		await UserAchievementRepository(session).get_by_user_id(user_id)
+
+	plans = asyncio.run(_plans(run_queries))
+	assert len(plans) == 1
+	assert AWARDS_INDEX in plans[0], plans[0]